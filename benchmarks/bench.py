@@ -0,0 +1,209 @@
+"""Benchmarks of the conveyance calculation paths.
+
+Times every function of :mod:`conveyance.belt_capacity`, :mod:`conveyance.conveyor_resistances`
+and :mod:`conveyance.power_requirements` on a single design, their array versions in
+:mod:`conveyance.vec` and the batched design chain over fleets of designs, and loading designs
+from YAML. Results are written as JSON and can be compared against a stored baseline::
+
+    python benchmarks/bench.py run --output results.json
+    python benchmarks/bench.py compare baseline.json results.json --threshold 0.25
+
+``compare`` exits with status 1 when any benchmark is slower than the baseline by more
+than the threshold.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from conveyance import belt_capacity, conveyance, conveyor_resistances, power_requirements, solver, vec
+from conveyance.fleet import ConveyorFleet
+
+SCHEMA = 1
+DESIGN = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests', 'flat_conveyor.yaml')
+SIZES = (1, 100, 10 ** 4, 10 ** 6)
+QUICK_SIZES = (1, 100)
+LOAD_SIZES = (1, 100, 1000)
+Q = 2300  # Throughput of the flat conveyor test (t/h)
+
+
+def _arguments(c):
+    """Argument values of the calculation functions for the flat conveyor at its test throughput"""
+    r = solver.solve(c, q=Q)
+    values = dict(vars(c))
+    values.update(q=Q, q_m=r.q_m, q_v=r.q_v, q_ro=r.q_ro, q_ru=r.q_ru, H=10.0, f_u=r.f_u, t_1=r.t_1, t_2=r.t_2,
+                  a=c.a_o, m=c.m_o, wrap_a_h=c.wrap_a, wrap_a_t=c.wrap_a, D=c.D_d, d_0=c.d_0_d, m_p=c.m_p_d,
+                  belt_ca=belt_capacity.belt_cs_area(l3=c.l3, b=c.b, ia=c.ia, sa=c.sa))
+    return values
+
+
+def _required(function, values):
+    """Keyword arguments for the parameters of ``function`` without defaults, and optional inputs with a value"""
+    return {name: values[name] for name, p in inspect.signature(function).parameters.items()
+            if p.default is inspect.Parameter.empty or (p.default is None and name in values)}
+
+
+def _public_functions(module):
+    return [(name, f) for name, f in inspect.getmembers(module, inspect.isfunction)
+            if not name.startswith('_') and f.__module__ == module.__name__]
+
+
+def _time(function, repeat, min_time):
+    """Best and median seconds per call, calling often enough that each repeat lasts ``min_time``"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 10 ** 6:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings), statistics.median(timings), number
+
+
+def benchmarks(sizes=SIZES, load_sizes=LOAD_SIZES):
+    """Yield ``(name, size, callable)`` for every benchmark"""
+    c = conveyance.Conveyance(file_path=DESIGN)
+    values = _arguments(c)
+
+    for module in (belt_capacity, conveyor_resistances, power_requirements):
+        for name, function in _public_functions(module):
+            kwargs = _required(function, values)
+            yield 'scalar.{}.{}'.format(module.__name__.rsplit('.', 1)[1], name), 1, lambda f=function, k=kwargs: f(**k)
+
+    yield 'chain.solve', 1, lambda: solver.solve(c, q=Q)
+
+    for n in sizes:
+        arrays = {name: np.full(n, value, dtype=float) for name, value in values.items()}
+        for name, function in _public_functions(vec):
+            kwargs = _required(function, arrays)
+            yield 'vec.{}'.format(name), n, lambda f=function, k=kwargs: f(**k)
+
+        fleet = ConveyorFleet.from_columns(vars(c), n=n)
+        q = np.full(n, Q, dtype=float)
+        yield 'chain.solve_batch', n, lambda f=fleet, q=q: solver.solve_batch(f, q=q)
+        yield 'chain.solve_iso', n, lambda f=fleet, q=q: solver.solve_iso(f, q=q)
+
+    yield 'load.Conveyance', 1, lambda: conveyance.Conveyance(file_path=DESIGN)
+    for n in load_sizes:
+        paths = [DESIGN] * n
+        yield 'load.load_many', n, lambda p=paths: conveyance.Conveyance.load_many(p, workers=1)
+        yield 'load.ConveyorFleet.from_yaml', n, lambda p=paths: ConveyorFleet.from_yaml(p, workers=1)
+
+
+def machine():
+    """Description of the machine and software the benchmarks ran on"""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run(args):
+    sizes = QUICK_SIZES if args.quick else tuple(args.sizes)
+    load_sizes = tuple(n for n in LOAD_SIZES if n <= max(sizes))
+    results = []
+    for name, size, function in benchmarks(sizes=sizes, load_sizes=load_sizes):
+        if args.filter and args.filter not in name:
+            continue
+        best, median, number = _time(function, repeat=args.repeat, min_time=args.min_time)
+        results.append({'name': name, 'size': size, 'best': best, 'median': median, 'number': number,
+                        'repeat': args.repeat, 'per_item': best / size})
+        print('{:<48} {:>8} {:>12.3e} s'.format(name, size, best), file=sys.stderr)
+
+    report = {'schema': SCHEMA, 'created': datetime.now(timezone.utc).isoformat(), 'machine': machine(),
+              'results': results}
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as stream:
+            json.dump(report, stream, indent=2)
+    if args.baseline:
+        with open(args.baseline) as stream:
+            return _report(compare(json.load(stream), report, threshold=args.threshold), stream=sys.stderr)
+    return 0
+
+
+def compare(baseline, current, threshold=0.25):
+    """Compare benchmark results with a baseline.
+
+    Returns
+    -------
+    list of dict
+        For every benchmark in both, its name, size, best times and their ratio, and
+        whether it regressed by more than ``threshold``
+
+    """
+    before = {(r['name'], r['size']): r for r in baseline['results']}
+    rows = []
+    for r in current['results']:
+        b = before.get((r['name'], r['size']))
+        if b is None:
+            continue
+        ratio = r['best'] / b['best']
+        rows.append({'name': r['name'], 'size': r['size'], 'baseline': b['best'], 'current': r['best'],
+                     'ratio': ratio, 'regression': ratio > 1 + threshold})
+    return rows
+
+
+def _report(rows, stream=sys.stdout):
+    for row in rows:
+        print('{:<48} {:>8} {:>12.3e} {:>12.3e} {:>7.2f}x{}'.format(
+            row['name'], row['size'], row['baseline'], row['current'], row['ratio'],
+            '  REGRESSION' if row['regression'] else ''), file=stream)
+    regressions = sum(row['regression'] for row in rows)
+    print('{} benchmarks compared, {} regressions'.format(len(rows), regressions), file=stream)
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of the conveyance calculation paths')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    p = commands.add_parser('run', help='Run the benchmarks and write the results as JSON')
+    p.add_argument('--output', '-o', default='-', help='Results file, or - for standard output (default: -)')
+    p.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Fleet sizes of the array benchmarks')
+    p.add_argument('--quick', action='store_true', help='Only small fleet sizes, e.g. for CI')
+    p.add_argument('--filter', '-k', help='Only run benchmarks whose name contains this text')
+    p.add_argument('--repeat', type=int, default=5, help='Timed repeats of each benchmark (default: 5)')
+    p.add_argument('--min-time', type=float, default=0.05, help='Least duration of each repeat in s (default: 0.05)')
+    p.add_argument('--baseline', help='Baseline results to compare against')
+    p.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown before failing (default: 0.25)')
+
+    p = commands.add_parser('compare', help='Compare results against a baseline')
+    p.add_argument('baseline', help='Baseline results file')
+    p.add_argument('current', help='Current results file')
+    p.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown before failing (default: 0.25)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        return run(args)
+    with open(args.baseline) as stream:
+        baseline = json.load(stream)
+    with open(args.current) as stream:
+        current = json.load(stream)
+    return _report(compare(baseline, current, threshold=args.threshold))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -36,6 +36,10 @@ setup(
     packages=find_packages(where="src"),
     python_requires=">=3.6",
 
+    entry_points={
+        'console_scripts': ['conveyance=conveyance.cli:main'],
+    },
+
     extras_require={
         'dev': ['check-manifest'],
         'test': ['coverage'],
@@ -0,0 +1,5 @@
+import sys
+
+from conveyance.cli import main
+
+sys.exit(main())
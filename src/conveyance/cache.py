@@ -0,0 +1,245 @@
+import hashlib
+import sqlite3
+from collections import namedtuple
+
+import numpy as np
+
+from conveyance import __version__, solver
+from conveyance.conveyance import Conveyance
+from conveyance.fleet import FIELDS, ConveyorFleet
+
+CachedResult = namedtuple('CachedResult', ['f_h', 'f_n', 'f_s', 'f_u', 'p_a', 't_1', 't_2'])
+CachedResult.__doc__ = """Solved outputs kept by a :class:`ResultCache`
+
+Attributes
+----------
+f_h : ndarray
+    :math:`F_H` : Main resistances to motion (:math:`N`)
+f_n : ndarray
+    :math:`F_N` : Secondary resistances (:math:`N`)
+f_s : ndarray
+    :math:`F_S` : Concentrated resistances (:math:`N`)
+f_u : ndarray
+    :math:`F_U` : Peripheral driving force on driving pulley (:math:`N`)
+p_a : ndarray
+    :math:`P_A` : Power requirements for the drive motor (:math:`W`)
+t_1 : ndarray
+    :math:`T_1` : Tight-side tension at the drive pulley (:math:`N`)
+t_2 : ndarray
+    :math:`T_2` : Slack-side tension at the drive pulley (:math:`N`)
+"""
+
+# Largest number of keys bound in one query, within SQLite's default variable limit
+_QUERY_SIZE = 500
+
+
+def _as_fleet(designs):
+    if isinstance(designs, ConveyorFleet):
+        return designs
+    if isinstance(designs, Conveyance):
+        designs = [designs]
+    return ConveyorFleet.from_conveyances(designs)
+
+
+class ResultCache:
+    """Persistent cache of solved designs in an SQLite database.
+
+    Results are keyed by a SHA-256 hash of the design parameters in :data:`~conveyance.fleet.FIELDS`
+    order as float64, the throughput, the lift and the library version, so equal designs
+    hit regardless of how they were loaded, and results from another version of the
+    library are never returned. When the cache holds more than ``max_entries`` results
+    the least recently used are evicted.
+
+    A lookup costs more than :func:`~conveyance.solver.solve_batch` takes to solve a
+    design, so the cache pays off for slower solves, such as ``iso=True``, or results
+    shared between runs.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    path : str
+        Path to the database file, created if missing, or ``':memory:'``
+    max_entries : int, optional
+        Largest number of results kept (default: 1000000)
+
+    Attributes
+    ----------
+    hits : int
+        Number of results found by :meth:`solve` since the cache was opened
+    misses : int
+        Number of results computed by :meth:`solve` since the cache was opened
+
+    """
+
+    def __init__(self, path, max_entries=1000000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS results (key BLOB PRIMARY KEY, {}, last_used INTEGER)'.format(
+                ', '.join('{} REAL'.format(name) for name in CachedResult._fields)))
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+        # Use counter ordering the results for eviction, continued from earlier sessions
+        self._clock = self._db.execute('SELECT COALESCE(MAX(last_used), 0) FROM results').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def close(self):
+        """Close the database"""
+        self._db.close()
+
+    def clear(self):
+        """Remove every result"""
+        with self._db:
+            self._db.execute('DELETE FROM results')
+
+    @staticmethod
+    def keys(designs, q, H=0, iso=False):
+        """Calculate the cache key of each design at its operating point.
+
+        Parameters
+        ----------
+        designs : Conveyance, list of Conveyance or ConveyorFleet
+            Conveyor designs
+        q : array_like
+            Throughput of the conveyor (t/h), a scalar or one value per design
+        H : array_like, optional
+            The conveyor lift (m) (default: 0)
+        iso : bool, optional
+            Key results of :func:`~conveyance.solver.solve_iso` (default: False)
+
+        Returns
+        -------
+        list of bytes
+            Key of each design
+
+        """
+        fleet = _as_fleet(designs)
+        n = len(fleet)
+        rows = np.empty((n, len(FIELDS) + 2))
+        rows[:, :-2] = fleet.data.T
+        rows[:, -2] = np.broadcast_to(q, (n,))
+        rows[:, -1] = np.broadcast_to(H, (n,))
+        rows += 0.0  # Hash -0.0 as 0.0
+        method = 'solve_iso' if iso else 'solve_batch'
+        prefix = hashlib.sha256('conveyance {} {} {}'.format(__version__, method, ','.join(FIELDS)).encode())
+        keys = []
+        for row in rows:
+            h = prefix.copy()
+            h.update(row.tobytes())
+            keys.append(h.digest())
+        return keys
+
+    def lookup(self, keys):
+        """Find stored results.
+
+        Parameters
+        ----------
+        keys : sequence of bytes
+            Keys from :meth:`keys`
+
+        Returns
+        -------
+        hits : numpy.ndarray
+            Whether each key was found
+        values : CachedResult
+            Arrays of the stored results, NaN where the key was not found
+
+        """
+        positions = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+        index = []
+        found = []
+        now = self._tick()
+        with self._db:
+            for start in range(0, len(keys), _QUERY_SIZE):
+                batch = keys[start:start + _QUERY_SIZE]
+                marks = ', '.join('?' * len(batch))
+                for key, *row in self._db.execute('SELECT key, {} FROM results WHERE key IN ({})'.format(
+                        ', '.join(CachedResult._fields), marks), batch):
+                    for i in positions[key]:
+                        index.append(i)
+                        found.append(row)
+                self._db.execute('UPDATE results SET last_used = ? WHERE key IN ({})'.format(marks), [now] + batch)
+
+        values = np.full((len(CachedResult._fields), len(keys)), np.nan)
+        hits = np.zeros(len(keys), dtype=bool)
+        if found:
+            values[:, index] = np.array(found).T
+            hits[index] = True
+        return hits, CachedResult(*values)
+
+    def store(self, keys, values):
+        """Store results, evicting the least recently used beyond ``max_entries``.
+
+        Parameters
+        ----------
+        keys : sequence of bytes
+            Keys from :meth:`keys`
+        values : CachedResult or DesignResult
+            Results for each key, as arrays or scalars
+
+        """
+        now = self._tick()
+        columns = [np.broadcast_to(getattr(values, name), (len(keys),)).tolist() for name in CachedResult._fields]
+        rows = [(key,) + row + (now,) for key, row in zip(keys, zip(*columns))]
+        with self._db:
+            self._db.executemany('INSERT OR REPLACE INTO results VALUES ({})'.format(
+                ', '.join('?' * (len(CachedResult._fields) + 2))), rows)
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                self._db.execute('DELETE FROM results WHERE key IN '
+                                 '(SELECT key FROM results ORDER BY last_used LIMIT ?)', (excess,))
+
+    def solve(self, designs, q, H=0, iso=False):
+        """Solve designs, computing only the results missing from the cache.
+
+        Parameters
+        ----------
+        designs : Conveyance, list of Conveyance or ConveyorFleet
+            Conveyor designs
+        q : array_like
+            Throughput of the conveyor (t/h), a scalar or one value per design
+        H : array_like, optional
+            The conveyor lift (m) (default: 0)
+        iso : bool, optional
+            Solve with converged ISO 5048 wrap resistances using
+            :func:`~conveyance.solver.solve_iso` (default: False)
+
+        Returns
+        -------
+        CachedResult
+            Resistances, power and tensions of every design
+
+        """
+        fleet = _as_fleet(designs)
+        n = len(fleet)
+        q = np.broadcast_to(np.asarray(q, dtype=float), (n,))
+        H = np.broadcast_to(np.asarray(H, dtype=float), (n,))
+        keys = self.keys(fleet, q, H, iso=iso)
+        hits, values = self.lookup(keys)
+
+        misses = np.flatnonzero(~hits)
+        if misses.size:
+            solve = solver.solve_iso if iso else solver.solve_batch
+            result = solve(fleet[misses], q=q[misses], H=H[misses])
+            for name, column in zip(CachedResult._fields, values):
+                column[misses] = getattr(result, name)
+            self.store([keys[i] for i in misses], result)
+        self.hits += n - misses.size
+        self.misses += misses.size
+        return values
@@ -0,0 +1,166 @@
+"""Command line interface solving conveyor designs::
+
+    conveyance designs/ extra/*.yaml -q 2300 --lift 5 --format csv --output results.csv
+
+Only the standard library, PyYAML and the scalar solver are imported to solve a single
+design; NumPy and the fleet machinery are imported when more than one design is solved.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+
+import yaml
+
+from conveyance.conveyance import DesignFileError
+
+FORMATS = ('csv', 'jsonl', 'fleet')
+
+
+def expand_paths(patterns):
+    """Design files named by paths, directories and glob patterns, in the order given.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    patterns : sequence of str
+        Design files, directories holding ``*.yaml`` / ``*.yml`` files, or glob patterns
+
+    Returns
+    -------
+    list of str
+        Paths of the design files, each directory and pattern sorted by name
+
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, '*.yaml')) + glob.glob(os.path.join(pattern, '*.yml'))))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern)))
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def _solve(paths, q, H, iso, workers, batch):
+    """Result field names, a row of results per design and, when solved as a fleet, the fleet and its results"""
+    if len(paths) == 1 and not (iso or batch):
+        from conveyance import conveyance, solver
+
+        result = solver.solve(conveyance.Conveyance(file_path=paths[0]), q=q, H=H)
+        return result._fields, [[float(value) for value in result]], None
+
+    from conveyance import solver
+    from conveyance.fleet import ConveyorFleet
+
+    fleet = ConveyorFleet.from_yaml(paths, workers=workers)
+    result = (solver.solve_iso if iso else solver.solve_batch)(fleet, q=q, H=H)
+    return result._fields, list(zip(*[values.tolist() for values in result])), (fleet, result)
+
+
+def _yaml_error(paths, error):
+    """One line naming the design file that is not valid YAML and the problem found"""
+    for path in paths:
+        try:
+            with open(path, 'rb') as stream:
+                yaml.safe_load(stream)
+        except yaml.YAMLError as e:
+            error = e
+            break
+    else:
+        path = None
+    mark = getattr(error, 'problem_mark', None)
+    problem = getattr(error, 'problem', None) or ' '.join(str(error).split())
+    where = ' at line {}, column {}'.format(mark.line + 1, mark.column + 1) if mark else ''
+    return '{}invalid YAML, {}{}'.format('{}: '.format(path) if path else '', problem, where)
+
+
+def _write_csv(stream, paths, fields, rows):
+    writer = csv.writer(stream, lineterminator='\n')
+    writer.writerow(('path',) + tuple(fields))
+    for path, row in zip(paths, rows):
+        writer.writerow([path] + list(row))
+
+
+def _write_jsonl(stream, paths, fields, rows):
+    for path, row in zip(paths, rows):
+        record = {'path': path}
+        record.update(zip(fields, row))
+        stream.write(json.dumps(record) + '\n')
+
+
+def main(argv=None):
+    """Run the command line interface.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    argv : sequence of str, optional
+        Arguments, ``sys.argv[1:]`` if not set
+
+    Returns
+    -------
+    int
+        Exit status
+
+    """
+    parser = argparse.ArgumentParser(prog='conveyance', description='Solve conveyor designs at a throughput')
+    parser.add_argument('designs', nargs='+', help='Design YAML files, directories of them or glob patterns')
+    parser.add_argument('-q', '--throughput', type=float, required=True, help='Throughput of every conveyor (t/h)')
+    parser.add_argument('-H', '--lift', type=float, default=0.0, help='Lift of every conveyor (m) (default: 0)')
+    parser.add_argument('--iso', action='store_true', help='Iterate the ISO 5048 pulley wrap resistances to agreement')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='csv',
+                        help='csv or jsonl rows, or a binary fleet file of parameter and result columns (default: csv)')
+    parser.add_argument('-o', '--output', default='-', help='Output file, or - for standard output (default: -)')
+    parser.add_argument('-j', '--workers', type=int, help='Processes loading the designs (default: number of CPUs)')
+    parser.add_argument('--fields', help='Comma separated result fields to write (default: all)')
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.designs)
+    if not paths:
+        parser.error('no design files match {}'.format(' '.join(args.designs)))
+    if args.format == 'fleet' and args.output == '-':
+        parser.error('the fleet format needs an --output file')
+
+    try:
+        fields, rows, solved = _solve(paths, q=args.throughput, H=args.lift, iso=args.iso, workers=args.workers,
+                                      batch=args.format == 'fleet')
+    except OSError as e:
+        print('conveyance: error: {}'.format(e), file=sys.stderr)
+        return 1
+    except yaml.YAMLError as e:
+        print('conveyance: error: {}'.format(_yaml_error(paths, e)), file=sys.stderr)
+        return 1
+    except DesignFileError as e:
+        print('conveyance: error: {}'.format(e), file=sys.stderr)
+        return 1
+
+    selected = fields
+    if args.fields:
+        selected = tuple(name.strip() for name in args.fields.split(','))
+        unknown = [name for name in selected if name not in fields]
+        if unknown:
+            parser.error('unknown result fields {}'.format(', '.join(unknown)))
+        columns = [fields.index(name) for name in selected]
+        rows = [[row[i] for i in columns] for row in rows]
+
+    if args.format == 'fleet':
+        from conveyance import fleetfile, solver
+
+        fleet, result = solved
+        stored = [name for name in selected if name in solver.DesignResult._fields]
+        fleetfile.save(args.output, fleet, results=result, fields=stored)
+        return 0
+
+    write = _write_csv if args.format == 'csv' else _write_jsonl
+    if args.output == '-':
+        write(sys.stdout, paths, selected, rows)
+    else:
+        with open(args.output, 'w', newline='') as stream:
+            write(stream, paths, selected, rows)
+    return 0
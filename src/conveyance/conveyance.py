@@ -1,5 +1,70 @@
+import hashlib
+import json
+import os
+
 import yaml
 
+from conveyance import solver
+
+# Use the libyaml based loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+#: Design parameters of a conveyor, as
+#: ``(attribute, path within conveyor_design, units, description)``
+PARAMETERS = (
+    # Assume 3-roll configuration using coal
+    ('l3', ('idler', 'carry', 'l3'), 'm', 'Width of the idler (3 roll set)'),
+    ('B', ('belt', 'B'), 'm', 'Total width of the belt'),
+    ('d', ('belt', 'd'), 'm', 'Thickness of the belt'),
+    ('b', ('belt', 'b'), 'm', 'Width of max material on belt'),
+    ('ia', ('idler', 'carry', 'ia'), 'deg', 'Idlers angle'),
+    ('sa', ('material', 'sa'), 'deg', 'Material surcharge angle'),
+    ('b1', ('skirtplates', 'b1'), 'm', 'Width between skirtplates'),
+    ('l_s', ('skirtplates', 'l_s'), 'm', 'Length of installation fitted with skirtplates'),
+
+    # Vars for mass_density_material
+    ('v', ('operation', 'v'), 'm/s', 'Belt speed'),
+    ('v_0', ('operation', 'v_0'), 'm/s', 'Speed of conveyed material'),
+    ('p', ('material', 'p'), 't/m^3', 'Density'),
+
+    # Vars for idlers
+    ('a_o', ('idler', 'carry', 'a_o'), 'm', 'Carry idler spacing'),
+    ('m_o', ('idler', 'carry', 'm_o'), 'kg', 'Carry idler mass'),
+    ('h_a_o', ('idler', 'carry', 'h_a_o'), 'm', 'Allowable belt sag, carry side'),
+    ('a_u', ('idler', 'return', 'a_u'), 'm', 'Return idler spacing'),
+    ('m_u', ('idler', 'return', 'm_u'), 'kg', 'Return idler mass'),
+    ('h_a_u', ('idler', 'return', 'h_a_u'), 'm', 'Allowable belt sag, return side'),
+
+    # Vars for conveyor resistances
+    ('q_b', ('belt', 'q_b'), 'kg/m', 'Belt mass'),
+    ('c_l', ('operation', 'c_l'), 'm', 'Center-to-centre length of the conveyor'),
+    ('install_a', ('operation', 'install_a'), 'deg', 'Installation angle of the conveyor'),
+    ('wrap_a', ('operation', 'wrap_a'), 'deg', 'Wrap angle around the pulley'),
+    ('ff', ('coefficients', 'ff'), '', 'Artificial friction factor (average operating conditions)'),
+    ('mu1', ('coefficients', 'mu1'), '', 'Coefficients between material/belt'),
+    ('mu2', ('coefficients', 'mu2'), '', 'Coefficients between material/skirtplates'),
+
+    # Vars for belt cleaners
+    ('bc_w', ('belt_cleaners', 'bc_w'), 'm', 'Belt cleaner width'),
+    ('bc_t', ('belt_cleaners', 'bc_t'), 'm', 'Belt cleaner thickness'),
+    ('bc_p', ('belt_cleaners', 'bc_p'), 'N/m^2', 'Pressure between cleaner and belt'),
+    ('bc_n', ('belt_cleaners', 'bc_n'), '', 'Number of belt cleaners'),
+    ('mu3', ('coefficients', 'mu3'), '', 'Friction coefficient between belt and cleaner'),
+
+    # Vars for drive pulley
+    ('d_eta_1', ('coefficients', 'd_eta_1'), '', 'Fluid coupling efficiency'),
+    ('d_eta_2', ('coefficients', 'd_eta_2'), '', 'Gearbox efficiency'),
+    ('mu_b', ('coefficients', 'mu_b'), '', 'Belt/Pulley friction coefficient'),
+    ('d_0_d', ('pulley', 'drive', 'd_0'), 'm', 'Diameter of inside bearing, drive pulley'),
+    ('D_d', ('pulley', 'drive', 'D'), 'm', 'Drive pulley diameter'),
+    ('m_p_d', ('pulley', 'drive', 'm_p'), 'kg', 'Drive pulley mass'),
+
+    # Vars for tail pulley
+    ('d_0_t', ('pulley', 'tail', 'd_0'), 'm', 'Diameter of inside bearing, tail pulley'),
+    ('D_t', ('pulley', 'tail', 'D'), 'm', 'Tail pulley diameter'),
+    ('m_p_t', ('pulley', 'tail', 'm_p'), 'kg', 'Tail pulley mass'),
+)
+
 
 class Conveyance:
     """Class used for conveyor design.
@@ -16,6 +81,101 @@ class Conveyance:
     def __init__(self, file_path):
         self._file_loader(file_path=file_path)
 
+    @classmethod
+    def from_parameters(cls, params):
+        """Create a design directly from its parameter values.
+
+        .. versionadded:: 0.1.0
+
+        Parameters
+        ----------
+        params : dict
+            Value of every attribute named in :data:`PARAMETERS`
+
+        Returns
+        -------
+        Conveyance
+            The conveyor design
+
+        """
+        c = cls.__new__(cls)
+        for name, _, _, _ in PARAMETERS:
+            setattr(c, name, params[name])
+        return c
+
+    @classmethod
+    def load_many(cls, paths, workers=None, cache_dir=None):
+        """Load many designs from YAML files.
+
+        Files are parsed in parallel across ``workers`` processes. With ``cache_dir`` set,
+        the parameters of every parsed file are kept on disk keyed by a hash of the file
+        contents, so unchanged files are not parsed again.
+
+        .. versionadded:: 0.1.0
+
+        Parameters
+        ----------
+        paths : sequence of str
+            Paths to YAML files
+        workers : int, optional
+            Number of parsing processes, ``os.cpu_count()`` if not set
+        cache_dir : str, optional
+            Directory holding the parsed parameter cache
+
+        Returns
+        -------
+        list of Conveyance
+            The conveyor designs, in the order of ``paths``
+
+        """
+        return [cls.from_parameters(params) for params in _load_parameters(paths, workers, cache_dir)]
+
+    def solve(self, q, H=0):
+        """Solve the design at a throughput in a single pass.
+
+        .. versionadded:: 0.1.0
+
+        Parameters
+        ----------
+        q : float
+            Throughput of the conveyor (t/h)
+        H : float, optional
+            The conveyor lift (m) (default: 0)
+
+        Returns
+        -------
+        conveyance.solver.DesignResult
+            Resistances, power and tensions of the design
+
+        """
+        return solver.solve(self, q=q, H=H)
+
+    def surrogate(self, H=0, q_max=None, iso=False, degree=None):
+        """Compile the design into polynomials giving the drive force and power at any throughput.
+
+        .. versionadded:: 0.1.0
+
+        Parameters
+        ----------
+        H : float, optional
+            The conveyor lift (m) (default: 0)
+        q_max : float, optional
+            Largest throughput fitted (t/h) (default: the capacity of the belt at its speed)
+        iso : bool, optional
+            Fit the design solved with converged ISO 5048 wrap resistances (default: False)
+        degree : int, optional
+            Degree of the polynomials (default: 2, or 8 with ``iso``)
+
+        Returns
+        -------
+        conveyance.surrogate.ThroughputSurrogate
+            Polynomials for :math:`F_U(q)` and :math:`P_A(q)`, with their measured tolerance
+
+        """
+        from conveyance import surrogate
+
+        return surrogate.ThroughputSurrogate(self, H=H, q_max=q_max, iso=iso, degree=degree)
+
     def _file_loader(self, file_path):
         """Load the design parameters from a YAML file.
 
@@ -27,74 +187,101 @@ class Conveyance:
             Path to YAML file
 
         """
-        with open(file_path, 'r') as stream:
-            d: dict = yaml.safe_load(stream=stream)
-
-        # Load objects from file
-        c_d = d['conveyor_design']
-
-        # conveyor_design
-        mat = c_d['material']
-        op = c_d['operation']
-        coef = c_d['coefficients']
-        belt = c_d['belt']
-        drive_pulley = c_d['pulley']['drive']
-        tail_pulley = c_d['pulley']['tail']
-        carry_idler = c_d['idler']['carry']
-        return_idler = c_d['idler']['return']
-        sk_p = c_d['skirtplates']
-        b_c = c_d['belt_cleaners']
-
-        # Assume 3-roll configuration using coal
-        self.l3 = carry_idler['l3']  # Width of the idler (3 roll set)
-        self.B = belt['B']  # Total width of the belt (m)
-        self.d = belt['d']  # Thickness of the belt (m)
-        self.b = belt['b']  # Width of max material on belt (m)
-        self.ia = carry_idler['ia']  # Idlers angle (deg)
-        self.sa = mat['sa']  # Material surcharge angle, coal (deg)
-        self.b1 = sk_p['b1']  # Width between skirtplates (m)
-        self.l_s = sk_p['l_s']  # Length of installation fitted with skirtplates (m)
-
-        # Vars for mass_density_material
-        self.v = op['v']  # Belt speed (m/s)
-        self.v_0 = op['v_0']  # Speed of conveyed material (m/s)
-        self.p = mat['p']  # Density, coal (t/m^3)
-        # self.q_v = 0.864  # (m^3/s)
-        # self.q = 2300  # (t/h)
-
-        # Vars for idlers
-        self.a_o = carry_idler['a_o']  # Carry idler spacing (m)
-        self.m_o = carry_idler['m_o']  # Carry idler mass (kg)
-        self.h_a_o = carry_idler['h_a_o']  # Allowable belt sag, carry side (m)
-        self.a_u = return_idler['a_u']  # Return idler spacing (m)
-        self.m_u = return_idler['m_u']  # Return idler mass (kg)
-        self.h_a_u = return_idler['h_a_u']  # Allowable belt sag, return side (m)
-
-        # Vars for conveyor resistances
-        self.q_b = belt['q_b']  # Belt mass (kg/m)
-        self.c_l = op['c_l']  # Center-to-centre length of the conveyor (m)
-        self.install_a = op['install_a']  # Installation angle of the conveyor (deg)
-        self.wrap_a = op['wrap_a']  # Wrap angle around the pulley (deg)
-        self.ff = coef['ff']  # Artificial friction factor (average operating conditions)
-        self.mu1 = coef['mu1']  # Coefficients between material/belt
-        self.mu2 = coef['mu2']  # Coefficients between material/skirtplates
-
-        # Vars for belt cleaners
-        self.bc_w = b_c['bc_w']  # Belt cleaner width (m)
-        self.bc_t = b_c['bc_t']  # Belt cleaner thickness (m)
-        self.bc_p = b_c['bc_p']  # Pressure between cleaner and belt
-        self.bc_n = b_c['bc_n']  # Number of belt cleaners (three at head end, one at tail end)
-        self.mu3 = coef['mu3']  # Friction coefficient between belt and cleaner
-
-        # Vars for drive pulley
-        self.d_eta_1 = coef['d_eta_1']  # Fluid coupling efficiency
-        self.d_eta_2 = coef['d_eta_2']  # Gearbox efficiency
-        self.mu_b = coef['mu_b']  # Belt/Pulley friction coefficient
-        self.d_0_d = drive_pulley['d_0']  # Diameter of inside bearing
-        self.D_d = drive_pulley['D']  # Drive pulley diameter
-        self.m_p_d = drive_pulley['m_p']  # Drive pulley mass
-
-        # Vars for tail pulley
-        self.d_0_t = tail_pulley['d_0']  # Diameter of inside bearing
-        self.D_t = tail_pulley['D']  # Tail pulley diameter
-        self.m_p_t = tail_pulley['m_p']  # Tail pulley mass
+        with open(file_path, 'rb') as stream:
+            params = _parse_parameters(stream.read(), file_path)
+
+        for name, value in params.items():
+            setattr(self, name, value)
+
+
+class DesignFileError(ValueError):
+    """A design file is missing a parameter or gives one that is not a number.
+
+    .. versionadded:: 0.1.0
+
+    Attributes
+    ----------
+    path : str
+        Path of the design file, None if the design was not read from a file
+    parameter : str
+        Dotted path within the file of the parameter, or of the first missing section,
+        e.g. ``'conveyor_design.operation.v'``
+
+    """
+
+    def __init__(self, message, path, parameter):
+        super().__init__(message)
+        self.path = path
+        self.parameter = parameter
+
+    def __reduce__(self):
+        return type(self), (self.args[0], self.path, self.parameter)
+
+
+def _parse_parameters(text, file_path=None):
+    """Parse the design parameters from the contents of a YAML file, checking every one is a number"""
+    d: dict = yaml.load(text, Loader=_YamlLoader)
+    where = ' in {}'.format(file_path) if file_path else ''
+
+    # Load objects from file
+    params = {}
+    for name, path, _, _ in PARAMETERS:
+        value = d
+        keys = ('conveyor_design',) + path
+        for i, key in enumerate(keys):
+            if not isinstance(value, dict) or key not in value:
+                parameter = '.'.join(keys[:i + 1])
+                raise DesignFileError('missing parameter {}{}'.format(parameter, where), file_path, parameter)
+            value = value[key]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            parameter = '.'.join(keys)
+            raise DesignFileError('parameter {}{} is not a number'.format(parameter, where), file_path, parameter)
+        params[name] = value
+    return params
+
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, 'v1', digest[:2], digest + '.json')
+
+
+def _load_parameters(paths, workers=None, cache_dir=None):
+    """Return the design parameters of each YAML file, parsing only files missing from the cache"""
+    paths = list(paths)
+    texts = []
+    for path in paths:
+        with open(path, 'rb') as stream:
+            texts.append(stream.read())
+
+    results = [None] * len(texts)
+    digests = [hashlib.sha256(text).hexdigest() for text in texts] if cache_dir else None
+    if cache_dir:
+        for i, digest in enumerate(digests):
+            try:
+                with open(_cache_path(cache_dir, digest), 'r') as stream:
+                    results[i] = json.load(stream)
+            except (OSError, ValueError):
+                pass
+
+    misses = [i for i, params in enumerate(results) if params is None]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(misses) < 2:
+        parsed = [_parse_parameters(texts[i], paths[i]) for i in misses]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_size = max(1, len(misses) // (4 * workers))
+            parsed = list(executor.map(_parse_parameters, [texts[i] for i in misses], [paths[i] for i in misses],
+                                       chunksize=chunk_size))
+
+    for i, params in zip(misses, parsed):
+        results[i] = params
+        if cache_dir:
+            path = _cache_path(cache_dir, digests[i])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent jobs never read a partial entry
+            tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+            with open(tmp_path, 'w') as stream:
+                json.dump(params, stream)
+            os.replace(tmp_path, path)
+    return results
@@ -0,0 +1,369 @@
+import copy
+import math
+import os
+import pickle
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from conveyance import solver
+from conveyance.fleet import ConveyorFleet
+
+TransientResult = namedtuple('TransientResult', [
+    'time', 'speed', 'drive_force', 't_1', 't_2',
+    'peak_t_1', 'peak_drive_force', 'peak_torque', 'max_ratio', 'ratio_limit', 'slipped', 't_speed',
+])
+TransientResult.__doc__ = """Simulated start or stop of each scenario
+
+Attributes
+----------
+time : ndarray
+    Times of the recorded samples (:math:`s`)
+speed : ndarray
+    Belt speed at the drive pulley, of shape ``(scenarios, samples)`` (:math:`m/s`)
+drive_force : ndarray
+    Force transmitted by the drive pulley to the belt (:math:`N`)
+t_1 : ndarray
+    :math:`T_1` : Tight-side tension at the drive pulley (:math:`N`)
+t_2 : ndarray
+    :math:`T_2` : Slack-side tension at the drive pulley (:math:`N`)
+peak_t_1 : ndarray
+    Largest tight-side tension of each scenario over every time step (:math:`N`)
+peak_drive_force : ndarray
+    Largest force transmitted by the drive (:math:`N`)
+peak_torque : ndarray
+    Largest torque at the drive pulley shaft (:math:`Nm`)
+max_ratio : ndarray
+    Largest ratio :math:`(T_2 + F) / T_2` across the drive pulley while driving, with
+    :math:`F` the force it transmits, which reaches ``ratio_limit`` where the belt slips
+ratio_limit : ndarray
+    Capstan limit :math:`e^{\\mu_b \\alpha}` of the drive pulley
+slipped : ndarray
+    Whether the drive asked for more force than friction could transmit at any time
+t_speed : ndarray
+    Time the drive reached 99 % of the belt speed from rest, or fell below 1 % of it
+    from running, NaN if it did not (:math:`s`)
+"""
+
+
+class DirectOnLine:
+    """Induction motor started across the line.
+
+    The drive force falls linearly from ``ratio`` times the running :math:`F_U` to zero
+    over the slip of the motor, reaching :math:`F_U` at the design belt speed.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    ratio : float or ndarray, optional
+        Largest drive force as a multiple of :math:`F_U` (default: 2.0)
+    slip : float or ndarray, optional
+        Slip of the motor at the design speed (default: 0.02)
+
+    """
+
+    def __init__(self, ratio=2.0, slip=0.02):
+        self.ratio = ratio
+        self.slip = slip
+
+    def _limit(self, t):
+        return self.ratio
+
+    def _synchronous(self, t, v_rated):
+        return v_rated / (1 - self.slip)
+
+    def __call__(self, t, v, v_rated, f_u):
+        """Drive force at time ``t`` (s) and drive belt speed ``v`` (m/s), per scenario (N)"""
+        # The slip speed at a given force is the same at any supply frequency
+        slip_speed = v_rated * self.slip / (1 - self.slip)
+        force = f_u * (self._synchronous(t, v_rated) - v) / slip_speed
+        return np.minimum(force, self._limit(t) * f_u)
+
+
+class SoftStart(DirectOnLine):
+    """Induction motor with a soft starter ramping its force limit over ``t_ramp``.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    t_ramp : float or ndarray
+        Time the force limit takes to rise to ``ratio`` times :math:`F_U` (s)
+    ratio : float or ndarray, optional
+        Largest drive force as a multiple of :math:`F_U` (default: 1.5)
+    slip : float or ndarray, optional
+        Slip of the motor at the design speed (default: 0.02)
+
+    """
+
+    def __init__(self, t_ramp, ratio=1.5, slip=0.02):
+        super().__init__(ratio=ratio, slip=slip)
+        self.t_ramp = t_ramp
+
+    def _limit(self, t):
+        return self.ratio * np.minimum(t / self.t_ramp, 1)
+
+
+class VariableSpeed(DirectOnLine):
+    """Motor on a variable speed drive following an S-curve speed reference over ``t_ramp``.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    t_ramp : float or ndarray
+        Time the speed reference takes to rise to the design speed (s)
+    ratio : float or ndarray, optional
+        Largest drive force as a multiple of :math:`F_U` (default: 1.5)
+    slip : float or ndarray, optional
+        Slip of the motor at the design speed (default: 0.02)
+
+    """
+
+    def __init__(self, t_ramp, ratio=1.5, slip=0.02):
+        super().__init__(ratio=ratio, slip=slip)
+        self.t_ramp = t_ramp
+
+    def _synchronous(self, t, v_rated):
+        x = np.minimum(t / self.t_ramp, 1)
+        return v_rated / (1 - self.slip) * x * x * (3 - 2 * x)
+
+
+class Coast:
+    """Drive switched off, for stopping from running.
+
+    .. versionadded:: 0.1.0
+
+    """
+
+    def __call__(self, t, v, v_rated, f_u):
+        return np.zeros_like(v)
+
+
+def _loop(c, q, H, elements, modulus):
+    """Masses, stiffness and resistances of the lumped elements of each scenario, shaped ``(scenarios, elements)``"""
+    g = 9.81
+    r = solver._design_chain(c, q, H, xp=np)
+    n_c = elements // 2
+    carry = np.arange(elements) < n_c
+    length = (2 * c.c_l / elements)[:, None]
+    cos_a = np.cos(np.radians(c.install_a))[:, None]
+    q_m = np.broadcast_to(r.q_m, c.v.shape)[:, None]
+
+    mass = np.where(carry, c.q_b[:, None] + q_m + r.q_ro[:, None], c.q_b[:, None] + r.q_ru[:, None]) * length
+    mass[:, 0] += c.m_p_t / 2
+    mass[:, n_c] += c.m_p_d / 2
+
+    # Resistances opposing motion: the main resistance along both strands, with the secondary
+    # and concentrated resistances at the loading point
+    k_h = (c.ff * g)[:, None] * length
+    friction = np.where(carry, k_h * (r.q_ro[:, None] + (c.q_b[:, None] + q_m) * cos_a),
+                        k_h * (r.q_ru[:, None] + c.q_b[:, None] * cos_a))
+    friction[:, 0] += np.broadcast_to(r.f_n + r.f_s, c.v.shape)
+    gravity = np.where(carry, np.broadcast_to(r.f_st, c.v.shape)[:, None] / n_c, 0)
+
+    stiffness = (modulus * c.B)[:, None] / length
+    f_u = np.broadcast_to(r.f_u, c.v.shape)
+    # Gravity take-up at the tail giving the running slack side tension of the design
+    takeup = np.broadcast_to(r.t_2, c.v.shape) + (friction + gravity)[:, n_c + 1:].sum(axis=1)
+    return mass, stiffness, friction, gravity, f_u, takeup, n_c
+
+
+def _stretch(v, out):
+    """Rate of stretch of each spring, joining each element to the next around the loop"""
+    np.subtract(v[:, 1:], v[:, :-1], out=out[:, :-1])
+    np.subtract(v[:, 0], v[:, -1], out=out[:, -1])
+
+
+def _simulate(columns, q, H, curve, duration, dt, every, elements, modulus, damping, running):
+    """Integrate the scenarios of one chunk"""
+    c = SimpleNamespace(**columns)
+    mass, stiffness, friction, gravity, f_u, takeup, d = _loop(c, q, H, elements, modulus)
+    n = mass.shape[0]
+    v_rated = c.v
+    ratio_limit = np.exp(c.mu_b * np.radians(c.wrap_a))
+    damper = 2 * damping * np.sqrt(stiffness * mass)
+    v_eps = np.maximum(0.01, 2 * friction * dt / mass)
+
+    if running:
+        v = np.repeat(v_rated[:, None], elements, axis=1)
+        drive = np.zeros_like(mass)
+        drive[:, d] = f_u
+        tension = takeup[:, None] + np.cumsum(friction + gravity - drive, axis=1)
+    else:
+        v = np.zeros_like(mass)
+        tension = np.repeat(takeup[:, None], elements, axis=1)
+    tension[:, -1] = takeup
+
+    steps = int(round(duration / dt))
+    samples = steps // every + 1
+    record = {name: np.empty((n, samples)) for name in ('speed', 'drive_force', 't_1', 't_2')}
+    peak_t_1 = np.zeros(n)
+    peak_force = np.zeros(n)
+    max_ratio = np.zeros(n)
+    slipped = np.zeros(n, dtype=bool)
+    t_speed = np.full(n, np.nan)
+    force = np.zeros(n)
+
+    stretch, total, net, drag = (np.empty_like(mass) for _ in range(4))
+    dt_mass, dt_stiffness, inverse_eps = dt / mass, dt * stiffness, 1 / v_eps
+    _stretch(v, stretch)
+    for step in range(steps + 1):
+        t = step * dt
+        np.multiply(damper, stretch, out=total)
+        total += tension
+        total[:, -1] = takeup
+        t_1, t_2 = total[:, d - 1], total[:, d]
+
+        wanted = curve(t, v[:, d], v_rated, f_u)
+        cap = np.maximum(t_2, 0) * (ratio_limit - 1)
+        force = np.clip(wanted, -cap, cap)
+        slipped |= np.abs(wanted) > cap * (1 + 1e-9)
+
+        peak_t_1 = np.maximum(peak_t_1, t_1)
+        peak_force = np.maximum(peak_force, force)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            max_ratio = np.where((force > 0) & (t_2 > 0), np.maximum(max_ratio, 1 + force / t_2), max_ratio)
+        reached = v[:, d] < 0.01 * v_rated if running else v[:, d] >= 0.99 * v_rated
+        t_speed = np.where(np.isnan(t_speed) & reached, t, t_speed)
+        if step % every == 0:
+            i = step // every
+            record['speed'][:, i] = v[:, d]
+            record['drive_force'][:, i] = force
+            record['t_1'][:, i] = t_1
+            record['t_2'][:, i] = t_2
+
+        # Semi-implicit Euler: velocities from the forces, then tensions from the new velocities,
+        # in place to spare allocating the (scenarios, elements) arrays every step
+        np.subtract(total[:, 1:], total[:, :-1], out=net[:, 1:])
+        np.subtract(total[:, 0], total[:, -1], out=net[:, 0])
+        np.multiply(v, inverse_eps, out=drag)
+        np.clip(drag, -1, 1, out=drag)
+        drag *= friction
+        net -= drag
+        net -= gravity
+        net[:, d] += force
+        net *= dt_mass
+        v += net
+        _stretch(v, stretch)
+        np.multiply(dt_stiffness, stretch, out=drag)
+        tension += drag
+
+    return (record['speed'], record['drive_force'], record['t_1'], record['t_2'], peak_t_1, peak_force,
+            peak_force * c.D_d / 2, max_ratio, ratio_limit, slipped, t_speed)
+
+
+def _picklable(curve):
+    """Whether the curve can be sent to worker processes"""
+    try:
+        pickle.dumps(curve)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def _select(curve, n, start, stop):
+    """The curve for scenarios ``start:stop``, slicing parameters given per scenario"""
+    if not any(isinstance(value, np.ndarray) and value.shape == (n,) for value in vars(curve).values()):
+        return curve
+    curve = copy.copy(curve)
+    for name, value in vars(curve).items():
+        if isinstance(value, np.ndarray) and value.shape == (n,):
+            setattr(curve, name, value[start:stop])
+    return curve
+
+
+def simulate(designs, q=0, H=0, curve=None, duration=30.0, elements=100, modulus=1e7, damping=0.05, record=0.1,
+             dt=None, running=False, workers=None):
+    """
+    Simulate the start or stop of conveyors as lumped mass-spring belt loops
+
+    The belt loop is divided into ``elements`` masses joined by springs of the belt's
+    axial stiffness, half on the carry strand and half on the return strand. Each element
+    carries its share of the belt, material and idler masses and of the main resistance of
+    its strand, with the secondary and concentrated resistances at the loading point and the
+    gravity resistance along the carry strand. Run to steady state, the loop reproduces
+    :func:`~conveyance.solver.solve`: the drive transmits :math:`F_U` and the slack side
+    tension is :math:`T_2`, kept by a gravity take-up at the tail.
+
+    The drive pulley transmits the force asked for by ``curve``, up to the capstan limit
+    :math:`T_2 (e^{\\mu_b \\alpha} - 1)` of :func:`~conveyance.vec.tension_transmit_min`;
+    beyond it the belt slips. Every scenario is integrated at once with a semi-implicit
+    Euler step over arrays of shape ``(scenarios, elements)``.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : ConveyorFleet, Conveyance or sequence of Conveyance
+        Design of each scenario
+    q : array_like, optional
+        :math:`q` : Throughput loaded on the belt (:math:`t/h`) (default: 0, empty belt)
+    H : array_like, optional
+        :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+    curve : callable, optional
+        ``curve(t, v, v_rated, f_u)`` giving the drive force of every scenario from the time,
+        the drive belt speed, the design belt speed and the running :math:`F_U`, such as
+        :class:`DirectOnLine`, :class:`SoftStart`, :class:`VariableSpeed` or :class:`Coast`,
+        whose parameters may be arrays of one value per scenario. A curve that cannot be
+        pickled, such as a lambda, is evaluated in this process whatever ``workers``
+        (default: ``DirectOnLine()``, or ``Coast()`` when ``running``)
+    duration : float, optional
+        Simulated time (s) (default: 30)
+    elements : int, optional
+        Number of lumped elements of the belt loop (default: 100)
+    modulus : float or ndarray, optional
+        Axial stiffness of the belt per metre of width (:math:`N/m`) (default: 1e7)
+    damping : float, optional
+        Damping ratio of the belt springs (default: 0.05)
+    record : float, optional
+        Interval between recorded samples (s) (default: 0.1)
+    dt : float, optional
+        Time step (s) (default: half the stability limit of the stiffest element)
+    running : bool, optional
+        Start from steady running rather than from rest, to simulate stopping
+        (default: False)
+    workers : int, optional
+        Number of worker processes sharing the scenarios, ``os.cpu_count()`` if not set.
+        With 1 worker the scenarios are simulated in this process. The results do not
+        depend on it.
+
+    Returns
+    -------
+    TransientResult
+        Recorded samples and peak values of every scenario
+
+    """
+    if not isinstance(designs, ConveyorFleet):
+        designs = ConveyorFleet.from_conveyances(designs if isinstance(designs, (list, tuple)) else [designs])
+    if curve is None:
+        curve = Coast() if running else DirectOnLine()
+    n = len(designs)
+    columns = {name: np.array(values) for name, values in designs.columns.items()}
+    q = np.broadcast_to(np.asarray(q, dtype=float), (n,))
+    H = np.broadcast_to(np.asarray(H, dtype=float), (n,))
+    modulus = np.broadcast_to(np.asarray(modulus, dtype=float), (n,))
+
+    if dt is None:
+        mass, stiffness = _loop(SimpleNamespace(**columns), q, H, elements, modulus)[:2]
+        omega = 2 * np.sqrt(stiffness / mass) * (math.sqrt(1 + damping ** 2) + damping)
+        dt = float(1 / omega.max())
+    every = max(int(round(record / dt)), 1)
+
+    bounds = np.linspace(0, n, min(workers or os.cpu_count() or 1, n) + 1).astype(int)
+    tasks = [({name: values[start:stop] for name, values in columns.items()}, q[start:stop], H[start:stop],
+              _select(curve, n, start, stop),
+              duration, dt, every, elements, modulus[start:stop], damping, running)
+             for start, stop in zip(bounds[:-1], bounds[1:])]
+    if len(tasks) == 1 or not _picklable(curve):
+        chunks = [_simulate(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+            chunks = list(executor.map(_simulate, *zip(*tasks)))
+
+    fields = [np.concatenate(values) for values in zip(*chunks)]
+    time = np.arange(fields[0].shape[1]) * every * dt
+    return TransientResult(time, *fields)
@@ -0,0 +1,236 @@
+import itertools
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from conveyance.surrogate import ThroughputSurrogate
+
+EnergyRollup = namedtuple('EnergyRollup', [
+    'samples', 'hours', 'running_hours', 'loaded_hours', 'tonnes', 'kwh', 'kwh_per_t', 'peak_kw',
+])
+EnergyRollup.__doc__ = """Energy used by a conveyor over a throughput series
+
+Attributes
+----------
+samples : int
+    Number of valid samples
+hours : float
+    Time covered by the valid samples (:math:`h`)
+running_hours : float
+    Time the belt was running, loaded or empty (:math:`h`)
+loaded_hours : float
+    Time the belt was carrying material (:math:`h`)
+tonnes : float
+    Material conveyed (:math:`t`)
+kwh : float
+    Energy drawn by the drive motor (:math:`kWh`)
+kwh_per_t : float
+    Specific energy, NaN if no material was conveyed (:math:`kWh/t`)
+peak_kw : float
+    Largest power drawn (:math:`kW`)
+"""
+
+
+def read_series(path, chunk_size=1 << 20):
+    """Read a throughput series in chunks.
+
+    CSV files hold one sample per line, either ``q`` alone or ``t, q`` with the time in
+    seconds, and may start with a header line. ``.npy`` files hold an array of the same
+    columns, which is memory-mapped rather than read whole.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    path : str
+        Path to a ``.csv`` or ``.npy`` file
+    chunk_size : int, optional
+        Number of samples per chunk (default: 1048576)
+
+    Yields
+    ------
+    numpy.ndarray
+        Samples of shape ``(n, columns)``
+
+    """
+    if path.endswith('.npy'):
+        series = np.load(path, mmap_mode='r')
+        if series.ndim == 1:
+            series = series[:, None]
+        for start in range(0, series.shape[0], chunk_size):
+            yield np.array(series[start:start + chunk_size], dtype=float)
+        return
+
+    with open(path) as f:
+        first = f.readline()
+        try:
+            float(first.split(',')[0])
+            lines = itertools.chain([first], f)
+        except ValueError:
+            lines = f  # Header line
+        while True:
+            chunk = list(itertools.islice(lines, chunk_size))
+            if not chunk:
+                return
+            yield np.loadtxt(chunk, delimiter=',', ndmin=2)
+
+
+class EnergyAccumulator:
+    """Running energy totals of a conveyor fed with consecutive chunks of a throughput series.
+
+    Power is :math:`P_A` of the design chain at each sample's throughput, evaluated with
+    the exact polynomial of :class:`~conveyance.surrogate.ThroughputSurrogate`. Each sample
+    holds until the next one, so series may be irregular; the last sample holds for the
+    interval before it. Samples with a NaN throughput are skipped, and negative throughputs
+    count as zero.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    c : Conveyance
+        Conveyor design
+    H : float, optional
+        The conveyor lift (m) (default: 0)
+    dt : float, optional
+        Interval between samples (s), for series without a time column
+    idle : {'run', 'stop'}, optional
+        Whether the belt keeps running empty or is stopped when the throughput is zero
+        (default: ``'run'``)
+
+    """
+
+    def __init__(self, c, H=0, dt=None, idle='run'):
+        if idle not in ('run', 'stop'):
+            raise ValueError("idle must be 'run' or 'stop', got {!r}".format(idle))
+        self._surrogate = ThroughputSurrogate(c, H=H)
+        self.dt = dt
+        self.idle = idle
+        self._last = None  # Last sample, held until the time of the next one is known
+        self._last_dt = np.nan
+        # Samples, seconds, running seconds, loaded seconds, tonnes and joules
+        self._totals = np.zeros(6)
+        self._peak = 0.0
+
+    def update(self, chunk):
+        """Add the next samples of the series.
+
+        Parameters
+        ----------
+        chunk : array_like
+            Samples of shape ``(n, 2)`` as ``t, q``, or ``(n,)`` / ``(n, 1)`` of ``q`` when
+            the accumulator has a fixed ``dt``
+
+        """
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.ndim == 1:
+            chunk = chunk[:, None]
+        if chunk.shape[1] == 1:
+            if self.dt is None:
+                raise ValueError('A series without a time column needs dt')
+            q = chunk[:, 0]
+            self._add(q, np.full(q.shape, float(self.dt)))
+            return
+
+        t, q = chunk[:, 0], chunk[:, 1]
+        if self._last is not None:
+            t = np.concatenate(([self._last[0]], t))
+            q = np.concatenate(([self._last[1]], q))
+        if t.size > 1:
+            dt = np.diff(t)
+            self._last_dt = dt[-1]
+            self._add(q[:-1], dt)
+        self._last = (t[-1], q[-1])
+
+    def _sums(self, q, dt):
+        """Totals and peak power of samples held for intervals ``dt``"""
+        valid = ~np.isnan(q)
+        q = np.maximum(q[valid], 0)
+        dt = dt[valid]
+        loaded = q > 0
+        p_a = self._surrogate.p_a(q)
+        if self.idle == 'stop':
+            p_a[~loaded] = 0
+            running = dt[loaded].sum()
+        else:
+            running = dt.sum()
+        sums = np.array([q.size, dt.sum(), running, dt[loaded].sum(), np.dot(q, dt) / 3600, np.dot(p_a, dt)])
+        return sums, float(p_a.max()) if p_a.size else 0.0
+
+    def _add(self, q, dt):
+        sums, peak = self._sums(q, dt)
+        self._totals += sums
+        self._peak = max(self._peak, peak)
+
+    def result(self):
+        """Totals of the series so far, including the last sample.
+
+        Returns
+        -------
+        EnergyRollup
+            Energy and throughput totals
+
+        """
+        totals, peak = self._totals, self._peak
+        if self._last is not None and not np.isnan(self._last_dt):
+            sums, last_peak = self._sums(np.array([self._last[1]]), np.array([self._last_dt]))
+            totals, peak = totals + sums, max(peak, last_peak)
+        samples, seconds, running, loaded, tonnes, joules = totals.tolist()
+        kwh = joules / 3.6e6
+        return EnergyRollup(samples=int(samples), hours=seconds / 3600, running_hours=running / 3600,
+                            loaded_hours=loaded / 3600, tonnes=tonnes, kwh=kwh,
+                            kwh_per_t=kwh / tonnes if tonnes else np.nan, peak_kw=peak / 1000)
+
+
+def _series_energy(params, path, H, dt, idle, chunk_size):
+    """Accumulate the energy of one design over one series file"""
+    accumulator = EnergyAccumulator(SimpleNamespace(**params), H=H, dt=dt, idle=idle)
+    for chunk in read_series(path, chunk_size=chunk_size):
+        accumulator.update(chunk)
+    return accumulator.result()
+
+
+def series_energy(designs, paths, H=0, dt=None, idle='run', workers=None, chunk_size=1 << 20):
+    """
+    Calculate the energy used by each conveyor of a fleet over its throughput series
+
+    Every series is read in chunks of ``chunk_size`` samples with :func:`read_series` and
+    accumulated with :class:`EnergyAccumulator`, so memory use does not depend on the
+    length of the series. Conveyors are processed in parallel.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : sequence of Conveyance
+        Conveyor designs
+    paths : sequence of str
+        Path to the throughput series of each design
+    H : float or sequence of float, optional
+        The conveyor lift (m), shared or per design (default: 0)
+    dt : float, optional
+        Interval between samples (s), for series without a time column
+    idle : {'run', 'stop'}, optional
+        Whether belts keep running empty or are stopped when the throughput is zero
+        (default: ``'run'``)
+    workers : int, optional
+        Number of worker processes, ``os.cpu_count()`` if not set
+    chunk_size : int, optional
+        Number of samples read at a time (default: 1048576)
+
+    Returns
+    -------
+    list of EnergyRollup
+        Energy totals of each design, in the order of ``designs``
+
+    """
+    H = np.broadcast_to(np.asarray(H, dtype=float), (len(designs),)).tolist()
+    tasks = [(dict(vars(c)), path, h, dt, idle, chunk_size) for c, path, h in zip(designs, paths, H)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        return [_series_energy(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return list(executor.map(_series_energy, *zip(*tasks)))
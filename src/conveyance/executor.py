@@ -0,0 +1,206 @@
+import os
+import sys
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from conveyance import solver
+from conveyance.fleet import FIELDS, ConveyorFleet
+
+#: Rows of the input block: the design parameters, then the operating point
+INPUTS = FIELDS + ('q', 'H')
+
+
+def _solve_slice(inputs, outputs, fields, start, stop, chunk_size):
+    """Solve designs ``start:stop`` of the input rows into the output rows, a chunk at a time
+
+    Chunks start at multiples of ``chunk_size``, so every design is evaluated within the
+    same chunk whichever worker, or slice, it falls in.
+    """
+    index = [solver.DesignResult._fields.index(f) for f in fields]
+    for begin in range(start, stop, chunk_size):
+        end = min(begin + chunk_size, stop)
+        c = SimpleNamespace(**{name: row[begin:end] for name, row in zip(INPUTS, inputs)})
+        result = solver._design_chain(c, c.q, c.H, xp=np)
+        for row, i in enumerate(index):
+            outputs[row, begin:end] = result[i]
+
+
+def _attach(name, shape):
+    """Attach to a shared memory block as a float64 array"""
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=float, buffer=block.buf)
+
+
+def _solve_task(inputs, outputs, n, fields, start, stop, chunk_size):
+    """Solve a slice in a worker, with the blocks passed by name only"""
+    input_block, input_array = _attach(inputs, (len(INPUTS), n))
+    output_block, output_array = _attach(outputs, (len(fields), n))
+    try:
+        _solve_slice(input_array, output_array, fields, start, stop, chunk_size)
+    finally:
+        del input_array, output_array
+        input_block.close()
+        output_block.close()
+    return stop - start
+
+
+def _release(blocks, pool):
+    """Shut down the workers, then close and unlink the shared memory blocks"""
+    if pool:
+        pool.pop().shutdown(wait=True)
+    while blocks:
+        block = blocks.pop()
+        block.close()
+        block.unlink()
+
+
+class SharedMemoryExecutor:
+    """Process pool solving fleets in place in shared memory.
+
+    The input columns of a fleet, its parameter block with the throughput and lift, and
+    the result columns are placed in :mod:`multiprocessing.shared_memory` blocks. Each
+    worker attaches to them by name and solves a disjoint slice of designs into the
+    result block in place, so no arrays or designs are pickled between processes, only
+    block names and slice bounds. Within a slice the design chain is evaluated
+    ``chunk_size`` designs at a time, keeping its intermediates in cache.
+
+    Results do not depend on the number of workers: chunk boundaries are fixed
+    multiples of ``chunk_size`` however the slices fall, so every design is evaluated
+    by the same operations.
+
+    The blocks are reused by later calls that fit in them, and released with the
+    workers by :meth:`close`, on leaving a ``with`` block, or when the executor is
+    garbage collected.
+
+    Shared memory needs Python 3.8 or later; on earlier versions the executor solves
+    every fleet in this process, as with 1 worker.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of worker processes, ``os.cpu_count()`` if not set. With 1 worker, or
+        before Python 3.8, the designs are solved in this process.
+    chunk_size : int, optional
+        Number of designs evaluated at a time (default: 8192, about 64 KiB per column)
+    slices_per_worker : int, optional
+        Number of slices each worker's share of a fleet is split into, balancing the
+        load between workers (default: 4)
+
+    Examples
+    --------
+    >>> with SharedMemoryExecutor(workers=8) as executor:  # doctest: +SKIP
+    ...     result = executor.solve(fleet, q=2300, H=5)
+
+    """
+
+    def __init__(self, workers=None, chunk_size=8192, slices_per_worker=4):
+        self.workers = workers or os.cpu_count() or 1
+        if sys.version_info < (3, 8):
+            self.workers = 1
+        self.chunk_size = chunk_size
+        self.slices_per_worker = slices_per_worker
+        self._pool = []
+        self._blocks = []
+        self._release = weakref.finalize(self, _release, self._blocks, self._pool)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def closed(self):
+        """bool: Whether the workers and shared memory have been released"""
+        return not self._release.alive
+
+    def close(self):
+        """Shut down the workers and release the shared memory blocks."""
+        self._release()
+
+    def _block(self, slot, nbytes):
+        """Shared memory block ``slot`` (0 for inputs, 1 for results) of at least ``nbytes``"""
+        from multiprocessing import shared_memory
+
+        if len(self._blocks) > slot and self._blocks[slot].size >= nbytes:
+            return self._blocks[slot]
+        if len(self._blocks) > slot:
+            self._blocks[slot].close()
+            self._blocks[slot].unlink()
+            self._blocks[slot] = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self._blocks.append(shared_memory.SharedMemory(create=True, size=nbytes))
+        return self._blocks[slot]
+
+    def solve(self, designs, q, H=0, fields=None):
+        """Solve every design of a fleet at a throughput.
+
+        Parameters
+        ----------
+        designs : ConveyorFleet, Conveyance or sequence of Conveyance
+            Conveyor designs
+        q : array_like
+            :math:`q` : Throughput of the conveyor (:math:`t/h`), a scalar or one value
+            per design
+        H : array_like, optional
+            :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+        fields : sequence of str, optional
+            :class:`~conveyance.solver.DesignResult` fields computed (default: all)
+
+        Returns
+        -------
+        conveyance.solver.DesignResult
+            Resistances, power and tensions of every design, holding None for fields
+            not computed
+
+        """
+        if self.closed:
+            raise ValueError('Executor is closed')
+        if not isinstance(designs, ConveyorFleet):
+            designs = ConveyorFleet.from_conveyances(designs if isinstance(designs, (list, tuple)) else [designs])
+        fields = tuple(fields or solver.DesignResult._fields)
+        n = len(designs)
+
+        bounds = np.arange(0, n, self.chunk_size)
+        slices = np.array_split(bounds, min(self.workers * self.slices_per_worker, len(bounds)) or 1)
+        slices = [(int(s[0]), int(min(s[-1] + self.chunk_size, n))) for s in slices if len(s)]
+
+        q = np.broadcast_to(np.asarray(q, dtype=float), (n,))
+        H = np.broadcast_to(np.asarray(H, dtype=float), (n,))
+        if self.workers == 1 or len(slices) < 2:
+            outputs = np.empty((len(fields), n))
+            for start, stop in slices:
+                _solve_slice(list(designs.data) + [q, H], outputs, fields, start, stop, self.chunk_size)
+        else:
+            outputs = self._solve_shared(designs.data, q, H, fields, slices)
+        values = dict(zip(fields, outputs))
+        return solver.DesignResult(**{f: values.get(f) for f in solver.DesignResult._fields})
+
+    def _solve_shared(self, data, q, H, fields, slices):
+        """Solve the slices across the workers through the shared memory blocks"""
+        n = data.shape[1]
+        input_block = self._block(0, 8 * len(INPUTS) * n)
+        output_block = self._block(1, 8 * len(fields) * n)
+        inputs = np.ndarray((len(INPUTS), n), dtype=float, buffer=input_block.buf)
+        outputs = np.ndarray((len(fields), n), dtype=float, buffer=output_block.buf)
+        try:
+            inputs[:len(FIELDS)] = data
+            inputs[len(FIELDS)] = q
+            inputs[len(FIELDS) + 1] = H
+            if not self._pool:
+                self._pool.append(ProcessPoolExecutor(max_workers=self.workers))
+            futures = [self._pool[0].submit(_solve_task, input_block.name, output_block.name, n, fields,
+                                            start, stop, self.chunk_size) for start, stop in slices]
+            for future in futures:
+                future.result()
+            return outputs.copy()
+        finally:
+            # Views of the blocks must go before the blocks can be closed
+            del inputs, outputs
@@ -0,0 +1,201 @@
+import glob
+import os
+
+import numpy as np
+
+from conveyance import solver
+from conveyance.conveyance import PARAMETERS, Conveyance, _load_parameters
+
+#: Names of the design parameters, in column order
+FIELDS = tuple(name for name, _, _, _ in PARAMETERS)
+_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+
+class ConveyorFleet:
+    """Many conveyor designs stored as columns of a single array.
+
+    Each design parameter of :class:`~conveyance.conveyance.Conveyance` is a row of one
+    ``(len(FIELDS), n)`` float64 block, so every parameter is available as a contiguous
+    column of all designs, e.g. ``fleet.v``. Columns are views into the block and can be
+    passed straight to :mod:`conveyance.vec` and :mod:`conveyance.solver`.
+
+    .. versionadded:: 0.1.0
+
+    Attributes
+    ----------
+    data : numpy.ndarray
+        Parameter block of shape ``(len(FIELDS), n)``
+
+    """
+
+    def __init__(self, data):
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 2 or data.shape[0] != len(FIELDS):
+            raise ValueError('Expected data of shape ({}, n), got {}'.format(len(FIELDS), data.shape))
+        object.__setattr__(self, 'data', data)
+
+    @classmethod
+    def empty(cls, n):
+        """Create a fleet of ``n`` designs with uninitialised parameters.
+
+        Parameters
+        ----------
+        n : int
+            Number of designs
+
+        Returns
+        -------
+        ConveyorFleet
+            The fleet
+
+        """
+        return cls(np.empty((len(FIELDS), n)))
+
+    @classmethod
+    def from_conveyances(cls, designs):
+        """Create a fleet from a sequence of designs.
+
+        Parameters
+        ----------
+        designs : sequence of Conveyance
+            Conveyor designs
+
+        Returns
+        -------
+        ConveyorFleet
+            The fleet
+
+        """
+        fleet = cls.empty(len(designs))
+        for i, name in enumerate(FIELDS):
+            fleet.data[i] = [getattr(c, name) for c in designs]
+        return fleet
+
+    @classmethod
+    def from_columns(cls, columns, n=None):
+        """Create a fleet from parameter columns.
+
+        Parameters
+        ----------
+        columns : dict
+            Every name in :data:`FIELDS` to an array of values, or a scalar shared by all designs
+        n : int, optional
+            Number of designs, if every column is a scalar
+
+        Returns
+        -------
+        ConveyorFleet
+            The fleet
+
+        """
+        if n is None:
+            n = max(np.size(columns[name]) for name in FIELDS)
+        fleet = cls.empty(n)
+        for i, name in enumerate(FIELDS):
+            fleet.data[i] = columns[name]
+        return fleet
+
+    @classmethod
+    def from_yaml(cls, paths, workers=None, cache_dir=None):
+        """Load a fleet from YAML design files.
+
+        Parameters
+        ----------
+        paths : sequence of str
+            Paths to YAML files
+        workers : int, optional
+            Number of parsing processes, ``os.cpu_count()`` if not set
+        cache_dir : str, optional
+            Directory holding the parsed parameter cache, see
+            :meth:`~conveyance.conveyance.Conveyance.load_many`
+
+        Returns
+        -------
+        ConveyorFleet
+            The fleet, in the order of ``paths``
+
+        """
+        params = _load_parameters(paths, workers=workers, cache_dir=cache_dir)
+        fleet = cls.empty(len(params))
+        for i, name in enumerate(FIELDS):
+            fleet.data[i] = [p[name] for p in params]
+        return fleet
+
+    @classmethod
+    def from_yaml_dir(cls, directory, pattern='*.yaml', workers=None, cache_dir=None):
+        """Load a fleet from every YAML design file in a directory.
+
+        Parameters
+        ----------
+        directory : str
+            Directory containing the design files
+        pattern : str, optional
+            Glob pattern of the design files (default: ``'*.yaml'``)
+        workers : int, optional
+            Number of parsing processes, ``os.cpu_count()`` if not set
+        cache_dir : str, optional
+            Directory holding the parsed parameter cache
+
+        Returns
+        -------
+        ConveyorFleet
+            The fleet, ordered by file name
+
+        """
+        paths = sorted(glob.glob(os.path.join(directory, pattern)))
+        return cls.from_yaml(paths, workers=workers, cache_dir=cache_dir)
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def __getattr__(self, name):
+        index = _INDEX.get(name)
+        if index is None:
+            raise AttributeError(name)
+        return self.data[index]
+
+    def __setattr__(self, name, value):
+        if name not in _INDEX:
+            raise AttributeError('{} is not a design parameter'.format(name))
+        self.data[_INDEX[name]] = value
+
+    def __getitem__(self, key):
+        """A single design for an integer, otherwise a fleet selected by slice, mask or index array"""
+        if isinstance(key, (int, np.integer)):
+            return Conveyance.from_parameters(dict(zip(FIELDS, self.data[:, key].tolist())))
+        return ConveyorFleet(self.data[:, key])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return '<ConveyorFleet of {} designs>'.format(len(self))
+
+    @property
+    def columns(self):
+        """dict: Parameter name to a view of its column"""
+        return dict(zip(FIELDS, self.data))
+
+    @property
+    def nbytes(self):
+        """int: Memory used by the parameter block"""
+        return self.data.nbytes
+
+    def solve(self, q, H=0):
+        """Solve every design at a throughput.
+
+        Parameters
+        ----------
+        q : array_like
+            Throughput of the conveyor (t/h), a scalar or one value per design
+        H : array_like, optional
+            The conveyor lift (m) (default: 0)
+
+        Returns
+        -------
+        conveyance.solver.DesignResult
+            Resistances, power and tensions of every design
+
+        """
+        return solver.solve_batch(self, q=q, H=H)
@@ -0,0 +1,275 @@
+"""Binary fleet files, memory-mapped for loading without copying.
+
+A fleet file holds, in order:
+
+* an 8 byte magic string, ``CONVFLT\\0``
+* the layout version and the length of the header, as little-endian 32 bit integers
+* a JSON header with the library version, the number of designs ``n``, the value dtype,
+  the name, units and description of every parameter, and the names of any stored results
+* padding to a 64 byte boundary
+* the values: one contiguous column of ``n`` little-endian float64 per parameter, in the
+  order of the header, followed by one per stored result
+
+The parameter columns have the layout of :attr:`ConveyorFleet.data
+<conveyance.fleet.ConveyorFleet>`, so an opened file is used directly by the calculations.
+"""
+import json
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+import yaml
+
+from conveyance import __version__, solver
+from conveyance.conveyance import PARAMETERS
+from conveyance.fleet import FIELDS, ConveyorFleet
+
+#: First bytes of every fleet file
+MAGIC = b'CONVFLT\x00'
+
+#: Version of the fleet file layout
+FORMAT_VERSION = 1
+
+# Magic, layout version and header length, followed by the JSON header
+_PREAMBLE = struct.Struct('<8sII')
+_ALIGN = 64
+_DTYPE = np.dtype('<f8')
+
+FleetFile = namedtuple('FleetFile', ['fleet', 'results', 'header'])
+FleetFile.__doc__ = """Contents of a fleet file
+
+Attributes
+----------
+fleet : ConveyorFleet
+    Design parameters, backed by the memory-mapped file
+results : DesignResult or None
+    Memory-mapped columns of stored results, where the file holds them; fields not stored are None
+header : dict
+    The JSON header, including the field names, units and versions
+"""
+
+
+def _header(n, results):
+    return {
+        'format': FORMAT_VERSION,
+        'library': __version__,
+        'n': n,
+        'dtype': _DTYPE.str,
+        'fields': [{'name': name, 'units': units, 'description': description}
+                   for name, _, units, description in PARAMETERS],
+        'results': list(results),
+    }
+
+
+def _write_header(stream, n, results):
+    """Write the preamble and header padded to the start of the values, returning their offset"""
+    unknown = set(results) - set(solver.DesignResult._fields)
+    if unknown:
+        raise ValueError('Unknown result fields {}'.format(sorted(unknown)))
+    text = json.dumps(_header(n, results)).encode()
+    offset = _offset(len(text))
+    stream.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(text)))
+    stream.write(text)
+    stream.write(b' ' * (offset - _PREAMBLE.size - len(text)))
+    return offset
+
+
+def _offset(length):
+    """Start of the values after a header of ``length`` bytes, aligned for vectorised access"""
+    return -(-(_PREAMBLE.size + length) // _ALIGN) * _ALIGN
+
+
+def create(path, n, results=()):
+    """Create a fleet file of ``n`` designs with uninitialised values, open for writing.
+
+    The file is sized up front and filled through the returned memory-mapped columns, so
+    fleets larger than memory can be written column by column.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    path : str
+        Path to the new file
+    n : int
+        Number of designs
+    results : sequence of str, optional
+        :class:`~conveyance.solver.DesignResult` fields to store alongside the parameters
+
+    Returns
+    -------
+    FleetFile
+        Writable memory-mapped contents of the file
+
+    """
+    with open(path, 'wb') as stream:
+        offset = _write_header(stream, n, results)
+        stream.truncate(offset + (len(FIELDS) + len(results)) * n * _DTYPE.itemsize)
+    return open_fleet(path, mode='r+')
+
+
+def save(path, fleet, results=None, fields=None):
+    """Write a fleet, and optionally its results, to a fleet file.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    path : str
+        Path to the new file
+    fleet : ConveyorFleet
+        Design parameters
+    results : DesignResult or IsoResult, optional
+        Results of the fleet, e.g. from :meth:`~conveyance.fleet.ConveyorFleet.solve`
+    fields : sequence of str, optional
+        Result fields to store (default: every :class:`~conveyance.solver.DesignResult`
+        field of ``results``)
+
+    """
+    if results is None:
+        fields = ()
+    elif fields is None:
+        fields = [name for name in solver.DesignResult._fields if name in results._fields]
+    with open(path, 'wb') as stream:
+        _write_header(stream, len(fleet), fields)
+        fleet.data.astype(_DTYPE, copy=False).tofile(stream)
+        for name in fields:
+            values = np.asarray(getattr(results, name), dtype=_DTYPE)
+            np.ascontiguousarray(np.broadcast_to(values, (len(fleet),))).tofile(stream)
+
+
+def open_fleet(path, mode='r'):
+    """Open a fleet file without reading its values.
+
+    Columns are views of the memory-mapped file: nothing is read until a column is used,
+    and only the pages touched are loaded.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    path : str
+        Path to the fleet file
+    mode : {'r', 'r+', 'c'}, optional
+        Read-only, read-write or copy-on-write, as for :class:`numpy.memmap` (default: ``'r'``)
+
+    Returns
+    -------
+    FleetFile
+        Memory-mapped contents of the file
+
+    """
+    with open(path, 'rb') as stream:
+        magic, version, length = _PREAMBLE.unpack(stream.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError('{} is not a fleet file'.format(path))
+        if version != FORMAT_VERSION:
+            raise ValueError('Unsupported fleet file version {}'.format(version))
+        header = json.loads(stream.read(length).decode())
+
+    n = header['n']
+    names = [field['name'] for field in header['fields']]
+    rows = len(names) + len(header['results'])
+    offset = _offset(length)
+    if n:
+        block = np.memmap(path, dtype=np.dtype(header['dtype']), mode=mode, offset=offset, shape=(rows, n))
+    else:
+        block = np.empty((rows, 0))
+
+    params = block[:len(names)]
+    if tuple(names) == FIELDS:
+        fleet = ConveyorFleet(params)
+    else:
+        # Written by a version of the library with other parameters, so the columns are copied
+        missing = set(FIELDS) - set(names)
+        if missing:
+            raise ValueError('Fleet file is missing parameters {}'.format(sorted(missing)))
+        fleet = ConveyorFleet.from_columns(dict(zip(names, params)), n=n)
+
+    results = None
+    if header['results']:
+        stored = dict(zip(header['results'], block[len(names):]))
+        results = solver.DesignResult(*[stored.get(name) for name in solver.DesignResult._fields])
+    return FleetFile(fleet=fleet, results=results, header=header)
+
+
+def from_yaml(paths, path, workers=None, cache_dir=None):
+    """Convert ``conveyor_design`` YAML files to a fleet file.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    paths : sequence of str
+        Paths to YAML design files
+    path : str
+        Path to the new fleet file
+    workers : int, optional
+        Number of parsing processes, ``os.cpu_count()`` if not set
+    cache_dir : str, optional
+        Directory holding the parsed parameter cache, see
+        :meth:`~conveyance.conveyance.Conveyance.load_many`
+
+    """
+    save(path, ConveyorFleet.from_yaml(paths, workers=workers, cache_dir=cache_dir))
+
+
+def design_yaml(c):
+    """Write the parameters of one design in the ``conveyor_design`` YAML schema.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    c : Conveyance
+        Conveyor design
+
+    Returns
+    -------
+    str
+        YAML document readable by :class:`~conveyance.conveyance.Conveyance`
+
+    """
+    design = {}
+    for name, keys, _, _ in PARAMETERS:
+        section = design
+        for key in keys[:-1]:
+            section = section.setdefault(key, {})
+        value = getattr(c, name)
+        section[keys[-1]] = value.item() if hasattr(value, 'item') else value
+    return yaml.safe_dump({'version': 1.0, 'conveyor_design': design}, sort_keys=False)
+
+
+def to_yaml(path, directory, indices=None, pattern='design_{:07d}.yaml'):
+    """Convert designs of a fleet file to ``conveyor_design`` YAML files.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    path : str
+        Path to the fleet file
+    directory : str
+        Directory receiving the YAML files
+    indices : sequence of int, optional
+        Designs to convert (default: every design)
+    pattern : str, optional
+        File name of each design, formatted with its index (default: ``'design_{:07d}.yaml'``)
+
+    Returns
+    -------
+    list of str
+        Paths of the written files
+
+    """
+    fleet = open_fleet(path).fleet
+    if indices is None:
+        indices = range(len(fleet))
+    written = []
+    for i in indices:
+        out = os.path.join(directory, pattern.format(i))
+        with open(out, 'w') as stream:
+            stream.write(design_yaml(fleet[int(i)]))
+        written.append(out)
+    return written
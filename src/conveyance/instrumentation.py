@@ -0,0 +1,204 @@
+import functools
+import importlib
+import json
+import threading
+import time
+
+import numpy as np
+
+#: Calculation stages and the functions timed for each, as ``(module, function name)``
+STAGES = (
+    ('load', (('conveyance.conveyance', '_load_parameters'), ('conveyance.fleet', '_load_parameters'))),
+    ('parse', (('conveyance.conveyance', '_parse_parameters'),)),
+    ('capacity', (('conveyance.solver', '_capacity'),
+                  ('conveyance.belt_capacity', 'mass_density_material'),
+                  ('conveyance.belt_capacity', 'mass_density_idler'),
+                  ('conveyance.belt_capacity', 'volume_carried_material'),
+                  ('conveyance.belt_capacity', 'volumetric_flow'),
+                  ('conveyance.belt_capacity', 'belt_cs_area'),
+                  ('conveyance.vec', 'mass_density_material'),
+                  ('conveyance.vec', 'mass_density_idler'),
+                  ('conveyance.vec', 'volume_carried_material'),
+                  ('conveyance.vec', 'volumetric_flow'),
+                  ('conveyance.vec', 'belt_cs_area'))),
+    ('main', (('conveyance.solver', '_main'),
+              ('conveyance.conveyor_resistances', 'resistance_main'),
+              ('conveyance.vec', 'resistance_main'))),
+    ('secondary', (('conveyance.solver', '_secondary'),
+                   ('conveyance.conveyor_resistances', 'resistance_secondary'),
+                   ('conveyance.vec', 'resistance_secondary'))),
+    ('concentrated', (('conveyance.solver', '_concentrated'),
+                      ('conveyance.conveyor_resistances', 'resistance_concentrated'),
+                      ('conveyance.vec', 'resistance_concentrated'))),
+    ('gravity', (('conveyance.solver', '_gravity'),
+                 ('conveyance.conveyor_resistances', 'resistance_gravity'),
+                 ('conveyance.vec', 'resistance_gravity'))),
+    ('wrap', (('conveyance.solver', '_wrap'),
+              ('conveyance.conveyor_resistances', 'resistance_belt_wrap_iso'),
+              ('conveyance.vec', 'resistance_belt_wrap_iso'))),
+    ('tensions', (('conveyance.solver', '_sag_limits'),
+                  ('conveyance.solver', '_drive_tensions'),
+                  ('conveyance.conveyor_resistances', 'resistance_belt_sag_tension'),
+                  ('conveyance.conveyor_resistances', 'tension_transmit_min'),
+                  ('conveyance.vec', 'resistance_belt_sag_tension'),
+                  ('conveyance.vec', 'tension_transmit_min'))),
+    ('power', (('conveyance.solver', '_power'),
+               ('conveyance.power_requirements', 'power_requirements_motor'),
+               ('conveyance.vec', 'power_requirements_motor'))),
+)
+
+
+class Registry:
+    """Call counts, cumulative wall time and element counts of each calculation stage.
+
+    .. versionadded:: 0.1.0
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def record(self, name, seconds, elements=1):
+        """Add one call of a stage.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage
+        seconds : float
+            Wall time of the call (s)
+        elements : int, optional
+            Number of designs or values processed by the call (default: 1)
+
+        """
+        with self._lock:
+            totals = self._stages.setdefault(name, [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += elements
+
+    def reset(self):
+        """Discard every recorded call"""
+        with self._lock:
+            self._stages.clear()
+
+    def snapshot(self):
+        """Totals of each stage so far.
+
+        Returns
+        -------
+        dict
+            Stage name to a dict of ``calls``, ``seconds`` and ``elements``
+
+        """
+        with self._lock:
+            return {name: {'calls': calls, 'seconds': seconds, 'elements': elements}
+                    for name, (calls, seconds, elements) in sorted(self._stages.items())}
+
+    def to_json(self):
+        """Totals of each stage as a JSON document"""
+        return json.dumps({'stages': self.snapshot()}, indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix='conveyance_stage'):
+        """Totals of each stage in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for metric, key, help_text in (('calls_total', 'calls', 'Number of calls of each calculation stage'),
+                                       ('seconds_total', 'seconds', 'Wall time spent in each calculation stage'),
+                                       ('elements_total', 'elements', 'Designs or values processed by each stage')):
+            name = '{}_{}'.format(prefix, metric)
+            lines.append('# HELP {} {}'.format(name, help_text))
+            lines.append('# TYPE {} counter'.format(name))
+            for stage, totals in snapshot.items():
+                lines.append('{}{{stage="{}"}} {!r}'.format(name, stage, totals[key]))
+        return '\n'.join(lines) + '\n'
+
+
+#: Registry receiving the timings of the instrumented stages
+REGISTRY = Registry()
+
+_originals = {}
+
+
+def _elements(result):
+    """Number of designs or values in the result of a stage"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple):
+        result = result[0]
+    return int(np.size(result)) if isinstance(result, (np.ndarray, float, int)) else 1
+
+
+def _timed(name, function, registry):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        registry.record(name, time.perf_counter() - start, _elements(result))
+        return result
+    return wrapper
+
+
+def enable(registry=REGISTRY):
+    """Start timing the calculation stages.
+
+    Every function listed in :data:`STAGES` is replaced by a wrapper recording its calls
+    in ``registry``. While disabled the original functions are in place, so instrumentation
+    adds no overhead at all.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    registry : Registry, optional
+        Registry receiving the timings (default: :data:`REGISTRY`)
+
+    """
+    if _originals:
+        disable()
+    for name, functions in STAGES:
+        for module_name, attr in functions:
+            module = importlib.import_module(module_name)
+            function = getattr(module, attr)
+            _originals[module_name, attr] = function
+            setattr(module, attr, _timed(name, function, registry))
+
+
+def disable():
+    """Stop timing the calculation stages, restoring the original functions.
+
+    .. versionadded:: 0.1.0
+
+    """
+    for (module_name, attr), function in _originals.items():
+        setattr(importlib.import_module(module_name), attr, function)
+    _originals.clear()
+
+
+def is_enabled():
+    """Whether the calculation stages are being timed"""
+    return bool(_originals)
+
+
+class instrumented:
+    """Context manager timing the calculation stages within its block.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    registry : Registry, optional
+        Registry receiving the timings (default: :data:`REGISTRY`)
+
+    """
+
+    def __init__(self, registry=REGISTRY):
+        self.registry = registry
+
+    def __enter__(self):
+        enable(self.registry)
+        return self.registry
+
+    def __exit__(self, *exc):
+        disable()
@@ -0,0 +1,133 @@
+from conveyance import belt_capacity, conveyor_resistances, power_requirements, solver
+from conveyance.conveyance import PARAMETERS
+
+#: Inputs of a :class:`DesignModel`: the design parameters and the operating point
+INPUTS = tuple(name for name, _, _, _ in PARAMETERS) + ('q', 'H')
+
+#: Derived quantities of a :class:`DesignModel` as ``(name, dependencies, function)``,
+#: ordered so that every node follows the nodes it depends on
+NODES = (
+    ('q_m', ('v', 'q'),
+     lambda m: belt_capacity.mass_density_material(v=m.v, q=m.q) if m.q else 0.0),
+    ('q_v', ('q', 'p'),
+     lambda m: belt_capacity.volume_carried_material(q=m.q, p=m.p)),
+    ('q_ro', ('a_o', 'm_o'),
+     lambda m: belt_capacity.mass_density_idler(a=m.a_o, m=m.m_o)),
+    ('q_ru', ('a_u', 'm_u'),
+     lambda m: belt_capacity.mass_density_idler(a=m.a_u, m=m.m_u)),
+    ('f_h', ('q_m', 'q_b', 'q_ro', 'q_ru', 'c_l', 'install_a', 'ff'),
+     lambda m: conveyor_resistances.resistance_main(q_m=m.q_m, q_b=m.q_b, q_ro=m.q_ro, q_ru=m.q_ru,
+                                                    c_l=m.c_l, install_a=m.install_a, ff=m.ff)),
+    ('f_n', ('q_v', 'p', 'v', 'v_0', 'B', 'b1', 'mu1', 'mu2', 'wrap_a'),
+     lambda m: conveyor_resistances.resistance_secondary(q_v=m.q_v, p=m.p, v=m.v, v_0=m.v_0, B=m.B, b1=m.b1,
+                                                         mu1=m.mu1, mu2=m.mu2,
+                                                         wrap_a_h=m.wrap_a, wrap_a_t=m.wrap_a)),
+    ('f_s', ('q_v', 'p', 'v', 'l_s', 'b1', 'bc_w', 'bc_t', 'bc_p', 'bc_n', 'mu2', 'mu3'),
+     lambda m: conveyor_resistances.resistance_concentrated(q_v=m.q_v, p=m.p, v=m.v, l_s=m.l_s, b1=m.b1,
+                                                            bc_w=m.bc_w, bc_t=m.bc_t, bc_p=m.bc_p, bc_n=m.bc_n,
+                                                            mu2=m.mu2, mu3=m.mu3)),
+    ('f_st', ('q_m', 'H'),
+     lambda m: conveyor_resistances.resistance_gravity(q_m=m.q_m, H=m.H)),
+    ('f_u', ('f_h', 'f_n', 'f_s', 'f_st'),
+     lambda m: m.f_h + m.f_n + m.f_s + m.f_st),
+    ('p_a', ('f_u', 'v', 'd_eta_1', 'd_eta_2'),
+     lambda m: power_requirements.power_requirements_motor(f_u=m.f_u, v=m.v, d_eta_1=m.d_eta_1, d_eta_2=m.d_eta_2)),
+    ('f_bs_min_o', ('q_m', 'q_b', 'a_o', 'a_u', 'h_a_o', 'h_a_u'),
+     lambda m: conveyor_resistances.resistance_belt_sag_tension(q_m=m.q_m, q_b=m.q_b, a_o=m.a_o, a_u=m.a_u,
+                                                                h_a_o=m.h_a_o, h_a_u=m.h_a_u)[0]),
+    ('f_bs_min_u', ('q_m', 'q_b', 'a_o', 'a_u', 'h_a_o', 'h_a_u'),
+     lambda m: conveyor_resistances.resistance_belt_sag_tension(q_m=m.q_m, q_b=m.q_b, a_o=m.a_o, a_u=m.a_u,
+                                                                h_a_o=m.h_a_o, h_a_u=m.h_a_u)[1]),
+    ('t_2', ('f_u', 'wrap_a', 'mu_b', 'f_bs_min_o'),
+     lambda m: max(conveyor_resistances.tension_transmit_min(f_u=m.f_u, wrap_a=m.wrap_a, mu_b=m.mu_b)[1],
+                   m.f_bs_min_o)),
+    ('t_1', ('f_u', 't_2'),
+     lambda m: m.f_u + m.t_2),
+)
+
+_FUNCTIONS = {name: function for name, _, function in NODES}
+
+
+def _downstream():
+    """Map every input and node to all nodes that depend on it, directly or indirectly"""
+    downstream = {name: set() for name in INPUTS + tuple(_FUNCTIONS)}
+    for name, deps, _ in NODES:
+        for dep in deps:
+            for upstream in [dep] + [n for n, d in downstream.items() if dep in d]:
+                downstream[upstream].add(name)
+    return {name: tuple(nodes) for name, nodes in downstream.items()}
+
+
+_DOWNSTREAM = _downstream()
+
+
+class DesignModel:
+    """Conveyor design whose derived quantities are recomputed only when needed.
+
+    The derived quantities in :data:`NODES` (``q_m``, ``f_h``, ``f_u``, ``p_a``, ``t_1``, ...)
+    are evaluated on first read and then kept. Setting an input, such as ``model.v = 5.0``,
+    discards only the quantities downstream of it, which are recomputed the next time they
+    are read.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    c : Conveyance
+        Conveyor design parameters
+    q : float, optional
+        Throughput of the conveyor (t/h) (default: 0)
+    H : float, optional
+        The conveyor lift (m) (default: 0)
+
+    """
+
+    def __init__(self, c, q=0, H=0):
+        for name, _, _, _ in PARAMETERS:
+            object.__setattr__(self, name, getattr(c, name))
+        object.__setattr__(self, 'q', q)
+        object.__setattr__(self, 'H', H)
+
+    def __getattr__(self, name):
+        # Only reached when the node is not already stored on the instance
+        function = _FUNCTIONS.get(name)
+        if function is None:
+            raise AttributeError(name)
+        value = function(self)
+        object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        if name not in INPUTS:
+            raise AttributeError('{} is not an input of the design'.format(name))
+        object.__setattr__(self, name, value)
+        d = self.__dict__
+        for node in _DOWNSTREAM[name]:
+            d.pop(node, None)
+
+    def is_stale(self, name):
+        """Whether a derived quantity will be recomputed on its next read.
+
+        Parameters
+        ----------
+        name : str
+            Name of a derived quantity in :data:`NODES`
+
+        Returns
+        -------
+        bool
+            True if the quantity is not currently stored
+
+        """
+        return name not in self.__dict__
+
+    def result(self):
+        """Collect every derived quantity.
+
+        Returns
+        -------
+        conveyance.solver.DesignResult
+            Resistances, power and tensions of the design
+
+        """
+        return solver.DesignResult(*[getattr(self, name) for name in solver.DesignResult._fields])
@@ -0,0 +1,225 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from conveyance import solver
+from conveyance.fleet import FIELDS
+
+Summary = namedtuple('Summary', ['n', 'mean', 'min', 'max', 'quantiles'])
+Summary.__doc__ = """Distribution summary of a Monte Carlo output
+
+Attributes
+----------
+n : int
+    Number of finite samples
+mean : float
+    Mean of the samples
+min : float
+    Smallest sample
+max : float
+    Largest sample
+quantiles : dict
+    Quantile level, e.g. ``0.9``, to its estimated value
+"""
+
+
+class StreamingQuantiles:
+    """Fixed-memory quantile estimator for a stream of samples.
+
+    Samples are counted in ``bins`` equal-width bins over ``[lo, hi)``, with separate counts
+    below and above that range. Quantiles are interpolated from the cumulative counts, so
+    within the range they are accurate to ``(hi - lo) / bins``. Estimators over the same range
+    are merged by adding their counts.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    lo : float
+        Lower edge of the binned range
+    hi : float
+        Upper edge of the binned range
+    bins : int, optional
+        Number of bins (default: 8192)
+
+    """
+
+    def __init__(self, lo, hi, bins=8192):
+        self.lo = float(lo)
+        self.hi = float(hi) if hi > lo else float(lo) + 1
+        self.counts = np.zeros(bins + 2, dtype=np.int64)  # Underflow, bins, overflow
+        self.n = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def from_sample(cls, x, pad=0.5, bins=8192):
+        """Create an estimator whose range covers a pilot sample, widened by ``pad`` of its span on each side"""
+        x = np.asarray(x, dtype=float)
+        x = x[np.isfinite(x)]
+        lo, hi = (x.min(), x.max()) if x.size else (0.0, 1.0)
+        span = (hi - lo) or abs(hi) or 1.0
+        return cls(lo - pad * span, hi + pad * span, bins=bins)
+
+    def update(self, x):
+        """Add samples, ignoring any that are not finite"""
+        x = np.asarray(x, dtype=float).ravel()
+        x = x[np.isfinite(x)]
+        if not x.size:
+            return
+        bins = self.counts.size - 2
+        idx = np.floor((x - self.lo) * (bins / (self.hi - self.lo))).astype(np.int64)
+        np.clip(idx + 1, 0, bins + 1, out=idx)
+        self.counts += np.bincount(idx, minlength=bins + 2)
+        self.n += x.size
+        self.total += float(x.sum())
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+
+    def merge(self, other):
+        """Add the samples counted by an estimator over the same range"""
+        if (other.lo, other.hi, other.counts.size) != (self.lo, self.hi, self.counts.size):
+            raise ValueError('Estimators must share the same bins to be merged')
+        self.counts += other.counts
+        self.n += other.n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, levels):
+        """Estimate the values at quantile ``levels`` in [0, 1]"""
+        levels = np.asarray(levels, dtype=float)
+        if not self.n:
+            return np.full(levels.shape, np.nan)
+        bins = self.counts.size - 2
+        # Edges of the underflow bin, the regular bins and the overflow bin
+        edges = np.concatenate(([min(self.min, self.lo)], np.linspace(self.lo, self.hi, bins + 1),
+                                [max(self.max, self.hi)]))
+        cdf = np.concatenate(([0], np.cumsum(self.counts))) / self.n
+        values = np.interp(levels, cdf, edges)
+        return np.clip(values, self.min, self.max)
+
+    def summary(self, levels):
+        """Summarise the samples as a :class:`Summary`"""
+        mean = self.total / self.n if self.n else np.nan
+        return Summary(n=self.n, mean=mean, min=self.min, max=self.max,
+                       quantiles=dict(zip(levels, self.quantile(levels).tolist())))
+
+
+def _sample(rng, spec, size):
+    """Draw from a distribution given as ``(method, *args)`` of a NumPy Generator, or a callable"""
+    if callable(spec):
+        return np.asarray(spec(rng, size), dtype=float)
+    method, *args = spec
+    return getattr(rng, method)(*args, size=size)
+
+
+def _evaluate_chunk(params, distributions, q, H, iso, fields, seed, size):
+    """Sample the coefficients of one chunk and solve the design for every sample"""
+    rng = np.random.default_rng(seed)
+    c = SimpleNamespace(**params)
+    for name, spec in distributions.items():
+        setattr(c, name, _sample(rng, spec, size))
+    if iso:
+        result = solver.solve_iso(c, q=q, H=H)
+    else:
+        result = solver.solve_batch(c, q=q, H=H)
+    return [getattr(result, f) for f in fields]
+
+
+def _chunk_estimators(ranges, params, distributions, q, H, iso, fields, seed, size):
+    """Evaluate one chunk and count its outputs in estimators over the given ranges"""
+    values = _evaluate_chunk(params, distributions, q, H, iso, fields, seed, size)
+    estimators = []
+    for (lo, hi, bins), x in zip(ranges, values):
+        estimator = StreamingQuantiles(lo, hi, bins=bins)
+        estimator.update(x)
+        estimators.append(estimator)
+    return estimators
+
+
+def monte_carlo(c, q, distributions, n_samples, H=0, levels=(0.5, 0.9, 0.99), fields=('p_a', 'f_u', 't_1', 't_2'),
+                chunk_size=65536, seed=None, workers=1, iso=False, bins=8192):
+    """
+    Propagate uncertain design parameters through the design chain
+
+    Each parameter in ``distributions`` is replaced by random samples and the design is
+    solved for every sample, ``chunk_size`` samples at a time, so memory use does not grow
+    with ``n_samples``. The outputs are summarised with :class:`StreamingQuantiles`, using
+    the first chunk to set the binned range.
+
+    Every chunk draws from its own stream spawned from ``seed``, and the chunk estimators
+    are merged in chunk order, so results are identical for any number of ``workers``.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    c : Conveyance
+        Conveyor design providing the parameters that are not sampled
+    q : float
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    distributions : dict
+        Parameter name from :data:`~conveyance.fleet.FIELDS`, e.g. ``'ff'`` or ``'mu_b'``, to its distribution: either a tuple of the
+        :class:`numpy.random.Generator` method and its arguments, e.g. ``('normal', 0.02, 0.002)``
+        or ``('triangular', 0.25, 0.3, 0.4)``, or a callable ``f(rng, size)`` returning samples
+    n_samples : int
+        Number of samples
+    H : float, optional
+        :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+    levels : sequence of float, optional
+        Quantile levels to report (default: P50, P90 and P99)
+    fields : sequence of str, optional
+        :class:`~conveyance.solver.DesignResult` fields to summarise (default: power, :math:`F_U` and tensions)
+    chunk_size : int, optional
+        Number of samples solved at a time (default: 65536)
+    seed : int, optional
+        Seed making the run reproducible
+    workers : int, optional
+        Number of worker processes, ``os.cpu_count()`` if ``None`` (default: 1)
+    iso : bool, optional
+        Solve each sample with :func:`~conveyance.solver.solve_iso` (default: False)
+    bins : int, optional
+        Number of bins of each quantile estimator (default: 8192)
+
+    Returns
+    -------
+    dict
+        Field name to its :class:`Summary`
+
+    """
+    if n_samples < 1:
+        raise ValueError('n_samples must be positive')
+    for name in distributions:
+        if name not in FIELDS:
+            raise ValueError('Unknown parameter {!r}'.format(name))
+    params = dict(vars(c))
+    sizes = [min(chunk_size, n_samples - start) for start in range(0, n_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (params, distributions, q, H, iso, fields)
+
+    # The first chunk sets the range of the estimators
+    pilot = _evaluate_chunk(*args, seeds[0], sizes[0])
+    estimators = [StreamingQuantiles.from_sample(x, bins=bins) for x in pilot]
+    for estimator, x in zip(estimators, pilot):
+        estimator.update(x)
+
+    ranges = [(e.lo, e.hi, bins) for e in estimators]
+    tasks = [(ranges,) + args + (s, n) for s, n in zip(seeds[1:], sizes[1:])]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        for task in tasks:
+            for estimator, other in zip(estimators, _chunk_estimators(*task)):
+                estimator.merge(other)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Results arrive in chunk order, keeping the merged sums reproducible
+            for chunk in executor.map(_chunk_estimators, *zip(*tasks)):
+                for estimator, other in zip(estimators, chunk):
+                    estimator.merge(other)
+
+    return {f: e.summary(levels) for f, e in zip(fields, estimators)}
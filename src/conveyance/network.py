@@ -0,0 +1,260 @@
+import os
+from collections import deque
+
+import numpy as np
+import yaml
+
+from conveyance import solver
+from conveyance.conveyance import Conveyance, _YamlLoader
+from conveyance.fleet import ConveyorFleet
+
+
+class ConveyorNetwork:
+    """Conveyors feeding each other at transfer points.
+
+    The network is a directed acyclic graph: each conveyor receives a direct feed from
+    outside the network plus a fraction of the throughput of every conveyor transferring
+    on to it. A conveyor may split its throughput between several conveyors; any fraction
+    not transferred leaves the network, e.g. to a stockpile.
+
+    Throughput is linear in the feeds, so the network is reduced once, in topological
+    order, to a matrix giving the throughput of every conveyor from the feeds. All
+    conveyors are then solved together with :func:`~conveyance.solver.solve_batch`.
+    Changing a feed with :meth:`set_feed` marks only the conveyors downstream of it for
+    recalculation on the next :meth:`solve`.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : dict
+        Conveyor identifier to its :class:`~conveyance.conveyance.Conveyance`
+    transfers : sequence of tuple, optional
+        ``(from_id, to_id, fraction)`` for each transfer point
+    H : float or dict, optional
+        The conveyor lift (m), shared by every conveyor or by identifier (default: 0)
+    feeds : dict, optional
+        Conveyor identifier to the throughput fed on to it from outside the network (t/h)
+
+    Attributes
+    ----------
+    ids : tuple
+        Conveyor identifiers in topological order; results are ordered the same way
+    fleet : ConveyorFleet
+        Design parameters of the conveyors, in the order of :attr:`ids`
+
+    """
+
+    def __init__(self, designs, transfers=(), H=0, feeds=None):
+        children = {conveyor_id: [] for conveyor_id in designs}
+        n_parents = dict.fromkeys(designs, 0)
+        outflow = dict.fromkeys(designs, 0.0)
+        for from_id, to_id, fraction in transfers:
+            for conveyor_id in (from_id, to_id):
+                if conveyor_id not in designs:
+                    raise KeyError('Unknown conveyor {!r} in transfer'.format(conveyor_id))
+            children[from_id].append((to_id, fraction))
+            n_parents[to_id] += 1
+            outflow[from_id] += fraction
+        for conveyor_id, total in outflow.items():
+            if total > 1 + 1e-9:
+                raise ValueError('Conveyor {!r} transfers {:g} of its throughput'.format(conveyor_id, total))
+
+        # Kahn's algorithm, keeping the given order among conveyors that are ready together
+        ready = deque(conveyor_id for conveyor_id in designs if not n_parents[conveyor_id])
+        order = []
+        while ready:
+            conveyor_id = ready.popleft()
+            order.append(conveyor_id)
+            for to_id, _ in children[conveyor_id]:
+                n_parents[to_id] -= 1
+                if not n_parents[to_id]:
+                    ready.append(to_id)
+        if len(order) < len(designs):
+            raise ValueError('Transfers form a cycle through {}'.format(
+                sorted(str(i) for i, n in n_parents.items() if n)))
+
+        self.ids = tuple(order)
+        self._index = {conveyor_id: i for i, conveyor_id in enumerate(order)}
+        n = len(order)
+
+        # Row i gives the throughput of conveyor i per t/h fed on to each conveyor
+        transfer = np.eye(n)
+        for conveyor_id in order:
+            i = self._index[conveyor_id]
+            for to_id, fraction in children[conveyor_id]:
+                transfer[self._index[to_id]] += fraction * transfer[i]
+        self._transfer = transfer
+        self._downstream = [np.flatnonzero(transfer[:, j]) for j in range(n)]
+
+        self.fleet = ConveyorFleet.from_conveyances([designs[conveyor_id] for conveyor_id in order])
+        if isinstance(H, dict):
+            H = [H.get(conveyor_id, 0) for conveyor_id in order]
+        self._H = np.broadcast_to(np.asarray(H, dtype=float), (n,)).copy()
+        self._feeds = np.zeros(n)
+        self._result = None
+        self._stale = np.ones(n, dtype=bool)
+        for conveyor_id, q in (feeds or {}).items():
+            self.set_feed(conveyor_id, q)
+
+    @classmethod
+    def from_yaml(cls, file_path, workers=None, cache_dir=None):
+        """Load a network from a topology file and the design files it refers to.
+
+        The topology file lists the conveyors under ``conveyor_network``, each with the
+        path of its design file relative to the topology file and, optionally, its lift
+        ``H`` and external ``feed``, followed by the transfer points::
+
+            conveyor_network:
+              conveyors:
+                CV01: {design: cv01.yaml, feed: 2000}
+                CV02: {design: cv02.yaml, H: 12}
+              transfers:
+                - {from: CV01, to: CV02, fraction: 1.0}
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the topology YAML file
+        workers : int, optional
+            Number of parsing processes for the design files, ``os.cpu_count()`` if not set
+        cache_dir : str, optional
+            Directory holding the parsed parameter cache, see
+            :meth:`~conveyance.conveyance.Conveyance.load_many`
+
+        Returns
+        -------
+        ConveyorNetwork
+            The network
+
+        """
+        with open(file_path, 'rb') as stream:
+            network = yaml.load(stream.read(), Loader=_YamlLoader)['conveyor_network']
+
+        conveyors = network['conveyors']
+        root = os.path.dirname(file_path)
+        paths = [os.path.join(root, entry['design']) for entry in conveyors.values()]
+        designs = dict(zip(conveyors, Conveyance.load_many(paths, workers=workers, cache_dir=cache_dir)))
+        transfers = [(t['from'], t['to'], t.get('fraction', 1.0)) for t in network.get('transfers', ())]
+        H = {conveyor_id: entry.get('H', 0) for conveyor_id, entry in conveyors.items()}
+        feeds = {conveyor_id: entry['feed'] for conveyor_id, entry in conveyors.items() if 'feed' in entry}
+        return cls(designs, transfers=transfers, H=H, feeds=feeds)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def downstream(self, conveyor_id):
+        """Conveyors whose throughput depends on the feed on to ``conveyor_id``, itself included.
+
+        Parameters
+        ----------
+        conveyor_id : hashable
+            Conveyor identifier
+
+        Returns
+        -------
+        tuple
+            Conveyor identifiers in topological order
+
+        """
+        return tuple(self.ids[i] for i in self._downstream[self._index[conveyor_id]])
+
+    def set_feed(self, conveyor_id, q):
+        """Set the throughput fed on to a conveyor from outside the network.
+
+        Parameters
+        ----------
+        conveyor_id : hashable
+            Conveyor identifier
+        q : float
+            Feed throughput (t/h)
+
+        """
+        j = self._index[conveyor_id]
+        if self._feeds[j] != q:
+            self._feeds[j] = q
+            self._stale[self._downstream[j]] = True
+
+    def is_stale(self, conveyor_id):
+        """Whether a conveyor will be recalculated on the next :meth:`solve`.
+
+        Parameters
+        ----------
+        conveyor_id : hashable
+            Conveyor identifier
+
+        Returns
+        -------
+        bool
+            True if the conveyor's feed or an upstream feed changed since it was last solved
+
+        """
+        return bool(self._stale[self._index[conveyor_id]])
+
+    def throughput(self, feeds=None):
+        """Calculate the throughput of every conveyor.
+
+        Parameters
+        ----------
+        feeds : dict, optional
+            Conveyor identifier to feed throughput (t/h), scalars or arrays of scenarios of
+            a common shape (default: the feeds set on the network)
+
+        Returns
+        -------
+        numpy.ndarray
+            Throughput of each conveyor in the order of :attr:`ids` (t/h), with the shape
+            of the scenarios as trailing axes
+
+        """
+        if feeds is None:
+            return self._transfer @ self._feeds
+        if not feeds:
+            return np.zeros(len(self))
+        columns = [self._index[conveyor_id] for conveyor_id in feeds]
+        values = np.asarray(np.broadcast_arrays(*[np.asarray(q, dtype=float) for q in feeds.values()]))
+        transfer = self._transfer[:, columns]
+        return np.tensordot(transfer, values, axes=1)
+
+    def solve(self):
+        """Solve every conveyor at the feeds set on the network.
+
+        Only conveyors downstream of a feed changed since the last call are recalculated.
+
+        Returns
+        -------
+        conveyance.solver.DesignResult
+            Resistances, power and tensions of each conveyor, in the order of :attr:`ids`
+
+        """
+        stale = np.flatnonzero(self._stale)
+        if self._result is None:
+            result = solver.solve_batch(self.fleet, q=self.throughput(), H=self._H)
+            self._result = [np.array(values) for values in result]
+        elif stale.size:
+            q = self._transfer[stale] @ self._feeds
+            result = solver.solve_batch(self.fleet[stale], q=q, H=self._H[stale])
+            for values, new in zip(self._result, result):
+                values[stale] = new
+        self._stale[:] = False
+        return solver.DesignResult(*[values.copy() for values in self._result])
+
+    def solve_scenarios(self, feeds):
+        """Solve every conveyor for many feed scenarios at once.
+
+        Parameters
+        ----------
+        feeds : dict
+            Conveyor identifier to an array of feed throughputs (t/h), one per scenario;
+            conveyors not listed receive no feed
+
+        Returns
+        -------
+        conveyance.solver.DesignResult
+            Resistances, power and tensions of shape ``(len(ids),) + scenarios``
+
+        """
+        q = self.throughput(feeds)
+        extra = (1,) * (q.ndim - 1)
+        columns = {name: values.reshape(values.shape + extra) for name, values in self.fleet.columns.items()}
+        return solver.solve_batch(columns, q=q, H=self._H.reshape(self._H.shape + extra))
@@ -0,0 +1,278 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from conveyance import sizing, solver, vec
+from conveyance.conveyance import Conveyance
+from conveyance.fleet import FIELDS
+
+Optimum = namedtuple('Optimum', [
+    'params', 'design', 'result', 'cost', 'feasible', 'violation', 'generations', 'evaluations', 'history',
+])
+Optimum.__doc__ = """Best design found by the optimiser
+
+Attributes
+----------
+params : dict
+    Chosen value of every design parameter set by the variables
+design : Conveyance
+    The base design with the chosen parameters
+result : DesignResult
+    Resistances, power and tensions of the chosen design; with a fixed take-up tension
+    ``t_2``, the tensions at that take-up
+cost : float
+    Cost of the chosen design, :math:`P_A` (:math:`W`) by default
+feasible : bool
+    Whether the chosen design meets every constraint
+violation : float
+    Sum of the relative constraint violations of the chosen design, 0 when feasible
+generations : int
+    Number of generations evaluated
+evaluations : int
+    Number of candidate designs evaluated
+history : ndarray
+    Cost of the best design after each generation, NaN while no candidate was feasible
+"""
+
+
+def _apply(params, variables, genes):
+    """Design columns for a population, with ``genes`` of shape ``(len(variables), n)``"""
+    n = genes.shape[1]
+    columns = {name: np.full(n, value, dtype=float) for name, value in params.items()}
+    for (name, spec), gene in zip(variables, genes):
+        if isinstance(spec, tuple):
+            columns[name] = gene
+            continue
+        choice = np.minimum(gene.astype(int), len(spec) - 1)
+        if isinstance(spec[0], dict):
+            for key in spec[0]:
+                columns[key] = np.array([option[key] for option in spec], dtype=float)[choice]
+        else:
+            columns[name] = np.asarray(spec, dtype=float)[choice]
+    return columns
+
+
+def _set_by(variables):
+    """Parameters set by the variables"""
+    names = set()
+    for name, spec in variables:
+        names.update(spec[0] if isinstance(spec, list) and isinstance(spec[0], dict) else (name,))
+    return names
+
+
+def _evaluate(columns, q, H, t_2, t_max, cost):
+    """Cost, constraint violation and results of every candidate"""
+    c = SimpleNamespace(**columns)
+    r = solver._design_chain(c, q, H, xp=np)
+    if t_2 is not None:
+        r = r._replace(t_1=r.f_u + t_2, t_2=np.broadcast_to(float(t_2), np.shape(r.f_u)))
+
+    # Capacity of the troughed belt at its speed against the throughput
+    belt_ca = vec.belt_cs_area(l3=c.l3, b=c.b, ia=c.ia, sa=c.sa)
+    q_cap = 3600 * c.p * vec.volumetric_flow(belt_ca=belt_ca, v=c.v)
+    violation = np.maximum(q - q_cap, 0) / q
+
+    # Belt sag between idlers on both sides
+    f_bs_min_o, f_bs_min_u = vec.resistance_belt_sag_tension(q_m=r.q_m, q_b=c.q_b, a_o=c.a_o, a_u=c.a_u,
+                                                             h_a_o=c.h_a_o, h_a_u=c.h_a_u)
+    violation = violation + np.maximum(f_bs_min_o - r.t_2, 0) / f_bs_min_o
+    violation = violation + np.maximum(f_bs_min_u - r.t_2, 0) / f_bs_min_u
+
+    # Friction at the drive pulley: the belt slips where T1 / T2 exceeds the Euler-Eytelwein limit
+    _, _, (ratio, limit, _) = vec.tension_transmit_min(f_u=r.f_u, wrap_a=c.wrap_a, mu_b=c.mu_b, t_2_min=r.t_2)
+    violation = violation + np.maximum(ratio - limit, 0) / limit
+
+    if t_max is not None:
+        violation = violation + np.maximum(r.t_1 - t_max, 0) / t_max
+
+    values = np.broadcast_to(r.p_a if cost is None else cost(c, r), violation.shape).astype(float)
+    violation = np.where(np.isfinite(values) & np.isfinite(violation), violation, np.inf)
+    return values, violation, r
+
+
+def _better(cost_a, violation_a, cost_b, violation_b):
+    """Whether each candidate a beats b: feasible first, then by cost or by violation"""
+    feasible_a, feasible_b = violation_a == 0, violation_b == 0
+    return np.where(feasible_a & feasible_b, cost_a <= cost_b,
+                    np.where(feasible_a | feasible_b, feasible_a, violation_a <= violation_b))
+
+
+def optimise(base, q, variables, H=0, t_2=None, t_max=None, cost=None, population=None, generations=200,
+             tol=1e-6, patience=20, seed=None):
+    """
+    Search design variables for the design of least motor power or cost meeting the constraints
+
+    Differential evolution over the variables: every generation, each candidate of the
+    population is crossed with a combination of three others and replaced if the trial
+    design is better. The whole generation is solved at once with the design chain of
+    :func:`~conveyance.solver.solve_batch`.
+
+    Candidates are compared by feasibility first, then by cost, with infeasible candidates
+    ranked by the sum of their relative constraint violations:
+
+    * Capacity: the troughed belt, :func:`~conveyance.vec.belt_cs_area` at the belt speed
+      through :func:`~conveyance.vec.volumetric_flow`, carries at least ``q``
+    * Sag: the slack side tension is at least both limits of
+      :func:`~conveyance.vec.resistance_belt_sag_tension`
+    * Drive friction: :math:`T_1 / T_2 \\leq e^{\\mu_b \\alpha}`, with both ratios from
+      :func:`~conveyance.vec.tension_transmit_min`
+    * Belt strength: :math:`T_1 \\leq` ``t_max``, if given
+
+    Without a fixed take-up tension ``t_2`` the slack side tension is the least meeting the
+    drive friction and carry side sag limits, so these only constrain through the return
+    side sag and the belt strength.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    base : Conveyance
+        Design providing every parameter not set by the variables
+    q : float
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    variables : dict
+        Parameter name to a ``(low, high)`` tuple for a continuous range, or a list of the
+        allowed values. A list of dicts selects between sets of parameters, e.g. pulleys
+        ``{'drive': [{'D_d': 0.63, 'd_0_d': 0.16, 'm_p_d': 600}, ...]}``. Parameters must be
+        in :data:`~conveyance.fleet.FIELDS`. When ``B`` is a variable and ``b`` is not,
+        ``b`` follows :func:`~conveyance.sizing.usable_width`.
+    H : float, optional
+        :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+    t_2 : float, optional
+        Fixed slack side tension set by the take-up (:math:`N`)
+    t_max : float, optional
+        Largest allowed tight side tension (:math:`N`)
+    cost : callable, optional
+        ``cost(c, result)`` giving the cost of every candidate from the design columns
+        ``c`` and their :class:`~conveyance.solver.DesignResult` (default: :math:`P_A`)
+    population : int, optional
+        Number of candidates per generation (default: 10 per variable, at least 32)
+    generations : int, optional
+        Largest number of generations (default: 200)
+    tol : float, optional
+        Relative improvement of the best cost below which a generation counts as stalled
+        (default: 1e-6)
+    patience : int, optional
+        Number of stalled generations after which the search stops (default: 20)
+    seed : int or numpy.random.SeedSequence, optional
+        Seed of the random generator
+
+    Returns
+    -------
+    Optimum
+        The best design found
+
+    """
+    variables = list(variables.items())
+    for name in sorted(_set_by(variables)):
+        if name not in FIELDS:
+            raise ValueError('Unknown parameter {!r}'.format(name))
+    params = {name: getattr(base, name) for name in FIELDS}
+    derive_b = 'B' in _set_by(variables) and 'b' not in _set_by(variables)
+    lo = np.array([spec[0] if isinstance(spec, tuple) else 0 for _, spec in variables], dtype=float)
+    hi = np.array([spec[1] if isinstance(spec, tuple) else len(spec) - 1e-9 for _, spec in variables], dtype=float)
+    k = len(variables)
+    n = population or max(32, 10 * k)
+    rng = np.random.default_rng(seed)
+
+    def evaluate(genes):
+        columns = _apply(params, variables, genes)
+        if derive_b:
+            columns['b'] = sizing.usable_width(columns['B'])
+        return _evaluate(columns, q, H, t_2, t_max, cost)[:2]
+
+    genes = lo[:, None] + rng.random((k, n)) * (hi - lo)[:, None]
+    costs, violations = evaluate(genes)
+    history = []
+    stalled = 0
+    best_cost = np.inf
+    generation = 0
+    for generation in range(1, generations + 1):
+        # rand/1/bin: three distinct other candidates for each, and at least one crossed gene
+        others = np.argsort(rng.random((n, n)) + np.eye(n), axis=1)[:, :3]
+        a, b, c = genes[:, others[:, 0]], genes[:, others[:, 1]], genes[:, others[:, 2]]
+        mutant = a + rng.uniform(0.5, 1.0) * (b - c)
+        cross = rng.random((k, n)) < 0.9
+        cross[rng.integers(k, size=n), np.arange(n)] = True
+        trial = np.clip(np.where(cross, mutant, genes), lo[:, None], hi[:, None])
+
+        trial_costs, trial_violations = evaluate(trial)
+        keep = _better(trial_costs, trial_violations, costs, violations)
+        genes = np.where(keep, trial, genes)
+        costs = np.where(keep, trial_costs, costs)
+        violations = np.where(keep, trial_violations, violations)
+
+        feasible = violations == 0
+        current = costs[feasible].min() if feasible.any() else np.nan
+        history.append(current)
+        if np.isfinite(current) and (not np.isfinite(best_cost) or current < best_cost - tol * abs(best_cost)):
+            best_cost, stalled = current, 0
+        else:
+            stalled += 1
+            if stalled >= patience and np.isfinite(best_cost):
+                break
+
+    feasible = violations == 0
+    best = int(np.argmin(np.where(feasible, costs, np.inf))) if feasible.any() else int(np.argmin(violations))
+    columns = _apply(params, variables, genes[:, best:best + 1])
+    if derive_b:
+        columns['b'] = sizing.usable_width(columns['B'])
+    _, _, result = _evaluate(columns, q, H, t_2, t_max, cost)
+    chosen = {name: float(columns[name][0]) for name in sorted(_set_by(variables) | ({'b'} if derive_b else set()))}
+    design = Conveyance.from_parameters(dict(params, **chosen))
+    return Optimum(params=chosen, design=design, result=solver.DesignResult(*[float(x[0]) for x in result]),
+                   cost=float(costs[best]), feasible=bool(feasible[best]), violation=float(violations[best]),
+                   generations=generation, evaluations=n * (generation + 1), history=np.array(history))
+
+
+def _optimise_task(params, q, kwargs, seed):
+    return optimise(SimpleNamespace(**params), q, seed=seed, **kwargs)
+
+
+def optimise_many(designs, q, variables, H=0, workers=None, seed=None, **kwargs):
+    """
+    Optimise many conveyors at once, e.g. every conveyor of a site
+
+    Each conveyor is optimised with :func:`optimise`, its generations vectorised, while
+    the conveyors are spread across a process pool.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : sequence of Conveyance
+        Base design of each conveyor
+    q : float or sequence of float
+        :math:`q` : Throughput of each conveyor (:math:`t/h`)
+    variables : dict
+        Design variables shared by every conveyor, see :func:`optimise`
+    H : float or sequence of float, optional
+        :math:`H` : The lift of each conveyor (:math:`m`) (default: 0)
+    workers : int, optional
+        Number of worker processes, ``os.cpu_count()`` if not set. With 1 worker the
+        conveyors are optimised in this process.
+    seed : int, optional
+        Seed from which an independent random stream of each conveyor is spawned
+    **kwargs
+        Further arguments of :func:`optimise`; ``cost`` must be picklable
+
+    Returns
+    -------
+    list of Optimum
+        The best design of each conveyor, in the order of ``designs``
+
+    """
+    n = len(designs)
+    q = np.broadcast_to(np.asarray(q, dtype=float), (n,)).tolist()
+    H = np.broadcast_to(np.asarray(H, dtype=float), (n,)).tolist()
+    seeds = np.random.SeedSequence(seed).spawn(n)
+    tasks = [({name: getattr(c, name) for name in FIELDS}, q_i, dict(kwargs, variables=variables, H=h), s)
+             for c, q_i, h, s in zip(designs, q, H, seeds)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n < 2:
+        return [_optimise_task(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, n)) as executor:
+        return list(executor.map(_optimise_task, *zip(*tasks)))
@@ -0,0 +1,179 @@
+from collections import namedtuple
+
+import numpy as np
+
+from conveyance import vec
+
+RouteResult = namedtuple('RouteResult', [
+    'f_h', 'f_st', 'f_carry', 'f_return', 'f_n', 'f_s', 'f_u', 'p_a', 't_1', 't_2',
+    't_carry', 't_return', 'f_bs_min_o', 'f_bs_min_u', 'sag_ok_o', 'sag_ok_u',
+])
+RouteResult.__doc__ = """Resistances and belt tension profile along a route
+
+Per-segment arrays are ordered from the tail to the head. Tension profiles hold the
+tension at each of the ``n + 1`` segment ends, also ordered from the tail to the head.
+
+Attributes
+----------
+f_h : ndarray
+    :math:`F_H` : Main resistance of each segment (:math:`N`)
+f_st : ndarray
+    :math:`F_{st}` : Resistance due to gravity of the conveyed material in each segment (:math:`N`)
+f_carry : ndarray
+    Resistance of the carry strand in each segment, including the lift of belt and material (:math:`N`)
+f_return : ndarray
+    Resistance of the return strand in each segment, including the lift of the belt (:math:`N`)
+f_n : float
+    :math:`F_N` : Secondary resistances, applied at the tail (:math:`N`)
+f_s : float
+    :math:`F_S` : Concentrated resistances, applied at the tail (:math:`N`)
+f_u : float
+    :math:`F_U` : Peripheral driving force on the head drive pulley (:math:`N`)
+p_a : float
+    :math:`P_A` : Power requirements for the drive motor (:math:`W`)
+t_1 : float
+    :math:`T_1` : Tight-side tension at the drive pulley (:math:`N`)
+t_2 : float
+    :math:`T_2` : Slack-side tension at the drive pulley (:math:`N`)
+t_carry : ndarray
+    Belt tension along the carry strand (:math:`N`)
+t_return : ndarray
+    Belt tension along the return strand (:math:`N`)
+f_bs_min_o : ndarray
+    :math:`F_{min\\ o}` : Minimum tension limiting sag on the carry side of each segment (:math:`N`)
+f_bs_min_u : ndarray
+    :math:`F_{min\\ u}` : Minimum tension limiting sag on the return side of each segment (:math:`N`)
+sag_ok_o : ndarray
+    Whether the carry strand tension satisfies the sag limit throughout each segment
+sag_ok_u : ndarray
+    Whether the return strand tension satisfies the sag limit throughout each segment
+"""
+
+
+class Route:
+    """Conveyor route made of straight segments, ordered from the tail to the head.
+
+    The belt, pulleys, idler masses, material and coefficients come from a design, while
+    the length, inclination, idler spacing and loading can differ for every segment. The
+    drive is at the head and material is loaded at the tail.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    c : Conveyance
+        Conveyor design
+    length : array_like
+        Length of each segment along the belt (:math:`m`)
+    install_a : array_like, optional
+        Inclination of each segment, positive when rising towards the head (:math:`deg`) (default: 0)
+    a_o : array_like, optional
+        Carry idler spacing of each segment (:math:`m`) (default: the design spacing)
+    a_u : array_like, optional
+        Return idler spacing of each segment (:math:`m`) (default: the design spacing)
+    loading : array_like, optional
+        Fraction of the material load carried in each segment (default: 1)
+
+    """
+
+    def __init__(self, c, length, install_a=0, a_o=None, a_u=None, loading=1):
+        self.c = c
+        self.length, self.install_a, self.a_o, self.a_u, self.loading = [
+            np.array(x, dtype=float) for x in np.broadcast_arrays(
+                length, install_a, c.a_o if a_o is None else a_o, c.a_u if a_u is None else a_u, loading)]
+
+    @classmethod
+    def from_profile(cls, c, x, z, **kwargs):
+        """Create a route through surveyed points.
+
+        Parameters
+        ----------
+        c : Conveyance
+            Conveyor design
+        x : array_like
+            Horizontal distance of each point from the tail (:math:`m`)
+        z : array_like
+            Elevation of each point (:math:`m`)
+        **kwargs
+            Per-segment ``a_o``, ``a_u`` and ``loading``, see :class:`Route`
+
+        Returns
+        -------
+        Route
+            Route with a segment between each pair of consecutive points
+
+        """
+        dx = np.diff(np.asarray(x, dtype=float))
+        dz = np.diff(np.asarray(z, dtype=float))
+        return cls(c, length=np.hypot(dx, dz), install_a=np.degrees(np.arctan2(dz, dx)), **kwargs)
+
+    def __len__(self):
+        return self.length.size
+
+    @property
+    def lift(self):
+        """ndarray: Lift of each segment (:math:`m`)"""
+        return self.length * np.sin(np.radians(self.install_a))
+
+    def solve(self, q, t_2=None):
+        """Calculate the resistances of every segment and the tension profile of the belt.
+
+        Unless ``t_2`` is given, the slack-side tension is the smallest that transmits
+        :math:`F_U` at the drive pulley and keeps the belt within its sag limits in every
+        segment of both strands.
+
+        Parameters
+        ----------
+        q : float
+            Throughput of the conveyor (t/h)
+        t_2 : float, optional
+            Slack-side tension at the drive pulley, e.g. set by the take-up (N)
+
+        Returns
+        -------
+        RouteResult
+            Per-segment resistances, totals and tension profiles
+
+        """
+        c = self.c
+        g = 9.81
+        cos_d = np.cos(np.radians(self.install_a))
+        lift = self.lift
+
+        q_m = vec.mass_density_material(v=c.v, q=q) * self.loading
+        q_ro = vec.mass_density_idler(a=self.a_o, m=c.m_o)
+        q_ru = vec.mass_density_idler(a=self.a_u, m=c.m_u)
+
+        # Main resistance split between the strands, with the lift of belt and material
+        friction = c.ff * self.length * g
+        f_carry = friction * (q_ro + (c.q_b + q_m) * cos_d) + (c.q_b + q_m) * g * lift
+        f_return = friction * (q_ru + c.q_b * cos_d) - c.q_b * g * lift
+        f_h = vec.resistance_main(q_m=q_m, q_b=c.q_b, q_ro=q_ro, q_ru=q_ru, c_l=self.length,
+                                  install_a=self.install_a, ff=c.ff)
+        f_st = vec.resistance_gravity(q_m=q_m, H=lift)
+
+        # Secondary and concentrated resistances at the loading point
+        q_v = vec.volume_carried_material(q=q, p=c.p)
+        f_n = float(vec.resistance_secondary(q_v=q_v, p=c.p, v=c.v, v_0=c.v_0, B=c.B, b1=c.b1, mu1=c.mu1,
+                                             mu2=c.mu2, wrap_a_h=c.wrap_a, wrap_a_t=c.wrap_a))
+        f_s = float(vec.resistance_concentrated(q_v=q_v, p=c.p, v=c.v, l_s=c.l_s, b1=c.b1, bc_w=c.bc_w,
+                                                bc_t=c.bc_t, bc_p=c.bc_p, bc_n=c.bc_n, mu2=c.mu2, mu3=c.mu3))
+
+        # Tension above T2 at each segment end, from the head back round the tail to the head
+        ret = np.concatenate((np.cumsum(f_return[::-1])[::-1], [0]))
+        carry = ret[0] + f_n + f_s + np.concatenate(([0], np.cumsum(f_carry)))
+        f_u = float(carry[-1])
+
+        f_bs_min_o, f_bs_min_u = vec.resistance_belt_sag_tension(q_m=q_m, q_b=c.q_b, a_o=self.a_o, a_u=self.a_u,
+                                                                 h_a_o=c.h_a_o, h_a_u=c.h_a_u)
+        carry_min = np.minimum(carry[:-1], carry[1:])
+        ret_min = np.minimum(ret[:-1], ret[1:])
+        if t_2 is None:
+            e_mu = np.exp(c.mu_b * np.radians(c.wrap_a))
+            t_2 = max(f_u / (e_mu - 1), np.max(f_bs_min_o - carry_min), np.max(f_bs_min_u - ret_min))
+
+        p_a = float(vec.power_requirements_motor(f_u=f_u, v=c.v, d_eta_1=c.d_eta_1, d_eta_2=c.d_eta_2))
+        return RouteResult(f_h=f_h, f_st=f_st, f_carry=f_carry, f_return=f_return, f_n=f_n, f_s=f_s,
+                           f_u=f_u, p_a=p_a, t_1=t_2 + f_u, t_2=t_2, t_carry=t_2 + carry, t_return=t_2 + ret,
+                           f_bs_min_o=f_bs_min_o, f_bs_min_u=f_bs_min_u,
+                           sag_ok_o=t_2 >= f_bs_min_o - carry_min, sag_ok_u=t_2 >= f_bs_min_u - ret_min)
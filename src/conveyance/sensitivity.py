@@ -0,0 +1,366 @@
+import math
+from collections import namedtuple
+from types import SimpleNamespace
+
+import numpy as np
+
+from conveyance import solver
+from conveyance.fleet import FIELDS, ConveyorFleet
+
+#: Results differentiated by default
+OUTPUTS = ('f_u', 'p_a', 't_1', 't_2')
+
+Sensitivity = namedtuple('Sensitivity', ['outputs', 'wrt', 'inputs', 'values', 'jacobian'])
+Sensitivity.__doc__ = """Sensitivity of design results to the design parameters
+
+Attributes
+----------
+outputs : tuple of str
+    :class:`~conveyance.solver.DesignResult` fields differentiated
+wrt : tuple of str
+    Parameters differentiated with respect to
+inputs : ndarray
+    Value of each parameter of ``wrt``, of shape ``(n, len(wrt))``
+values : ndarray
+    Value of each output, of shape ``(n, len(outputs))``
+jacobian : ndarray
+    Derivative of each output with respect to each parameter, of shape
+    ``(n, len(outputs), len(wrt))``
+"""
+
+TornadoBar = namedtuple('TornadoBar', ['parameter', 'low', 'high', 'swing'])
+TornadoBar.__doc__ = """One bar of a tornado chart
+
+Attributes
+----------
+parameter : str
+    Parameter varied
+low : float
+    Output with the parameter decreased
+high : float
+    Output with the parameter increased
+swing : float
+    Width of the bar, ``abs(high - low)``
+"""
+
+
+def _scaled(grad, factor):
+    return {j: d * factor for j, d in grad.items()}
+
+
+def _combined(a, b):
+    """Sum of two sparse gradients"""
+    if len(a) < len(b):
+        a, b = b, a
+    grad = dict(a)
+    for j, d in b.items():
+        grad[j] = grad[j] + d if j in grad else d
+    return grad
+
+
+class Dual:
+    """Values carrying their derivatives with respect to several inputs, for forward-mode differentiation.
+
+    Arithmetic with other duals and with constants propagates the derivatives, so the design
+    chain evaluated on duals yields its results and their gradients in one pass. Gradients
+    are sparse: each value holds derivatives only for the inputs it depends on, so the
+    early terms of the chain cost little more than their values.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    value : ndarray
+        Values
+    grad : dict
+        Index of each input the values depend on to their derivatives with respect to it,
+        arrays or scalars broadcasting against ``value``
+
+    """
+    __slots__ = ('value', 'grad')
+
+    # Makes NumPy arrays defer to the reflected operators of Dual
+    __array_ufunc__ = None
+
+    def __init__(self, value, grad):
+        self.value = value
+        self.grad = grad
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, _combined(self.grad, other.grad))
+        return Dual(self.value + other, self.grad)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, _combined(self.grad, _scaled(other.grad, -1)))
+        return Dual(self.value - other, self.grad)
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, _scaled(self.grad, -1))
+
+    def __neg__(self):
+        return Dual(-self.value, _scaled(self.grad, -1))
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value * other.value,
+                        _combined(_scaled(self.grad, other.value), _scaled(other.grad, self.value)))
+        return Dual(self.value * other, _scaled(self.grad, other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            inverse = 1 / other.value
+            value = self.value / other.value
+            return Dual(value, _combined(_scaled(self.grad, inverse), _scaled(other.grad, -value * inverse)))
+        return Dual(self.value / other, _scaled(self.grad, 1 / other))
+
+    def __rtruediv__(self, other):
+        value = other / self.value
+        return Dual(value, _scaled(self.grad, -value / self.value))
+
+    def __pow__(self, exponent):
+        return Dual(self.value ** exponent, _scaled(self.grad, exponent * self.value ** (exponent - 1)))
+
+
+class _DualMath:
+    """The NumPy functions used by the design chain, propagating the derivatives of :class:`Dual`"""
+
+    @staticmethod
+    def cos(x):
+        if not isinstance(x, Dual):
+            return np.cos(x)
+        return Dual(np.cos(x.value), _scaled(x.grad, -np.sin(x.value)))
+
+    @staticmethod
+    def sin(x):
+        if not isinstance(x, Dual):
+            return np.sin(x)
+        return Dual(np.sin(x.value), _scaled(x.grad, np.cos(x.value)))
+
+    @staticmethod
+    def exp(x):
+        if not isinstance(x, Dual):
+            return np.exp(x)
+        value = np.exp(x.value)
+        return Dual(value, _scaled(x.grad, value))
+
+    @staticmethod
+    def radians(x):
+        return x * (math.pi / 180)
+
+    @staticmethod
+    def maximum(a, b):
+        if not isinstance(a, Dual):
+            a, b = b, a
+        if not isinstance(a, Dual):
+            return np.maximum(a, b)
+        if not isinstance(b, Dual):
+            keep = a.value >= b
+            return Dual(np.where(keep, a.value, b), _scaled(a.grad, keep))
+        keep = a.value >= b.value
+        return Dual(np.where(keep, a.value, b.value), _combined(_scaled(a.grad, keep), _scaled(b.grad, ~keep)))
+
+
+def jacobian(designs, q, H=0, wrt=None, outputs=OUTPUTS, chunk_size=65536):
+    """
+    Calculate the sensitivity of design results to the design parameters
+
+    The design chain of :func:`~conveyance.solver.solve_batch` is evaluated once on
+    :class:`Dual` numbers seeded with each parameter of ``wrt``, giving the exact
+    derivatives of every output with respect to every parameter in a single pass, rather
+    than the two extra evaluations per parameter of central differences. Where the slack
+    side tension switches between the drive and sag limits, the derivative of the limit
+    in force is taken.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : ConveyorFleet, Conveyance or sequence of Conveyance
+        Conveyor designs
+    q : array_like
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    H : array_like, optional
+        :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+    wrt : sequence of str, optional
+        Parameters to differentiate with respect to, from :data:`~conveyance.fleet.FIELDS`,
+        ``'q'`` and ``'H'`` (default: all of them)
+    outputs : sequence of str, optional
+        :class:`~conveyance.solver.DesignResult` fields to differentiate (default: :data:`OUTPUTS`)
+    chunk_size : int, optional
+        Number of designs evaluated at a time, bounding the memory used by the derivatives
+        (default: 65536)
+
+    Returns
+    -------
+    Sensitivity
+        Values and derivatives of the outputs of every design
+
+    """
+    if not isinstance(designs, ConveyorFleet):
+        designs = ConveyorFleet.from_conveyances(designs if isinstance(designs, (list, tuple)) else [designs])
+    wrt = tuple(FIELDS + ('q', 'H') if wrt is None else wrt)
+    outputs = tuple(outputs)
+    n, k = len(designs), len(wrt)
+    columns = dict(designs.columns)
+    columns['q'], columns['H'] = np.broadcast_to(q, (n,)), np.broadcast_to(H, (n,))
+    for name in wrt:
+        if name not in columns:
+            raise ValueError('Unknown parameter {!r}'.format(name))
+
+    # Filled design-major along the last axis, and returned as views with the design first
+    inputs = np.empty((k, n))
+    for j, name in enumerate(wrt):
+        inputs[j] = columns[name]
+    values = np.empty((len(outputs), n))
+    derivatives = np.zeros((len(outputs), k, n))
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        chunk = {name: np.asarray(column[start:stop], dtype=float) for name, column in columns.items()}
+        for j, name in enumerate(wrt):
+            chunk[name] = Dual(chunk[name], {j: 1.0})
+        c = SimpleNamespace(**chunk)
+        result = solver._design_chain(c, c.q, c.H, xp=_DualMath)
+        for i, name in enumerate(outputs):
+            y = getattr(result, name)
+            if isinstance(y, Dual):
+                for j, d in y.grad.items():
+                    derivatives[i, j, start:stop] = d
+                y = y.value
+            values[i, start:stop] = y
+    return Sensitivity(outputs=outputs, wrt=wrt, inputs=inputs.T, values=values.T,
+                       jacobian=derivatives.transpose(2, 0, 1))
+
+
+def elasticities(s):
+    """
+    Relative sensitivity of each output to each parameter
+
+    The elasticity :math:`(x / y)\\ \\partial y / \\partial x` is the fractional change in an
+    output per fractional change in a parameter, so parameters of different units compare
+    directly. Outputs of zero give NaN.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    s : Sensitivity
+        Result of :func:`jacobian`
+
+    Returns
+    -------
+    ndarray
+        Elasticities of shape ``(n, len(outputs), len(wrt))``
+
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return s.jacobian * s.inputs[:, None, :] / s.values[:, :, None]
+
+
+def ranking(s, output='p_a', relative=True):
+    """
+    Rank parameters by their influence on an output across a batch of designs
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    s : Sensitivity
+        Result of :func:`jacobian`
+    output : str, optional
+        Output ranked (default: ``'p_a'``)
+    relative : bool, optional
+        Rank by the mean absolute elasticity rather than the mean absolute derivative
+        (default: True)
+
+    Returns
+    -------
+    list of tuple
+        ``(parameter, score)`` for every parameter, most influential first
+
+    """
+    i = s.outputs.index(output)
+    scores = elasticities(s)[:, i] if relative else s.jacobian[:, i]
+    with np.errstate(invalid='ignore'):
+        scores = np.nanmean(np.abs(scores), axis=0) if len(scores) else np.zeros(len(s.wrt))
+    order = sorted(range(len(s.wrt)), key=lambda j: -np.nan_to_num(scores[j]))
+    return [(s.wrt[j], float(scores[j])) for j in order]
+
+
+def tornado(c, q, H=0, output='p_a', wrt=None, delta=0.1):
+    """
+    Tornado chart of an output of one design
+
+    Each parameter is varied by ``delta`` of its value either side of the design, and the
+    change in the output estimated from its derivative. Parameters whose value is zero do
+    not vary.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    c : Conveyance
+        Conveyor design
+    q : float
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    H : float, optional
+        :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+    output : str, optional
+        :class:`~conveyance.solver.DesignResult` field charted (default: ``'p_a'``)
+    wrt : sequence of str, optional
+        Parameters varied, as for :func:`jacobian` (default: all of them)
+    delta : float, optional
+        Fractional variation of each parameter (default: 0.1)
+
+    Returns
+    -------
+    list of TornadoBar
+        One bar per parameter, widest first
+
+    """
+    s = jacobian(c, q=q, H=H, wrt=wrt, outputs=(output,))
+    y = float(s.values[0, 0])
+    change = s.jacobian[0, 0] * s.inputs[0] * delta
+    bars = [TornadoBar(parameter=name, low=y - dy, high=y + dy, swing=abs(2 * dy))
+            for name, dy in zip(s.wrt, change.tolist())]
+    return sorted(bars, key=lambda bar: -bar.swing)
+
+
+def format_tornado(bars, width=40, limit=None):
+    """
+    Draw a tornado chart as text
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    bars : sequence of TornadoBar
+        Result of :func:`tornado`
+    width : int, optional
+        Characters either side of the base value (default: 40)
+    limit : int, optional
+        Number of bars drawn (default: all)
+
+    Returns
+    -------
+    str
+        One line per bar: the parameter, the low and high outputs and the bar
+
+    """
+    bars = list(bars)[:limit]
+    if not bars:
+        return ''
+    base = (bars[0].low + bars[0].high) / 2
+    scale = width / (max(bar.swing for bar in bars) / 2 or 1)
+    lines = []
+    for bar in bars:
+        left = int(round((base - min(bar.low, bar.high)) * scale))
+        right = int(round((max(bar.low, bar.high) - base) * scale))
+        lines.append('{:<10} {:>12.6g} {:>12.6g} {}|{}'.format(
+            bar.parameter, bar.low, bar.high, ' ' * (width - left) + '#' * left, '#' * right))
+    return '\n'.join(lines)
@@ -0,0 +1,341 @@
+"""Local calculation service answering HTTP/JSON requests from designs held in memory::
+
+    python -m conveyance.service designs/ --port 8765
+
+``POST /solve`` takes ``{"design": "cv01", "q": 2300, "H": 5}``, or a list of such
+requests, and answers with the :class:`~conveyance.solver.DesignResult` fields of each.
+``GET /designs`` lists the loaded designs and ``GET /metrics`` the latency and batch size
+statistics of the service.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from http import HTTPStatus
+
+import numpy as np
+
+from conveyance import solver
+from conveyance.conveyance import Conveyance
+from conveyance.fleet import ConveyorFleet
+
+
+class ServiceMetrics:
+    """Request latencies and batch sizes of a :class:`CalculationService`.
+
+    Percentiles are taken over the most recent ``window`` requests and batches.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of recent requests and batches kept (default: 10000)
+
+    """
+
+    def __init__(self, window=10000):
+        self.requests = 0
+        self.batches = 0
+        self.items = 0
+        self._latencies = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+
+    def record_request(self, seconds):
+        """Add the latency of one answered request (s)"""
+        self.requests += 1
+        self._latencies.append(seconds)
+
+    def record_batch(self, size):
+        """Add one evaluated batch of ``size`` operating points"""
+        self.batches += 1
+        self.items += size
+        self._batch_sizes.append(size)
+
+    @staticmethod
+    def _summary(values, scale=1):
+        if not values:
+            return {'p50': None, 'p99': None, 'mean': None, 'max': None}
+        values = np.asarray(values, dtype=float) * scale
+        p50, p99 = np.percentile(values, [50, 99]).tolist()
+        return {'p50': p50, 'p99': p99, 'mean': float(values.mean()), 'max': float(values.max())}
+
+    def snapshot(self):
+        """Counts and the latency (ms) and batch size distributions.
+
+        Returns
+        -------
+        dict
+            ``requests``, ``batches`` and ``items`` counts, and the ``p50``, ``p99``,
+            ``mean`` and ``max`` of ``latency_ms`` and ``batch_size``
+
+        """
+        return {'requests': self.requests, 'batches': self.batches, 'items': self.items,
+                'latency_ms': self._summary(self._latencies, scale=1000),
+                'batch_size': self._summary(self._batch_sizes)}
+
+
+class CalculationService:
+    """Designs held in memory, solved in micro-batches for concurrent requests.
+
+    Requests arriving within ``window`` seconds of the first pending one are gathered
+    and answered together with a single :func:`~conveyance.solver.solve_batch` over the
+    requested designs. A batch is evaluated early once it holds ``max_batch`` requests.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : dict
+        Design identifier to its :class:`~conveyance.conveyance.Conveyance`
+    H : float or dict, optional
+        The conveyor lift (m) used when a request gives none, shared by every design or by
+        identifier (default: 0)
+    window : float, optional
+        Time requests are gathered for before a batch is evaluated (s) (default: 0.001)
+    max_batch : int, optional
+        Largest number of requests evaluated together (default: 4096)
+
+    Attributes
+    ----------
+    metrics : ServiceMetrics
+        Latency and batch size statistics
+    port : int
+        Port the service listens on, once started
+
+    """
+
+    def __init__(self, designs, H=0, window=0.001, max_batch=4096):
+        self.ids = tuple(designs)
+        self._index = {design_id: i for i, design_id in enumerate(self.ids)}
+        self.fleet = ConveyorFleet.from_conveyances([designs[design_id] for design_id in self.ids])
+        if isinstance(H, dict):
+            H = [H.get(design_id, 0) for design_id in self.ids]
+        self._H = np.broadcast_to(np.asarray(H, dtype=float), (len(self.ids),)).copy()
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = ServiceMetrics()
+        self.port = None
+        self._pending = []
+        self._timer = None
+        self._server = None
+        self._connections = set()
+
+    @classmethod
+    def from_yaml(cls, paths, H=0, workers=None, cache_dir=None, **kwargs):
+        """Load the designs of a service from YAML files, identified by their file names.
+
+        Parameters
+        ----------
+        paths : sequence of str
+            Paths to YAML design files; ``designs/cv01.yaml`` is served as ``cv01``
+        H : float or dict, optional
+            The conveyor lift (m), shared by every design or by identifier (default: 0)
+        workers : int, optional
+            Number of parsing processes, ``os.cpu_count()`` if not set
+        cache_dir : str, optional
+            Directory holding the parsed parameter cache, see
+            :meth:`~conveyance.conveyance.Conveyance.load_many`
+        **kwargs
+            ``window`` and ``max_batch``, passed on to the service
+
+        Returns
+        -------
+        CalculationService
+            The service, not yet started
+
+        """
+        ids = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+        designs = Conveyance.load_many(paths, workers=workers, cache_dir=cache_dir)
+        return cls(dict(zip(ids, designs)), H=H, **kwargs)
+
+    async def solve(self, design_id, q, H=None):
+        """Solve one design at an operating point, batched with concurrent requests.
+
+        Parameters
+        ----------
+        design_id : str
+            Design identifier
+        q : float
+            Throughput of the conveyor (t/h)
+        H : float, optional
+            The conveyor lift (m) (default: the lift of the design)
+
+        Returns
+        -------
+        dict
+            Every :class:`~conveyance.solver.DesignResult` field of the design
+
+        """
+        i = self._index[design_id]
+        future = asyncio.get_event_loop().create_future()
+        self._pending.append((i, float(q), self._H[i] if H is None else float(H), future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_event_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        """Evaluate every pending request in one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        index, q, H, futures = zip(*pending)
+        try:
+            result = solver.solve_batch(self.fleet[np.array(index)], q=np.array(q), H=np.array(H))
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.metrics.record_batch(len(pending))
+        columns = [values.tolist() for values in result]
+        for future, row in zip(futures, zip(*columns)):
+            if not future.done():
+                future.set_result(dict(zip(result._fields, row)))
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Start listening for requests.
+
+        Parameters
+        ----------
+        host : str, optional
+            Interface to listen on (default: ``'127.0.0.1'``)
+        port : int, optional
+            Port to listen on, or 0 for any free port (default: 0)
+
+        Returns
+        -------
+        int
+            The port listened on
+
+        """
+        self._server = await asyncio.start_server(self._accept, host=host, port=port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self):
+        """Stop listening, answer the requests still pending and close every connection"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._flush()
+        await asyncio.sleep(0)
+        for task in self._connections:
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    def _accept(self, reader, writer):
+        """Serve a new connection in a task of its own, closed with the service"""
+        task = asyncio.ensure_future(self._handle(reader, writer))
+        self._connections.add(task)
+        task.add_done_callback(self._connections.discard)
+
+    async def _handle(self, reader, writer):
+        """Answer the HTTP/1.1 requests of one connection"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                method, target, version = line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self._respond(method, target.split('?')[0], body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                content = json.dumps(payload).encode()
+                head = 'HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\nConnection: {}\r\n\r\n'
+                writer.write(head.format(status.value, status.phrase, len(content),
+                                         'keep-alive' if keep_alive else 'close').encode())
+                writer.write(content)
+                await writer.drain()
+                self.metrics.record_request(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, path, body):
+        """HTTP status and JSON payload answering a request"""
+        if path == '/solve':
+            if method != 'POST':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use POST'}
+            try:
+                requests = json.loads(body.decode())
+                many = isinstance(requests, list)
+                points = [(r['design'], float(r['q']), None if r.get('H') is None else float(r['H']))
+                          for r in (requests if many else [requests])]
+                unknown = [design_id for design_id, _, _ in points if design_id not in self._index]
+            except (ValueError, TypeError, KeyError, AttributeError):
+                return HTTPStatus.BAD_REQUEST, {'error': 'Expected {"design": ..., "q": ..., "H": ...} or a list of them'}
+            if unknown:
+                return HTTPStatus.NOT_FOUND, {'error': 'Unknown designs {}'.format(sorted(set(map(str, unknown))))}
+            try:
+                results = await asyncio.gather(*[self.solve(*point) for point in points])
+            except Exception as e:
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+            return HTTPStatus.OK, results if many else results[0]
+        if method != 'GET':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use GET'}
+        if path == '/designs':
+            return HTTPStatus.OK, list(self.ids)
+        if path == '/metrics':
+            return HTTPStatus.OK, self.metrics.snapshot()
+        return HTTPStatus.NOT_FOUND, {'error': 'No resource {}'.format(path)}
+
+
+def main(argv=None):
+    """Serve designs until interrupted.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    argv : sequence of str, optional
+        Arguments, ``sys.argv[1:]`` if not set
+
+    """
+    from conveyance.cli import expand_paths
+
+    parser = argparse.ArgumentParser(prog='python -m conveyance.service', description='Serve conveyor designs over HTTP')
+    parser.add_argument('designs', nargs='+', help='Design YAML files, directories of them or glob patterns')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('-H', '--lift', type=float, default=0.0, help='Lift of every conveyor (m) (default: 0)')
+    parser.add_argument('--window', type=float, default=0.001, help='Batching window (s) (default: 0.001)')
+    parser.add_argument('--max-batch', type=int, default=4096, help='Largest batch (default: 4096)')
+    args = parser.parse_args(argv)
+
+    service = CalculationService.from_yaml(expand_paths(args.designs), H=args.lift, window=args.window,
+                                           max_batch=args.max_batch)
+    loop = asyncio.new_event_loop()
+    try:
+        port = loop.run_until_complete(service.start(host=args.host, port=args.port))
+        print('Serving {} designs on http://{}:{}'.format(len(service.ids), args.host, port))
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(service.close())
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+import numpy as np
+
+from conveyance import vec
+
+#: Standard belt widths from ISO 251 (:math:`m`)
+STANDARD_WIDTHS = np.array([0.3, 0.4, 0.5, 0.65, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8,
+                            2.0, 2.2, 2.4, 2.6, 2.8, 3.0, 3.2])
+
+
+def required_cs_area(q, v, p):
+    """
+    Calculate the cross-sectional area of material needed for a throughput (:math:`m^2`)
+
+        .. math::
+            S = \\dfrac{q}{3600\\ \\rho\\ v}
+
+    Parameters
+    ----------
+    q : array_like
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+
+    Returns
+    -------
+    ndarray
+        :math:`S` : The cross-sectional area of material on the belt (:math:`m^2`)
+
+    """
+    return vec.volume_carried_material(q=q, p=p) / np.asarray(v, dtype=float)
+
+
+def material_width(s, l3, ia, sa):
+    """
+    Calculate the width of material on the belt giving a cross-sectional area (:math:`m`)
+
+    Inverse of :func:`~conveyance.belt_capacity.belt_cs_area`. With :math:`x = b - l_3`
+    the area is quadratic in :math:`x`, so the width is found directly from the positive root
+
+        .. math::
+            S    & = \\left (\\frac{\\cos^2 \\lambda \\tan \\theta}{6} + \\frac{\\cos \\lambda \\sin \\lambda}{4} \\right) x^2
+                   + \\left (\\frac{l_3 \\cos \\lambda \\tan \\theta}{3} + \\frac{l_3 \\sin \\lambda}{2} \\right) x
+                   + \\frac{l_3^2 \\tan \\theta}{6} \\\\
+            b    & = l_3 + x
+
+    Areas that fit on the centre roll alone give :math:`b = l_3`.
+
+    Parameters
+    ----------
+    s : array_like
+        :math:`S` : The cross-sectional area of material on the belt (:math:`m^2`)
+    l3 : array_like
+        :math:`l_3` : Width of the idler (:math:`m`)
+    ia : array_like
+        :math:`\\lambda` : Installed angle of the side idlers (:math:`deg`)
+    sa : array_like
+        :math:`\\theta` : Surcharge angle of the material (:math:`deg`)
+
+    Returns
+    -------
+    ndarray
+        :math:`b` : Width of max material on belt (:math:`m`)
+
+    """
+    s = np.asarray(s, dtype=float)
+    l3 = np.asarray(l3, dtype=float)
+    cos_ia = np.cos(np.radians(ia))
+    sin_ia = np.sin(np.radians(ia))
+    tan_sa = np.tan(np.radians(sa))
+
+    a = cos_ia ** 2 * tan_sa / 6 + cos_ia * sin_ia / 4
+    b = l3 * cos_ia * tan_sa / 3 + l3 * sin_ia / 2
+    c = l3 ** 2 * tan_sa / 6 - s
+
+    # Positive root, written to avoid cancellation when 4ac is small
+    x = -2 * c / (b + np.sqrt(b ** 2 - 4 * a * c))
+    return l3 + np.maximum(x, 0)
+
+
+def belt_width(b):
+    """
+    Calculate the total belt width for a width of material (:math:`m`)
+
+    Inverse of the usable width relation for troughed belts
+
+        .. math::
+            b = \\begin{cases}
+                0.9\\ B - 0.05 & B \\leq 2 \\\\
+                B - 0.25 & B > 2
+                \\end{cases}
+
+    Parameters
+    ----------
+    b : array_like
+        :math:`b` : Width of max material on belt (:math:`m`)
+
+    Returns
+    -------
+    ndarray
+        :math:`B` : Total width of belt (:math:`m`)
+
+    """
+    b = np.asarray(b, dtype=float)
+    return np.where(b <= 1.75, (b + 0.05) / 0.9, b + 0.25)
+
+
+def usable_width(B):
+    """
+    Calculate the width of material on a belt, see :func:`belt_width` (:math:`m`)
+
+    Parameters
+    ----------
+    B : array_like
+        :math:`B` : Total width of belt (:math:`m`)
+
+    Returns
+    -------
+    ndarray
+        :math:`b` : Width of max material on belt (:math:`m`)
+
+    """
+    B = np.asarray(B, dtype=float)
+    return np.where(B <= 2, 0.9 * B - 0.05, B - 0.25)
+
+
+def snap_width(B, widths=STANDARD_WIDTHS):
+    """
+    Round belt widths up to the next standard width
+
+    Parameters
+    ----------
+    B : array_like
+        :math:`B` : Total width of belt (:math:`m`)
+    widths : array_like, optional
+        Available belt widths in increasing order (default: :data:`STANDARD_WIDTHS`)
+
+    Returns
+    -------
+    ndarray
+        :math:`B` : Smallest available width not below ``B``, NaN if wider than every width (:math:`m`)
+
+    """
+    widths = np.asarray(widths, dtype=float)
+    B = np.asarray(B, dtype=float)
+    # Tolerate round-off from the inverse calculation
+    i = np.searchsorted(widths, B - 1e-9)
+    return np.where(i < widths.size, widths[np.minimum(i, widths.size - 1)], np.nan)
+
+
+def min_belt_width(q, v, p, l3, ia, sa, widths=None):
+    """
+    Calculate the minimum belt width to convey a throughput at a belt speed
+
+    Every argument broadcasts, so many sizing queries can be answered in one call.
+
+    Parameters
+    ----------
+    q : array_like
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+    l3 : array_like
+        :math:`l_3` : Width of the idler (:math:`m`)
+    ia : array_like
+        :math:`\\lambda` : Installed angle of the side idlers (:math:`deg`)
+    sa : array_like
+        :math:`\\theta` : Surcharge angle of the material (:math:`deg`)
+    widths : array_like, optional
+        Available belt widths; when given, :math:`B` is rounded up to one of them
+        and :math:`b` is the material width on that belt
+
+    Returns
+    -------
+    ndarray
+        :math:`b` : Width of max material on belt (:math:`m`)
+    ndarray
+        :math:`B` : Total width of belt (:math:`m`)
+
+    """
+    b = material_width(required_cs_area(q=q, v=v, p=p), l3=l3, ia=ia, sa=sa)
+    B = belt_width(b)
+    if widths is not None:
+        B = snap_width(B, widths=widths)
+        b = usable_width(B)
+    return b, B
+
+
+def min_belt_speed(q, b, p, l3, ia, sa):
+    """
+    Calculate the minimum belt speed to convey a throughput with a width of material (:math:`m/s`)
+
+        .. math::
+            v = \\dfrac{q}{3600\\ \\rho\\ S}
+
+    Parameters
+    ----------
+    q : array_like
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    b : array_like
+        :math:`b` : Width of max material on belt (:math:`m`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+    l3 : array_like
+        :math:`l_3` : Width of the idler (:math:`m`)
+    ia : array_like
+        :math:`\\lambda` : Installed angle of the side idlers (:math:`deg`)
+    sa : array_like
+        :math:`\\theta` : Surcharge angle of the material (:math:`deg`)
+
+    Returns
+    -------
+    ndarray
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+
+    """
+    s = vec.belt_cs_area(l3=l3, b=b, ia=ia, sa=sa)
+    return vec.volume_carried_material(q=q, p=p) / s
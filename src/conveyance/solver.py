@@ -0,0 +1,335 @@
+import math
+from collections import namedtuple
+from types import SimpleNamespace
+
+# NumPy is imported by the array solvers only, so solving a single design starts quickly
+
+DesignResult = namedtuple('DesignResult', [
+    'q_m', 'q_v', 'q_ro', 'q_ru',
+    'f_h', 'f_n', 'f_s', 'f_st', 'f_u', 'p_a',
+    'f_bs_min_o', 'f_bs_min_u', 't_1', 't_2',
+])
+DesignResult.__doc__ = """Solved operating point of a conveyor design
+
+Attributes
+----------
+q_m : float or ndarray
+    :math:`q_m` : Mass per metre of material carried (:math:`kg/m`)
+q_v : float or ndarray
+    :math:`Q_v` : Volume per second of material carried (:math:`m^3/s`)
+q_ro : float or ndarray
+    :math:`q_{ro}` : Mass of carry idler per meter (:math:`kg/m`)
+q_ru : float or ndarray
+    :math:`q_{ru}` : Mass of return idler per meter (:math:`kg/m`)
+f_h : float or ndarray
+    :math:`F_H` : Main resistances to motion (:math:`N`)
+f_n : float or ndarray
+    :math:`F_N` : Secondary resistances (:math:`N`)
+f_s : float or ndarray
+    :math:`F_S` : Concentrated resistances (:math:`N`)
+f_st : float or ndarray
+    :math:`F_{st}` : Resistance due to gravity of the conveyed material (:math:`N`)
+f_u : float or ndarray
+    :math:`F_U` : Peripheral driving force on driving pulley (:math:`N`)
+p_a : float or ndarray
+    :math:`P_A` : Power requirements for the drive motor (:math:`W`)
+f_bs_min_o : float or ndarray
+    :math:`F_{min\\ o}` : Carry side, minimum tensile force to limit belt sag (:math:`N`)
+f_bs_min_u : float or ndarray
+    :math:`F_{min\\ u}` : Return side, minimum tensile force to limit belt sag (:math:`N`)
+t_1 : float or ndarray
+    :math:`T_1` : Tight-side tension at the drive pulley (:math:`N`)
+t_2 : float or ndarray
+    :math:`T_2` : Slack-side tension at the drive pulley (:math:`N`)
+"""
+
+IsoResult = namedtuple('IsoResult', DesignResult._fields + (
+    'f_1t_d', 'f_1t_t', 'iterations', 'residual', 'converged',
+))
+IsoResult.__doc__ = """Design solved with converged ISO 5048 wrap resistances
+
+Holds every :class:`DesignResult` attribute, plus:
+
+Attributes
+----------
+f_1t_d : ndarray
+    :math:`F_{1t,d}` : Wrap resistance at the drive pulley (:math:`N`)
+f_1t_t : ndarray
+    :math:`F_{1t,t}` : Wrap resistance at the tail pulley (:math:`N`)
+iterations : ndarray
+    Number of iterations performed for each design
+residual : ndarray
+    Change in :math:`F_U` over the last iteration (:math:`N`)
+converged : ndarray
+    Whether the residual fell within the tolerance
+"""
+
+
+class _ScalarMath:
+    """The NumPy functions used by the design chain, backed by :mod:`math` for single designs"""
+    cos = staticmethod(math.cos)
+    sin = staticmethod(math.sin)
+    exp = staticmethod(math.exp)
+    radians = staticmethod(math.radians)
+    maximum = staticmethod(max)
+
+
+def _capacity(c, q):
+    """Mass and volume of material carried, and mass of the idlers per metre"""
+    q_m = (1000 * q) / (3600 * c.v)
+    q_v = (1000 * q) / (3600 * c.p * 1000)
+    q_ro = c.m_o / c.a_o
+    q_ru = c.m_u / c.a_u
+    return q_m, q_v, q_ro, q_ru
+
+
+def _main(c, q_m, q_ro, q_ru, xp):
+    """Fh: Main resistance"""
+    return c.ff * c.c_l * 9.81 * (q_ro + q_ru + (2 * c.q_b + q_m) * xp.cos(xp.radians(c.install_a)))
+
+
+def _secondary(c, q_v):
+    """Fn: Secondary resistances excluding the wrap resistance at the pulleys, and the skirtplate term shared with Fs"""
+    g = 9.81
+    v, v_0 = c.v, c.v_0
+    m_flow = q_v * c.p * 1000  # Mass flow of material (kg/s)
+    f_ba = m_flow * (v - v_0)
+    f_skirt = c.mu2 * q_v * m_flow * g / c.b1 ** 2  # Common to Ff and FgL
+    i_bmin = (v ** 2 - v_0 ** 2) / (2 * g * c.mu1)
+    f_f = f_skirt * i_bmin / ((v + v_0) / 2) ** 2
+    return f_ba + f_f, f_skirt
+
+
+def _concentrated(c, f_skirt):
+    """Fs: Concentrated resistances"""
+    f_gl = f_skirt * c.l_s / c.v ** 2
+    f_rc = c.bc_w * c.bc_t * c.bc_p * c.bc_n * c.mu3
+    return f_gl + f_rc
+
+
+def _gravity(q_m, H):
+    """Fst: Gravity of the conveyed material"""
+    return q_m * H * 9.81
+
+
+def _wrap(c, xp):
+    """F1t: Wrap resistance at one pulley, both pulleys sharing the conveyor wrap angle"""
+    return 300 * c.B * xp.sin(xp.radians(xp.maximum(180 - c.wrap_a, 90)))
+
+
+def _power(c, f_u):
+    """PA: Power requirements for the drive motor"""
+    return f_u * c.v / (c.d_eta_1 * c.d_eta_2)
+
+
+def _resistances(c, q, H, xp):
+    """Belt capacity and every resistance except the pulley wrap resistances"""
+    q_m, q_v, q_ro, q_ru = _capacity(c, q)
+    f_h = _main(c, q_m, q_ro, q_ru, xp)
+    f_n_0, f_skirt = _secondary(c, q_v)
+    f_s = _concentrated(c, f_skirt)
+    f_st = _gravity(q_m, H)
+    return q_m, q_v, q_ro, q_ru, f_h, f_n_0, f_s, f_st
+
+
+def _sag_limits(c, q_m):
+    """Minimum belt tensions to limit sag on the carry and return sides"""
+    f_bs_min_o = (c.a_o * (c.q_b + q_m) * 9.81) / (8 * c.h_a_o)
+    f_bs_min_u = (c.a_u * c.q_b * 9.81) / (8 * c.h_a_u)
+    return f_bs_min_o, f_bs_min_u
+
+
+def _drive_tensions(f_u, e_mu, f_bs_min_o, xp):
+    """Tight and slack side tensions, keeping T2 above both the drive and carry sag minimum"""
+    t_2 = xp.maximum(f_u / (e_mu - 1), f_bs_min_o)
+    return f_u + t_2, t_2
+
+
+def _design_chain(c, q, H, xp):
+    """Evaluate the full design chain once, sharing every common intermediate"""
+    q_m, q_v, q_ro, q_ru, f_h, f_n_0, f_s, f_st = _resistances(c, q, H, xp)
+    f_n = f_n_0 + 2 * _wrap(c, xp)
+
+    # Fu and the drive motor power requirements
+    f_u = f_h + f_n + f_s + f_st
+    p_a = _power(c, f_u)
+
+    # Belt sag limits and drive pulley tensions
+    f_bs_min_o, f_bs_min_u = _sag_limits(c, q_m)
+    t_1, t_2 = _drive_tensions(f_u, xp.exp(c.mu_b * xp.radians(c.wrap_a)), f_bs_min_o, xp)
+
+    return DesignResult(q_m=q_m, q_v=q_v, q_ro=q_ro, q_ru=q_ru,
+                        f_h=f_h, f_n=f_n, f_s=f_s, f_st=f_st, f_u=f_u, p_a=p_a,
+                        f_bs_min_o=f_bs_min_o, f_bs_min_u=f_bs_min_u, t_1=t_1, t_2=t_2)
+
+
+def _as_columns(designs):
+    """Return an object exposing each design parameter as an attribute holding a float array
+
+    Accepts a sequence of :class:`~conveyance.conveyance.Conveyance`, a mapping of parameter
+    name to values, or any object already exposing the parameters as attributes.
+    """
+    import numpy as np
+
+    if isinstance(designs, dict):
+        return SimpleNamespace(**{k: np.asarray(x, dtype=float) for k, x in designs.items()})
+    if isinstance(designs, (list, tuple)):
+        names = vars(designs[0]).keys()
+        return SimpleNamespace(**{k: np.array([getattr(c, k) for c in designs], dtype=float) for k in names})
+    return designs
+
+
+def solve(c, q, H=0):
+    """
+    Solve a single conveyor design at a throughput
+
+    Runs the calculation chain of :mod:`~conveyance.belt_capacity`,
+    :mod:`~conveyance.conveyor_resistances` and :mod:`~conveyance.power_requirements`
+    in one pass, computing each intermediate once.
+
+    The slack-side tension :math:`T_2` is the larger of the minimum needed to transmit
+    :math:`F_U` and the carry side sag limit :math:`F_{min\\ o}`.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    c : Conveyance
+        Conveyor design parameters
+    q : float
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    H : float, optional
+        :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+
+    Returns
+    -------
+    DesignResult
+        Resistances, power and tensions of the design
+
+    """
+    return _design_chain(c, q, H, xp=_ScalarMath)
+
+
+def solve_batch(designs, q, H=0):
+    """
+    Solve many conveyor designs at once
+
+    Same chain as :func:`solve`, evaluated with NumPy over arrays so the per-design
+    overhead is paid once per batch. ``q`` and ``H`` broadcast against the designs.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : list of Conveyance, dict or object
+        Conveyor designs, either as a list of :class:`~conveyance.conveyance.Conveyance`,
+        a mapping of parameter name to array, or an object exposing the parameters as
+        array attributes
+    q : array_like
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    H : array_like, optional
+        :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+
+    Returns
+    -------
+    DesignResult
+        Resistances, power and tensions of every design, broadcast to a common shape
+
+    """
+    import numpy as np
+
+    c = _as_columns(designs)
+    q = np.asarray(q, dtype=float)
+    H = np.asarray(H, dtype=float)
+    result = _design_chain(c, q, H, xp=np)
+    return DesignResult(*np.broadcast_arrays(*result))
+
+
+def solve_iso(designs, q, H=0, tol=1e-6, max_iter=50):
+    """
+    Solve designs with wrap resistances and belt tensions iterated to agreement
+
+    Starts from :func:`solve_batch` and repeats :func:`~conveyance.vec.resistance_belt_wrap_iso`
+    at the drive and tail pulleys, :math:`F_U` and the drive tensions until :math:`F_U` changes
+    by at most ``tol`` between iterations. Designs that have converged are dropped from later
+    iterations.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : list of Conveyance, dict or object
+        Conveyor designs, as accepted by :func:`solve_batch`
+    q : array_like
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    H : array_like, optional
+        :math:`H` : The conveyor lift (:math:`m`) (default: 0)
+    tol : float, optional
+        Convergence tolerance on the change in :math:`F_U` (:math:`N`) (default: 1e-6)
+    max_iter : int, optional
+        Maximum number of iterations (default: 50)
+
+    Returns
+    -------
+    IsoResult
+        Converged resistances, power and tensions, with iteration counts and residuals
+
+    """
+    import numpy as np
+
+    from conveyance import vec
+
+    c = _as_columns(designs)
+    q = np.asarray(q, dtype=float)
+    H = np.asarray(H, dtype=float)
+    q_m, q_v, q_ro, q_ru, f_h, f_n_0, f_s, f_st = _resistances(c, q, H, xp=np)
+    f_bs_min_o, f_bs_min_u = _sag_limits(c, q_m)
+    f_1t = _wrap(c, np)
+    e_mu = np.exp(c.mu_b * np.radians(c.wrap_a))
+
+    # Flatten everything touched by the iterations so stragglers can be indexed directly
+    pulleys = (c.B, c.d, c.D_d, c.d_0_d, c.m_p_d, c.D_t, c.d_0_t, c.m_p_t)
+    arrays = np.broadcast_arrays(q_m, q_v, q_ro, q_ru, f_h, f_n_0, f_s, f_st, f_bs_min_o, f_bs_min_u,
+                                 f_1t, e_mu, c.v, c.d_eta_1, c.d_eta_2, *pulleys)
+    shape = arrays[0].shape
+    (q_m, q_v, q_ro, q_ru, f_h, f_n_0, f_s, f_st, f_bs_min_o, f_bs_min_u,
+     f_1t, e_mu, v, d_eta_1, d_eta_2, B, d, D_d, d_0_d, m_p_d, D_t, d_0_t, m_p_t) = [a.ravel() for a in arrays]
+
+    f_u_0 = f_h + f_n_0 + f_s + f_st
+    f_1t_d = f_1t.copy()
+    f_1t_t = f_1t.copy()
+    f_u = f_u_0 + f_1t_d + f_1t_t
+    t_1, t_2 = _drive_tensions(f_u, e_mu, f_bs_min_o, np)
+
+    iterations = np.zeros(f_u.shape, dtype=int)
+    residual = np.full(f_u.shape, np.inf)
+    converged = np.zeros(f_u.shape, dtype=bool)
+    active = np.arange(f_u.size)
+    for it in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+        t_1_a, t_2_a = t_1[active], t_2[active]
+        B_a, d_a = B[active], d[active]
+        f_1t_d_a = vec.resistance_belt_wrap_iso(B=B_a, d=d_a, D=D_d[active], d_0=d_0_d[active],
+                                                m_p=m_p_d[active], t_1=t_1_a, t_2=t_2_a)
+        f_1t_t_a = vec.resistance_belt_wrap_iso(B=B_a, d=d_a, D=D_t[active], d_0=d_0_t[active],
+                                                m_p=m_p_t[active], t_1=t_2_a, t_2=t_2_a)
+        f_u_a = f_u_0[active] + f_1t_d_a + f_1t_t_a
+        res_a = np.abs(f_u_a - f_u[active])
+
+        f_1t_d[active] = f_1t_d_a
+        f_1t_t[active] = f_1t_t_a
+        f_u[active] = f_u_a
+        t_1[active], t_2[active] = _drive_tensions(f_u_a, e_mu[active], f_bs_min_o[active], np)
+        residual[active] = res_a
+        iterations[active] = it
+
+        done = res_a <= tol
+        converged[active[done]] = True
+        active = active[~done]
+
+    f_n = f_n_0 + f_1t_d + f_1t_t
+    p_a = _power(SimpleNamespace(v=v, d_eta_1=d_eta_1, d_eta_2=d_eta_2), f_u)
+    fields = (q_m, q_v, q_ro, q_ru, f_h, f_n, f_s, f_st, f_u, p_a, f_bs_min_o, f_bs_min_u, t_1, t_2,
+              f_1t_d, f_1t_t, iterations, residual, converged)
+    return IsoResult(*[a.reshape(shape) for a in fields])
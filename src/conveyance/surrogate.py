@@ -0,0 +1,78 @@
+import numpy as np
+
+from conveyance import solver, vec
+
+
+class ThroughputSurrogate:
+    """Polynomials in throughput for the drive force and power of one design.
+
+    With the belt speed fixed, the resistances of :func:`~conveyance.solver.solve` are
+    polynomials in :math:`q`: :math:`F_H`, :math:`F_{st}` and :math:`F_{bA}` are linear and
+    :math:`F_f` and :math:`F_{gL}` quadratic, so :math:`F_U(q)` and :math:`P_A(q)` are
+    represented exactly by quadratics. The ISO 5048 wrap resistances of
+    :func:`~conveyance.solver.solve_iso` depend on the belt tensions, which are only
+    piecewise smooth in :math:`q`, so with ``iso`` a higher degree interpolant is used.
+
+    The polynomials interpolate the full chain at Chebyshev nodes over ``[0, q_max]`` and
+    are evaluated with Horner's scheme in :math:`q / q_{max}`. Their largest relative
+    error against the chain, measured on a fine grid over that range, is kept in
+    :attr:`tolerance`.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    c : Conveyance
+        Conveyor design
+    H : float, optional
+        The conveyor lift (m) (default: 0)
+    q_max : float, optional
+        Largest throughput fitted (t/h) (default: the capacity of the belt at its speed)
+    iso : bool, optional
+        Fit the chain of :func:`~conveyance.solver.solve_iso` (default: False)
+    degree : int, optional
+        Degree of the polynomials (default: 2, or 8 with ``iso``)
+
+    Attributes
+    ----------
+    coef_f_u : numpy.ndarray
+        Coefficients of :math:`F_U` in :math:`q / q_{max}`, highest degree first (:math:`N`)
+    coef_p_a : numpy.ndarray
+        Coefficients of :math:`P_A` in :math:`q / q_{max}`, highest degree first (:math:`W`)
+    q_max : float
+        Largest throughput fitted (t/h)
+    tolerance : float
+        Largest relative error of :math:`F_U` and :math:`P_A` over ``[0, q_max]``
+
+    """
+
+    def __init__(self, c, H=0, q_max=None, iso=False, degree=None):
+        if q_max is None:
+            s = vec.belt_cs_area(l3=c.l3, b=c.b, ia=c.ia, sa=c.sa)
+            q_max = float(3600 * c.v * s * c.p)
+        if degree is None:
+            degree = 8 if iso else 2
+        self.q_max = float(q_max)
+
+        def chain(q):
+            if iso:
+                return solver.solve_iso(c, q=q, H=H).f_u
+            return solver.solve_batch(c, q=q, H=H).f_u
+
+        # Chebyshev nodes of [0, 1], including both ends
+        x = (1 - np.cos(np.pi * np.arange(degree + 1) / degree)) / 2
+        self.coef_f_u = np.polyfit(x, chain(x * self.q_max), degree)
+        self.coef_p_a = self.coef_f_u * (c.v / (c.d_eta_1 * c.d_eta_2))
+
+        # P_A is proportional to F_U, so both share one relative error
+        q = np.linspace(0, self.q_max, 2001)
+        f_u = chain(q)
+        self.tolerance = float(np.max(np.abs(self.f_u(q) - f_u) / np.abs(f_u)))
+
+    def f_u(self, q):
+        """Peripheral driving force on the drive pulley at throughputs ``q`` (t/h), in N"""
+        return np.polyval(self.coef_f_u, np.asarray(q, dtype=float) / self.q_max)
+
+    def p_a(self, q):
+        """Power requirements for the drive motor at throughputs ``q`` (t/h), in W"""
+        return np.polyval(self.coef_p_a, np.asarray(q, dtype=float) / self.q_max)
@@ -0,0 +1,100 @@
+import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+
+import numpy as np
+
+from conveyance import solver
+from conveyance.fleet import FIELDS
+
+SweepResult = namedtuple('SweepResult', ['axes', 'values'])
+SweepResult.__doc__ = """Result of a design-space sweep
+
+Attributes
+----------
+axes : OrderedDict
+    Swept parameter name to the 1-D array of values along that axis
+values : dict
+    :class:`~conveyance.solver.DesignResult` field name to an array shaped like the grid
+"""
+
+
+def _sweep_chunk(params, axes, shape, start, stop, fields):
+    """Evaluate the design chain over the flat grid indices ``start:stop``"""
+    coords = np.unravel_index(np.arange(start, stop), shape)
+    c = SimpleNamespace(**params)
+    for (name, values), idx in zip(axes, coords):
+        setattr(c, name, values[idx])
+    result = solver._design_chain(c, c.q, c.H, xp=np)
+    return start, stop, [np.broadcast_to(getattr(result, f), (stop - start,)) for f in fields]
+
+
+def sweep(base, grid, q=0, H=0, workers=None, chunk_size=65536, fields=None):
+    """
+    Evaluate a design over the Cartesian product of parameter ranges
+
+    Every attribute of ``base`` named in ``grid`` is replaced by each of its values in
+    turn, as well as the operating point ``q`` and ``H`` if they are given in ``grid``.
+    The flattened grid is split into chunks of ``chunk_size`` points that are solved
+    across a process pool, and each chunk is copied into preallocated result arrays
+    as soon as it completes.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    base : Conveyance
+        Design providing every parameter that is not swept
+    grid : dict
+        Parameter name, from :data:`~conveyance.fleet.FIELDS`, ``'q'`` and ``'H'``, to a 1-D
+        sequence of values, e.g. ``{'v': ..., 'B': ...}``
+    q : float, optional
+        :math:`q` : Throughput of the conveyor (:math:`t/h`), if not swept (default: 0)
+    H : float, optional
+        :math:`H` : The conveyor lift (:math:`m`), if not swept (default: 0)
+    workers : int, optional
+        Number of worker processes, ``os.cpu_count()`` if not set. With 1 worker the
+        chunks are evaluated in this process.
+    chunk_size : int, optional
+        Number of grid points evaluated per task (default: 65536)
+    fields : sequence of str, optional
+        :class:`~conveyance.solver.DesignResult` fields to keep (default: all)
+
+    Returns
+    -------
+    SweepResult
+        The grid axes and an array per result field shaped like the grid
+
+    """
+    for name in grid:
+        if name not in FIELDS + ('q', 'H'):
+            raise ValueError('Unknown parameter {!r}'.format(name))
+    axes = OrderedDict((name, np.asarray(values, dtype=float)) for name, values in grid.items())
+    shape = tuple(len(values) for values in axes.values())
+    fields = tuple(fields or solver.DesignResult._fields)
+    n = int(np.prod(shape))
+
+    params = dict(vars(base))
+    params.update(q=q, H=H)
+    axes_items = list(axes.items())
+    out = {f: np.empty(n) for f in fields}
+
+    def store(chunk):
+        start, stop, values = chunk
+        for f, x in zip(fields, values):
+            out[f][start:stop] = x
+
+    bounds = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(bounds) == 1:
+        for start, stop in bounds:
+            store(_sweep_chunk(params, axes_items, shape, start, stop, fields))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_sweep_chunk, params, axes_items, shape, start, stop, fields)
+                       for start, stop in bounds]
+            for future in as_completed(futures):
+                store(future.result())
+
+    return SweepResult(axes=axes, values={f: x.reshape(shape) for f, x in out.items()})
@@ -0,0 +1,219 @@
+import asyncio
+from collections import namedtuple
+
+import numpy as np
+
+from conveyance import vec
+from conveyance.fleet import ConveyorFleet
+
+Estimate = namedtuple('Estimate', ['conveyor_id', 'timestamp', 'q_m', 'f_u', 'p_a', 't_1', 't_2'])
+Estimate.__doc__ = """Expected drive load of a conveyor at one telemetry reading
+
+Attributes
+----------
+conveyor_id : hashable
+    Identifier of the conveyor
+timestamp : object
+    Timestamp of the reading, passed through unchanged
+q_m : float
+    :math:`q_m` : Mass per metre of material carried (:math:`kg/m`)
+f_u : float
+    :math:`F_U` : Peripheral driving force on driving pulley (:math:`N`)
+p_a : float
+    :math:`P_A` : Power requirements for the drive motor (:math:`W`)
+t_1 : float
+    :math:`T_1` : Tight-side tension at the drive pulley (:math:`N`)
+t_2 : float
+    :math:`T_2` : Slack-side tension at the drive pulley (:math:`N`)
+"""
+
+# Rows of the per-conveyor block of terms that do not depend on the speed or throughput
+_STATIC = ('f_0', 'k_m', 'p', 'v_0', 'k_skirt', 'k_i', 'l_s', 'k_p', 'k_t', 'f_bs_0', 'k_bs')
+
+
+class TelemetryModel:
+    """Conveyor designs prepared for evaluation at streamed operating points.
+
+    Every term of the design chain that does not depend on the belt speed or the
+    throughput, such as the idler masses, the main resistance of the empty belt, the
+    pulley wrap and belt cleaner resistances and the drive friction factor, is computed
+    once per conveyor. Evaluating a batch of readings then gathers these terms by conveyor
+    and completes the chain with a few array operations. Results agree with
+    :func:`~conveyance.solver.solve_batch`.
+
+    .. versionadded:: 0.1.0
+
+    Parameters
+    ----------
+    designs : dict
+        Conveyor identifier to its :class:`~conveyance.conveyance.Conveyance`
+    H : float or dict, optional
+        The conveyor lift (m), shared by every conveyor or by identifier (default: 0)
+
+    """
+
+    def __init__(self, designs, H=0):
+        ids = list(designs)
+        self._index = {conveyor_id: i for i, conveyor_id in enumerate(ids)}
+        c = ConveyorFleet.from_conveyances([designs[conveyor_id] for conveyor_id in ids])
+        if isinstance(H, dict):
+            H = np.array([H.get(conveyor_id, 0) for conveyor_id in ids], dtype=float)
+
+        g = 9.81
+        cos_a = np.cos(np.radians(c.install_a))
+        k_h = c.ff * c.c_l * g
+        q_ro = vec.mass_density_idler(a=c.a_o, m=c.m_o)
+        q_ru = vec.mass_density_idler(a=c.a_u, m=c.m_u)
+        f_1t = vec.resistance_belt_wrap(B=c.B, wrap_a=c.wrap_a)
+        f_rc = vec.resistance_belt_cleaners(bc_w=c.bc_w, bc_t=c.bc_t, bc_p=c.bc_p, bc_n=c.bc_n, mu3=c.mu3)
+        k_bs = c.a_o * g / (8 * c.h_a_o)
+
+        static = {
+            # F_U of the empty belt: main resistance, wrap at both pulleys and belt cleaners
+            'f_0': k_h * (q_ro + q_ru + 2 * c.q_b * cos_a) + 2 * f_1t + f_rc,
+            # Main and gravity resistance per kg/m of material
+            'k_m': k_h * cos_a + H * g,
+            'p': c.p,
+            'v_0': c.v_0,
+            'k_skirt': c.mu2 * g / c.b1 ** 2,
+            'k_i': 1 / (2 * g * c.mu1),
+            'l_s': c.l_s,
+            'k_p': 1 / (c.d_eta_1 * c.d_eta_2),
+            'k_t': 1 / (np.exp(c.mu_b * np.radians(c.wrap_a)) - 1),
+            'f_bs_0': k_bs * c.q_b,
+            'k_bs': k_bs,
+        }
+        self._static = np.array([np.broadcast_to(static[name], (len(ids),)) for name in _STATIC])
+
+    def __len__(self):
+        return len(self._index)
+
+    def evaluate(self, conveyor_ids, v, q):
+        """Evaluate a batch of readings.
+
+        Parameters
+        ----------
+        conveyor_ids : sequence
+            Identifier of the conveyor of each reading
+        v : array_like
+            :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+        q : array_like
+            :math:`q` : Throughput of the conveyor (:math:`t/h`)
+
+        Returns
+        -------
+        q_m, f_u, p_a, t_1, t_2 : ndarray
+            Expected load of each reading, see :class:`Estimate`. Readings of a stopped
+            belt give NaN.
+
+        """
+        index = self._index
+        idx = np.fromiter((index[i] for i in conveyor_ids), dtype=np.intp, count=len(conveyor_ids))
+        f_0, k_m, p, v_0, k_skirt, k_i, l_s, k_p, k_t, f_bs_0, k_bs = self._static[:, idx]
+        v = np.asarray(v, dtype=float)
+        q = np.asarray(q, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v = np.where(v > 0, v, np.nan)
+            q_m = q / (3.6 * v)
+            m_flow = q / 3.6  # Mass flow of material (kg/s)
+            f_skirt = k_skirt * m_flow ** 2 / (1000 * p)
+            f_ba = m_flow * (v - v_0)
+            f_f = f_skirt * (v ** 2 - v_0 ** 2) * k_i / ((v + v_0) / 2) ** 2
+            f_gl = f_skirt * l_s / v ** 2
+            f_u = f_0 + k_m * q_m + f_ba + f_f + f_gl
+
+        p_a = f_u * v * k_p
+        t_2 = np.maximum(f_u * k_t, f_bs_0 + k_bs * q_m)
+        return q_m, f_u, p_a, f_u + t_2, t_2
+
+    def _estimates(self, batch):
+        conveyor_ids, timestamps, v, q = zip(*batch)
+        results = self.evaluate(conveyor_ids, v, q)
+        return [Estimate(*row) for row in zip(conveyor_ids, timestamps, *[r.tolist() for r in results])]
+
+    def stream(self, readings, batch_size=256):
+        """Evaluate a stream of readings in micro-batches.
+
+        Readings are consumed ``batch_size`` at a time, so memory use is constant and each
+        reading waits for at most ``batch_size - 1`` others before it is evaluated.
+
+        Parameters
+        ----------
+        readings : iterable
+            ``(conveyor_id, timestamp, v, q)`` records
+        batch_size : int, optional
+            Largest number of readings evaluated together (default: 256)
+
+        Yields
+        ------
+        Estimate
+            Expected load of each reading, in the order of the readings
+
+        """
+        batch = []
+        for reading in readings:
+            batch.append(reading)
+            if len(batch) == batch_size:
+                yield from self._estimates(batch)
+                batch = []
+        if batch:
+            yield from self._estimates(batch)
+
+    async def astream(self, readings, batch_size=256, max_delay=0.05):
+        """Evaluate an asynchronous stream of readings in micro-batches.
+
+        A batch is evaluated once it holds ``batch_size`` readings or its first reading has
+        waited ``max_delay`` seconds, whichever comes first, bounding the latency added to
+        each reading when the feed is slow.
+
+        Parameters
+        ----------
+        readings : async iterable
+            ``(conveyor_id, timestamp, v, q)`` records
+        batch_size : int, optional
+            Largest number of readings evaluated together (default: 256)
+        max_delay : float, optional
+            Longest time a reading waits for its batch to fill (s) (default: 0.05)
+
+        Yields
+        ------
+        Estimate
+            Expected load of each reading, in the order of the readings
+
+        """
+        loop = asyncio.get_event_loop()
+        iterator = readings.__aiter__()
+        pending = None
+        batch = []
+        deadline = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                timeout = None if deadline is None else max(deadline - loop.time(), 0)
+                done, _ = await asyncio.wait([pending], timeout=timeout)
+                if done:
+                    try:
+                        reading = pending.result()
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        pending = None
+                    batch.append(reading)
+                    if deadline is None:
+                        deadline = loop.time() + max_delay
+                    if len(batch) < batch_size:
+                        continue
+                # The batch is full or its first reading has waited long enough
+                for estimate in self._estimates(batch):
+                    yield estimate
+                batch = []
+                deadline = None
+            if batch:
+                for estimate in self._estimates(batch):
+                    yield estimate
+        finally:
+            # Stop waiting on the source if the consumer stops early
+            if pending is not None:
+                pending.cancel()
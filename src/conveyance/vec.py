@@ -0,0 +1,591 @@
+import numpy as np
+
+
+def _as_float(x):
+    return np.asarray(x, dtype=float)
+
+
+def _fill_unset(x, default):
+    """Replace zero or NaN elements of ``x`` by ``default()``, evaluated only if needed"""
+    if x is None:
+        return default()
+    x = _as_float(x)
+    unset = (x == 0) | np.isnan(x)
+    if not unset.any():
+        return x
+    return np.where(unset, default(), x)
+
+
+def mass_density_material(v, q=None, q_v=None, p=None):
+    """
+    Array version of :func:`conveyance.belt_capacity.mass_density_material`
+
+    The choice between throughput and flow rate is made per element: where
+    :math:`q` is non-zero it is used, elsewhere :math:`Q_v` and :math:`\\rho`.
+
+    Parameters
+    ----------
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    q : array_like, optional
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    q_v : array_like, optional
+        :math:`Q_v` : Flow rate of the conveyor (:math:`m^3/s`)
+    p : array_like, optional
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+
+    Returns
+    -------
+    ndarray
+        :math:`q_m` : Mass per metre of material carried (:math:`kg/m`)
+
+    """
+    v = _as_float(v)
+    if q is None:
+        return _as_float(q_v) * _as_float(p) * 1000 / v
+
+    q = _as_float(q)
+    q_m = (1000 * q) / (3600 * v)
+    if q_v is None:
+        return q_m
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        q_m_v = _as_float(q_v) * _as_float(p) * 1000 / v
+    return np.where(q != 0, q_m, q_m_v)
+
+
+def mass_density_idler(a, m):
+    """
+    Array version of :func:`conveyance.belt_capacity.mass_density_idler`
+
+    Parameters
+    ----------
+    a : array_like
+        :math:`a` : Idler spacing (:math:`m`)
+    m : array_like
+        :math:`m` : Idler mass (:math:`kg`)
+
+    Returns
+    -------
+    ndarray
+        :math:`q_r` : Mass per meter from idlers (:math:`kg/m`)
+
+    """
+    return _as_float(m) / _as_float(a)
+
+
+def volume_carried_material(q, p):
+    """
+    Array version of :func:`conveyance.belt_capacity.volume_carried_material`
+
+    Parameters
+    ----------
+    q : array_like
+        :math:`q` : Throughput of the conveyor (:math:`t/h`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+
+    Returns
+    -------
+    ndarray
+        :math:`Q_v` : Volume per second of material carried (:math:`m^3/s`)
+
+    """
+    return (1000 * _as_float(q)) / (3600 * _as_float(p) * 1000)
+
+
+def volumetric_flow(belt_ca, v):
+    """
+    Array version of :func:`conveyance.belt_capacity.volumetric_flow`
+
+    Parameters
+    ----------
+    belt_ca : array_like
+        :math:`S` : Cross-sectional area of material of the belt (:math:`m^2`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+
+    Returns
+    -------
+    ndarray
+        :math:`Q_v` : The theoretical flow rate of the conveyor (:math:`m^3/s`)
+
+    """
+    return _as_float(belt_ca) * _as_float(v)
+
+
+def belt_cs_area(l3, b, ia, sa):
+    """
+    Array version of :func:`conveyance.belt_capacity.belt_cs_area`
+
+    Parameters
+    ----------
+    l3 : array_like
+        :math:`l_3` : Width of the idler (:math:`m`)
+    b : array_like
+        :math:`b` : Width of max material on belt (:math:`m`)
+    ia : array_like
+        :math:`\\lambda` : Installed angle of the side idlers (:math:`deg`)
+    sa : array_like
+        :math:`\\theta` : Surcharge angle of the material (:math:`deg`)
+
+    Returns
+    -------
+    ndarray
+        :math:`S` : The cross-sectional area of material on the belt (:math:`m^2`)
+
+    """
+    l3 = _as_float(l3)
+    b = _as_float(b)
+    ia_r = np.radians(ia)
+    sa_r = np.radians(sa)
+
+    # Upper half of the belt
+    s1 = (1 / 6) * (l3 + (b - l3) * np.cos(ia_r)) ** 2 * np.tan(sa_r)
+
+    # Lower half of the belt
+    s2 = (l3 + ((b - l3) / 2) * np.cos(ia_r)) * (((b - l3) / 2) * np.sin(ia_r))
+    return s1 + s2
+
+
+def resistance_main(q_m, q_b, q_ro, q_ru, c_l, install_a, ff):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_main`
+
+    Parameters
+    ----------
+    q_m : array_like
+        :math:`q_m` : Mass per metre of material carried (:math:`kg/m`)
+    q_b : array_like
+        :math:`q_b` : Belt mass per meter (:math:`kg/m`)
+    q_ro : array_like
+        :math:`q_{ro}` : Mass of carry idler per meter (:math:`kg/m`)
+    q_ru : array_like
+        :math:`q_{ru}` : Mass of return idler per meter (:math:`kg/m`)
+    c_l : array_like
+        :math:`L` : Center-to-centre length of the conveyor (:math:`m`)
+    install_a : array_like
+        :math:`\\delta` : Installation angle of the conveyor (:math:`deg`)
+    ff : array_like
+        :math:`f` : Artificial friction factor (average operating conditions)
+
+    Returns
+    -------
+    ndarray
+        :math:`F_H` : Main resistances to motion (:math:`N`)
+
+    """
+    q_m, q_b, q_ro, q_ru, c_l, ff = map(_as_float, (q_m, q_b, q_ro, q_ru, c_l, ff))
+    return ff * c_l * 9.81 * (q_ro + q_ru + (2 * q_b + q_m) * np.cos(np.radians(install_a)))
+
+
+def resistance_secondary(q_v, p, v, v_0, B, b1, mu1, mu2, wrap_a_h, wrap_a_t,
+                         f_1t_d=None, f_1t_t=None):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_secondary`
+
+    The wrap resistances are filled in per element: wherever ``f_1t_d`` or
+    ``f_1t_t`` is zero or NaN the value from :func:`resistance_belt_wrap` is used.
+
+    Parameters
+    ----------
+    q_v : array_like
+        :math:`q_v` : Volume per second of material carried (:math:`m^3/s`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    v_0 : array_like
+        :math:`v_0` : Speed of the material dropped on to the belt, in the direction of the belt movement (:math:`m/s`)
+    B : array_like
+        :math:`B` : Total width of belt (:math:`m`)
+    b1 : array_like
+        :math:`b_1` : Width between skirtplates (:math:`m`)
+    mu1 : array_like
+        :math:`\\mu_1` : Friction coefficient between material/belt
+    mu2 : array_like
+        :math:`\\mu_2` : Friction coefficient between material/skirtplates
+    wrap_a_h : array_like
+        :math:`\\theta_h` : Wrap angle around the head pulley (:math:`deg`)
+    wrap_a_t : array_like
+        :math:`\\theta_t` : Wrap angle around the tail pulley (:math:`deg`)
+    f_1t_d : array_like, optional
+        :math:`f_{1t,d}` : Wrap resistance between the belt and the drive pulley (:math:`N`)
+    f_1t_t : array_like, optional
+        :math:`f_{1t,t}` : Wrap resistance between the belt and the tail pulley (:math:`N`)
+
+    Returns
+    -------
+    ndarray
+        :math:`F_N` : Secondary resistances due to inertial and material and belt frictions (:math:`N`)
+
+    """
+    # Inertial and friction resistances (FbA)
+    f_ba = resistance_inertial_friction(q_v=q_v, p=p, v=v, v_0=v_0)
+
+    # Resistance between handled material and skirtplates in acceleration area (Ff)
+    f_f = resistance_material_acceleration(q_v=q_v, p=p, v=v, v_0=v_0,
+                                           b1=b1, mu1=mu1, mu2=mu2)
+
+    # Wrap resistance between the belt and the pulleys (F1t)
+    f_1t_d = _fill_unset(f_1t_d, lambda: resistance_belt_wrap(B=B, wrap_a=wrap_a_h))  # Drive pulley
+    f_1t_t = _fill_unset(f_1t_t, lambda: resistance_belt_wrap(B=B, wrap_a=wrap_a_t))  # Tail pulley
+
+    return f_ba + f_f + f_1t_d + f_1t_t
+
+
+def resistance_concentrated(q_v, p, v, l_s, b1, bc_w, bc_t, bc_p, bc_n, mu2, mu3):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_concentrated`
+
+    Parameters
+    ----------
+    q_v : array_like
+        :math:`q_v` : Volume per second of material carried (:math:`m^3/s`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    l_s : array_like
+        :math:`l_s` : Length of installation fitted with skirtplates (:math:`m`)
+    b1 : array_like
+        :math:`b_1` : Width between skirtplates (:math:`m`)
+    bc_w : array_like
+        :math:`bc_w` : Belt cleaner width (:math:`m`)
+    bc_t : array_like
+        :math:`bc_t` : Belt cleaner thickness (:math:`m`)
+    bc_p : array_like
+        :math:`bc_p` : Pressure between cleaner and belt (:math:`N/m^2`)
+    bc_n : array_like
+        :math:`bc_n` : Number of belt cleaners
+    mu2 : array_like
+        :math:`\\mu_2` : Friction coefficient between material/skirtplates
+    mu3 : array_like
+        :math:`\\mu_3` : Friction coefficient between belt and cleaner
+
+    Returns
+    -------
+    ndarray
+        :math:`F_S` : Conveyor concentrated resistances (:math:`N`)
+
+    """
+    # Resistance due to friction between the material handled and skirt plates (FgL)
+    f_gl = resistance_material_skirtplates(q_v=q_v, p=p, v=v, l_s=l_s, b1=b1, mu2=mu2)
+
+    # Resistance due to belt cleaners fitted to the conveyor (Frc)
+    f_rc = resistance_belt_cleaners(bc_w=bc_w, bc_t=bc_t, bc_p=bc_p, bc_n=bc_n, mu3=mu3)
+
+    # No idler tilting (Fep) or discharge ploughs (Fa)
+    return f_gl + f_rc
+
+
+def resistance_gravity(q_m, H):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_gravity`
+
+    Parameters
+    ----------
+    q_m : array_like
+        :math:`q_m` : Mass per metre of material carried (:math:`kg/m`)
+    H : array_like
+        :math:`H` : The conveyor lift (:math:`m`)
+
+    Returns
+    -------
+    ndarray
+        :math:`F_{st}` : Resistance due to gravity of the conveyed material (:math:`N`)
+
+    """
+    return _as_float(q_m) * _as_float(H) * 9.81
+
+
+def resistance_inertial_friction(q_v, p, v, v_0):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_inertial_friction`
+
+    Parameters
+    ----------
+    q_v : array_like
+        :math:`Q_v` : Volume per second of material carried (:math:`m^3/s`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    v_0 : array_like
+        :math:`v_0` : Speed of the material dropped on to the belt, in the direction of the belt movement (:math:`m/s`)
+
+    Returns
+    -------
+    ndarray
+        :math:`F_{bA}` : Resistance due to inertial and friction forces (:math:`N`)
+
+    """
+    q_v, p, v, v_0 = map(_as_float, (q_v, p, v, v_0))
+    return q_v * p * 1000 * (v - v_0)
+
+
+def resistance_material_acceleration(q_v, p, v, v_0, b1, mu1, mu2):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_material_acceleration`
+
+    Parameters
+    ----------
+    q_v : array_like
+        :math:`Q_v` : Volume per second of material carried (:math:`m^3/s`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    v_0 : array_like
+        :math:`v_0` : Speed of the material dropped on to the belt, in the direction of the belt movement (:math:`m/s`)
+    b1 : array_like
+        :math:`b_1` : Width between skirtplates (:math:`m`)
+    mu1 : array_like
+        :math:`\\mu_1` : Friction coefficient between material/belt
+    mu2 : array_like
+        :math:`\\mu_2` : Friction coefficients between material/skirtplates
+
+    Returns
+    -------
+    ndarray
+        :math:`F_f` : Resistance between handled material and skirtplates in acceleration area (:math:`N`)
+
+    """
+    q_v, p, v, v_0, b1, mu1, mu2 = map(_as_float, (q_v, p, v, v_0, b1, mu1, mu2))
+    g = 9.81
+    i_bmin = (v ** 2 - v_0 ** 2) / (2 * g * mu1)
+    return (mu2 * q_v ** 2 * p * 1000 * g * i_bmin) / (((v + v_0) / 2) ** 2 * b1 ** 2)
+
+
+def resistance_belt_wrap(B, wrap_a):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_belt_wrap`
+
+    Parameters
+    ----------
+    B : array_like
+        :math:`B` : Total width of belt (:math:`m`)
+    wrap_a : array_like
+        :math:`\\alpha_1` : Wrap angle around the pulley (:math:`deg`)
+
+    Returns
+    -------
+    ndarray
+        :math:`F_{1t}` : Resistance between the belt and pulley (:math:`N`)
+
+    """
+    # If alpha > 90, then sin(alpha) = 1
+    alpha = np.maximum(180 - _as_float(wrap_a), 90)
+    return 300 * _as_float(B) * np.sin(np.radians(alpha))
+
+
+def resistance_material_skirtplates(q_v, p, v, l_s, b1, mu2):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_material_skirtplates`
+
+    Parameters
+    ----------
+    q_v : array_like
+        :math:`Q_v` : Volume per second of material carried (:math:`m^3/s`)
+    p : array_like
+        :math:`\\rho` : Density of the material (:math:`t/m^3`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    l_s : array_like
+        :math:`l_s` : Length of installation fitted with skirtplates (:math:`m`)
+    b1 : array_like
+        :math:`b_1` : Width between skirtplates (:math:`m`)
+    mu2 : array_like
+        :math:`\\mu_2` : Friction coefficients between material/skirtplates
+
+    Returns
+    -------
+    ndarray
+        :math:`F_{gL}`: Resistance due to friction between the material handled and skirt plates (:math:`N`)
+
+    """
+    q_v, p, v, l_s, b1, mu2 = map(_as_float, (q_v, p, v, l_s, b1, mu2))
+    return (mu2 * (q_v ** 2) * (p * 1000) * 9.81 * l_s) / ((v ** 2) * (b1 ** 2))
+
+
+def resistance_belt_cleaners(bc_w, bc_t, bc_p, bc_n, mu3):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_belt_cleaners`
+
+    Parameters
+    ----------
+    bc_w : array_like
+        :math:`bc_{w}` : Belt cleaner width (:math:`m`)
+    bc_t : array_like
+        :math:`bc_{t}` : Belt cleaner thickness (:math:`m`)
+    bc_p : array_like
+        :math:`bc_{p}` : Pressure between cleaner and belt (:math:`N/m^2`)
+    bc_n : array_like
+        :math:`bc_{n}` : Number of belt cleaners
+    mu3 : array_like
+        :math:`\\mu_3` : Friction coefficient between belt and cleaner
+
+    Returns
+    -------
+    ndarray
+        :math:`F_{rc}` : Friction resistance due to belt cleaners fitted to the conveyor (:math:`N`)
+
+    """
+    bc_w, bc_t, bc_p, bc_n, mu3 = map(_as_float, (bc_w, bc_t, bc_p, bc_n, mu3))
+    return bc_w * bc_t * bc_p * bc_n * mu3
+
+
+def resistance_belt_sag_tension(q_m, q_b, a_o, a_u, h_a_o, h_a_u):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_belt_sag_tension`
+
+    Parameters
+    ----------
+    q_m : array_like
+        :math:`q_m` : Mass per metre of material carried (:math`kg/m`)
+    q_b : array_like
+        :math:`q_b` : Belt mass per meter (:math`kg/m`)
+    a_o : array_like
+        :math:`a_o` : Idler spacing, carry (:math`m`)
+    a_u : array_like
+        :math:`a_u` : Idler spacing, return (:math`m`)
+    h_a_o : array_like
+        :math:`h_{ao}` : Allowable belt sag between idlers, carry (:math`m`)
+    h_a_u : array_like
+        :math:`h_{au}` : Allowable belt sag between idlers, return (:math`m`)
+
+    Returns
+    -------
+    ndarray
+        :math:`F_{min\\ o}` : Carry side, minimum tensile force to limit belt sag between 2 sets of idlers (:math:`N`)
+    ndarray
+        :math:`F_{min\\ u}` : Return side, minimum tensile force to limit belt sag between 2 sets of idlers (:math:`N`)
+
+    """
+    q_m, q_b, a_o, a_u, h_a_o, h_a_u = map(_as_float, (q_m, q_b, a_o, a_u, h_a_o, h_a_u))
+
+    # Carry side
+    f_bs_min_o = (a_o * (q_b + q_m) * 9.81) / (8 * h_a_o)
+
+    # Return side
+    f_bs_min_u = (a_u * q_b * 9.81) / (8 * h_a_u)
+
+    return f_bs_min_o, f_bs_min_u
+
+
+def resistance_belt_wrap_iso(B, d, D, d_0, m_p, t_1, t_2):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.resistance_belt_wrap_iso`
+
+    Parameters
+    ----------
+    B : array_like
+        :math:`B` : Total width of belt (:math:`m`)
+    d : array_like
+        :math:`d` : Belt thickness (:math:`m`)
+    D : array_like
+        :math:`D` : Pulley diameter (:math:`m`)
+    d_0 : array_like
+        :math:`d_0` : Inside bearing diameter (:math:`m`)
+    m_p : array_like
+        :math:`m_p` : Pulley mass (:math:`kg`)
+    t_1 : array_like
+        :math:`T_1` : Tight-side tension at pulley (:math:`N`)
+    t_2 : array_like
+        :math:`T_2` : Slack-side tension at pulley (:math:`N`)
+
+    Returns
+    -------
+    ndarray
+        :math:`F_{1t}`: Approximate combined resistance (:math:`N`)
+
+    """
+    B, d, D, d_0, m_p, t_1, t_2 = map(_as_float, (B, d, D, d_0, m_p, t_1, t_2))
+    g = 9.81
+    # F: Average belt tension at the pulley
+    F = (t_1 + t_2) / 2
+
+    # f_1: Wrap resistance between belt and pulley
+    f_1 = 9 * B * (140 + (0.01 * F / B)) * d / D
+
+    # f_t: Pulley bearing resistance
+    f_t = 0.005 * (d_0 / D) * (((t_1 + t_2) ** 2) + (g * m_p) ** 2) ** (1 / 2)
+    return f_1 + f_t
+
+
+def tension_transmit_min(f_u, wrap_a, mu_b, acc_sd=3, t_2_min=None):
+    """
+    Array version of :func:`conveyance.conveyor_resistances.tension_transmit_min`
+
+    ``t_2_min`` may be given per element; NaN entries are replaced by the
+    minimum slack-side tension needed to transmit :math:`F_u`. The ratio
+    check is rounded to ``acc_sd`` decimals and evaluated per element.
+
+    Parameters
+    ----------
+    f_u : array_like
+        :math:`F_u` : Peripheral driving force on driving pulley (:math:`N`)
+    wrap_a : array_like
+        :math:`\\alpha` : Wrap angle around the pulley (:math:`\\theta`)
+    mu_b : array_like
+        :math:`\\mu_b` : Belt/Pulley friction coefficient
+    acc_sd : int, optional
+        Significant digit accuracy for checking the ratio (default: 3)
+    t_2_min : array_like, optional
+        :math:`t_{2\\ min}` : Minimum tensile force that must be maintained to transmit :math:`f_u`
+
+    Returns
+    -------
+    ndarray
+        :math:`t_1` : Tight-side tension at pulley (:math:`N`)
+    ndarray
+        :math:`t_2` : Slack-side tension at pulley (:math:`N`)
+    tuple of ndarray
+        :math:`(x, y, z), where\\ x = (t_1 / t_2)\\ y = \\exp(\\mu_b\\ \\alpha)\\ z = (t_1 / t_2) \\leq \\exp(\\mu_b\\ \\alpha)`
+
+    """
+    f_u = _as_float(f_u)
+    wrap_rad = _as_float(wrap_a) * (np.pi / 180)
+    t_d_rat_min = np.exp(_as_float(mu_b) * wrap_rad)
+
+    # Set a value for t_2_min where it is not set
+    t_2_default = f_u / (t_d_rat_min - 1)
+    if t_2_min is None:
+        t_2_min = t_2_default
+    else:
+        t_2_min = _as_float(t_2_min)
+        t_2_min = np.where(np.isnan(t_2_min), t_2_default, t_2_min)
+
+    # t_1: Tight side tension at pulley
+    t_1 = f_u + t_2_min
+
+    # Ensure the ratio (t_1 / t_2_min) >= e(mu_b * wrap_rad)
+    t_d_rat = t_1 / t_2_min
+    t_d_min_ok = np.round(t_d_rat, acc_sd) >= np.round(t_d_rat_min, acc_sd)
+
+    return t_1, t_2_min, (t_d_rat, t_d_rat_min, t_d_min_ok)
+
+
+def power_requirements_motor(f_u, v, d_eta_1, d_eta_2):
+    """
+    Array version of :func:`conveyance.power_requirements.power_requirements_motor`
+
+    Parameters
+    ----------
+    f_u : array_like
+       :math:`F_u` : Peripheral driving force on driving pulley (:math:`N`)
+    v : array_like
+        :math:`v` : Speed of the conveyor belt (:math:`m/s`)
+    d_eta_1 : array_like
+        :math:`\\eta_1` : Fluid coupling efficiency
+    d_eta_2 : array_like
+        :math:`\\eta_2` : Gearbox efficiency
+
+    Returns
+    -------
+    ndarray
+        :math:`P_A` : Power requirements for the drive motor (:math:`W`)
+
+    """
+    f_u, v, d_eta_1, d_eta_2 = map(_as_float, (f_u, v, d_eta_1, d_eta_2))
+    return (f_u * v) / (d_eta_1 * d_eta_2)
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from conveyance import cache, conveyance, solver
+from conveyance.fleet import ConveyorFleet
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.tmp = tempfile.mkdtemp()
+        self.db = os.path.join(self.tmp, 'results.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_keys(self):
+        """Keys depend on the parameter values and operating point, not on how the design was built"""
+        copy = conveyance.Conveyance.from_parameters({k: float(v) for k, v in vars(self.c).items()})
+        key, = cache.ResultCache.keys(self.c, q=2300)
+        self.assertEqual(cache.ResultCache.keys(copy, q=2300.0, H=-0.0), [key])
+        self.assertNotEqual(cache.ResultCache.keys(self.c, q=2300, H=1), [key])
+        copy.ff = 0.021
+        self.assertNotEqual(cache.ResultCache.keys(copy, q=2300), [key])
+
+    def test_solve(self):
+        fleet = ConveyorFleet.from_conveyances([self.c] * 4)
+        fleet.v = [4.0, 4.5, 5.0, 5.5]
+        q = np.array([2000.0, 2100.0, 2200.0, 2300.0])
+        expected = solver.solve_batch(fleet, q=q, H=5)
+
+        with cache.ResultCache(self.db) as results:
+            first = results.solve(fleet[:2], q=q[:2], H=5)
+            self.assertEqual((results.hits, results.misses), (0, 2))
+            second = results.solve(fleet, q=q, H=5)
+            self.assertEqual((results.hits, results.misses), (2, 4))
+        for name in cache.CachedResult._fields:
+            np.testing.assert_array_equal(getattr(first, name), getattr(expected, name)[:2])
+            np.testing.assert_array_equal(getattr(second, name), getattr(expected, name))
+
+        # Results persist across connections
+        with cache.ResultCache(self.db) as results:
+            self.assertEqual(len(results), 4)
+            hits, values = results.lookup(results.keys(fleet, q=q, H=5) + results.keys(self.c, q=1))
+            np.testing.assert_array_equal(hits, [True] * 4 + [False])
+            np.testing.assert_array_equal(values.t_1[:4], expected.t_1)
+            self.assertTrue(np.isnan(values.t_1[4]))
+
+    def test_iso(self):
+        with cache.ResultCache(':memory:') as results:
+            plain = results.solve(self.c, q=2300)
+            iso = results.solve(self.c, q=2300, iso=True)
+            self.assertEqual(len(results), 2)
+            self.assertAlmostEqual(iso.f_u[0], solver.solve_iso([self.c], q=2300).f_u[0], 9)
+            self.assertNotEqual(iso.f_u[0], plain.f_u[0])
+
+    def test_duplicates(self):
+        with cache.ResultCache(':memory:') as results:
+            values = results.solve([self.c, self.c], q=2300)
+            self.assertEqual(len(results), 1)
+            hits, values = results.lookup(results.keys([self.c, self.c], q=2300))
+            self.assertTrue(hits.all())
+            self.assertAlmostEqual(values.p_a[1] / 1000, 68.93, 2)
+
+    def test_lru_eviction(self):
+        fleet = ConveyorFleet.from_conveyances([self.c])
+        with cache.ResultCache(':memory:', max_entries=3) as results:
+            keys = [results.keys(fleet, q=q)[0] for q in range(5)]
+            for q in range(3):
+                results.solve(fleet, q=q)
+            results.lookup(keys[:1])  # Most recently used
+            results.solve(fleet, q=3)
+            results.solve(fleet, q=4)
+            hits, _ = results.lookup(keys)
+            np.testing.assert_array_equal(hits, [True, False, False, True, True])
@@ -0,0 +1,105 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from conveyance import cli, fleetfile
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.tmp = tempfile.mkdtemp()
+        for name in ('a.yaml', 'b.yml', 'notes.txt'):
+            shutil.copy(self.file_path, os.path.join(self.tmp, name))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def run_cli(self, *argv):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            status = cli.main(list(argv))
+        return status, stdout.getvalue()
+
+    def test_expand_paths(self):
+        paths = cli.expand_paths([self.tmp, os.path.join(self.tmp, '*.txt'), self.file_path])
+        self.assertEqual([os.path.basename(p) for p in paths], ['a.yaml', 'b.yml', 'notes.txt', 'flat_conveyor.yaml'])
+
+    def test_csv(self):
+        status, out = self.run_cli(self.file_path, '-q', '2300', '--fields', 'p_a,t_1,t_2')
+        self.assertEqual(status, 0)
+        header, row = out.splitlines()
+        self.assertEqual(header, 'path,p_a,t_1,t_2')
+        p_a, t_1, t_2 = [float(x) for x in row.split(',')[1:]]
+        self.assertAlmostEqual(p_a / 1000, 68.93, 2)
+        self.assertAlmostEqual(t_1, 35237.40, 2)
+        self.assertAlmostEqual(t_2, 22005.08, 2)
+
+    def test_jsonl(self):
+        status, out = self.run_cli(self.tmp, '-q', '2300', '-H', '5', '-f', 'jsonl', '-j', '1')
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]['t_1'], records[1]['t_1'])
+        self.assertGreater(records[0]['f_st'], 0)
+
+    def test_fleet(self):
+        out = os.path.join(self.tmp, 'results.bin')
+        status, _ = self.run_cli(self.tmp, '-q', '2300', '-f', 'fleet', '-o', out, '--iso', '-j', '1')
+        self.assertEqual(status, 0)
+        f = fleetfile.open_fleet(out)
+        self.assertEqual(len(f.fleet), 2)
+        self.assertTrue((f.results.p_a > 0).all())
+
+    def test_errors(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(self.run_cli(os.path.join(self.tmp, 'missing.yaml'), '-q', '2300')[0], 1)
+        self.assertIn('missing.yaml', stderr.getvalue())
+
+    def test_invalid_design(self):
+        with open(self.file_path) as stream:
+            text = stream.read()
+        fast = os.path.join(self.tmp, 'fast.yaml')
+        with open(fast, 'w') as stream:
+            stream.write(text.replace('v: 4.8', 'v: fast'))
+        network = os.path.join(os.path.dirname(__file__), 'flat_network.yaml')
+        cases = [
+            ([fast], 'parameter conveyor_design.operation.v in {} is not a number'.format(fast)),
+            ([self.file_path, fast, '-j', '2'], 'parameter conveyor_design.operation.v in {} is not a number'.format(fast)),
+            ([network], 'missing parameter conveyor_design in {}'.format(network)),
+        ]
+        for argv, message in cases:
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                status, out = self.run_cli(*argv, '-q', '2300')
+            self.assertEqual(status, 1)
+            self.assertEqual(stderr.getvalue(), 'conveyance: error: {}\n'.format(message))
+
+    def test_invalid_yaml(self):
+        bad = os.path.join(self.tmp, 'bad.yaml')
+        with open(bad, 'w') as stream:
+            stream.write('conveyor_design:\n  v: [1, 2\n')
+        for argv in ([bad], [self.file_path, bad, '-j', '2']):
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                status, out = self.run_cli(*argv, '-q', '2300')
+            self.assertEqual(status, 1)
+            self.assertEqual(out, '')
+            lines = stderr.getvalue().splitlines()
+            self.assertEqual(len(lines), 1)
+            self.assertTrue(lines[0].startswith('conveyance: error: {}: invalid YAML, '.format(bad)), lines[0])
+            self.assertIn('line 3', lines[0])
+
+    def test_lazy_imports(self):
+        """A single design is solved without importing NumPy"""
+        code = ('import sys; from conveyance.cli import main; main([{!r}, "-q", "2300"]); '
+                'sys.exit("numpy" in sys.modules)').format(self.file_path)
+        result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE)
+        self.assertEqual(result.returncode, 0)
+        self.assertIn(b'path,q_m', result.stdout)
@@ -0,0 +1,80 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, solver
+from conveyance.dynamics import Coast, DirectOnLine, SoftStart, VariableSpeed, simulate
+from conveyance.fleet import ConveyorFleet
+
+
+class TestDynamics(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.r = solver.solve(self.c, q=2300)
+
+    def test_running(self):
+        """Started from running, the loop holds the steady state of the solver"""
+        s = simulate(self.c, q=2300, curve=DirectOnLine(), duration=5, elements=40, running=True)
+        np.testing.assert_allclose(s.drive_force[0], self.r.f_u, rtol=1e-3)
+        np.testing.assert_allclose(s.t_2[0], self.r.t_2, rtol=1e-3)
+        np.testing.assert_allclose(s.t_1[0], self.r.t_1, rtol=2e-3)
+        np.testing.assert_allclose(s.speed[0], self.c.v, rtol=1e-3)
+        self.assertTrue(np.isnan(s.t_speed[0]))
+
+    def test_start(self):
+        s = simulate(self.c, q=2300, curve=VariableSpeed(t_ramp=20), duration=40, elements=40)
+        self.assertEqual(s.speed.shape, (1, len(s.time)))
+        self.assertAlmostEqual(s.time[1], 0.1, 2)
+        self.assertEqual(s.speed[0, 0], 0)
+        self.assertGreater(s.t_speed[0], 15)
+        self.assertLess(s.t_speed[0], 25)
+        self.assertAlmostEqual(s.drive_force[0, -1], self.r.f_u, delta=0.01 * self.r.f_u)
+        self.assertGreater(s.peak_t_1[0], self.r.t_1)
+        self.assertAlmostEqual(s.peak_torque[0], s.peak_drive_force[0] * self.c.D_d / 2)
+        self.assertFalse(s.slipped[0])
+        self.assertLess(s.max_ratio[0], s.ratio_limit[0])
+
+    def test_slip(self):
+        """Starting harder than the capstan limit slips the belt, softer starts do not"""
+        fleet = ConveyorFleet.from_conveyances([self.c] * 3)
+        hard = simulate(fleet, q=2300, curve=DirectOnLine(ratio=3.0), duration=10, elements=40)
+        self.assertTrue(hard.slipped.all())
+        np.testing.assert_allclose(hard.max_ratio, hard.ratio_limit)
+
+        soft = simulate(fleet, q=2300, curve=SoftStart(t_ramp=np.array([2.0, 5.0, 10.0])), duration=10, elements=40)
+        self.assertFalse(soft.slipped.any())
+        self.assertTrue((soft.peak_t_1 < hard.peak_t_1).all())
+        # A longer ramp is gentler
+        self.assertTrue((np.diff(soft.peak_drive_force) <= 0).all())
+
+    def test_stop(self):
+        s = simulate(self.c, q=2300, duration=30, elements=40, running=True)
+        self.assertTrue(np.isfinite(s.t_speed[0]))
+        self.assertTrue((s.drive_force[0, 1:] == 0).all())
+        coast = simulate(self.c, q=2300, curve=Coast(), duration=30, elements=40, running=True)
+        self.assertEqual(coast.t_speed[0], s.t_speed[0])
+
+    def test_workers(self):
+        """Results do not depend on how the scenarios are spread across processes"""
+        fleet = ConveyorFleet.from_conveyances([self.c] * 3)
+        fleet.v = [3.0, 4.0, 5.0]
+        curve = SoftStart(t_ramp=np.array([1.0, 2.0, 3.0]))
+        one = simulate(fleet, q=[1000, 2000, 2300], H=[0, 5, 10], curve=curve, duration=5, elements=20, workers=1)
+        two = simulate(fleet, q=[1000, 2000, 2300], H=[0, 5, 10], curve=curve, duration=5, elements=20, workers=2)
+        for a, b in zip(one, two):
+            np.testing.assert_array_equal(a, b)
+
+    def test_unpicklable_curve(self):
+        """Curves that cannot be sent to the workers are run in this process"""
+        fleet = ConveyorFleet.from_conveyances([self.c] * 2)
+        ratio = 1.5
+
+        def curve(t, v, v_rated, f_u):
+            return np.minimum(ratio * f_u, f_u * (v_rated - v) / (0.02 * v_rated) + f_u)
+
+        s = simulate(fleet, q=2300, curve=curve, duration=2, elements=20, workers=2)
+        one = simulate(fleet, q=2300, curve=lambda *args: curve(*args), duration=2, elements=20, workers=1)
+        np.testing.assert_array_equal(s.speed, one.speed)
+        self.assertGreater(s.speed[0, -1], 0)
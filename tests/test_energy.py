@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, energy, solver
+
+
+class TestEnergy(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.tmp = tempfile.mkdtemp()
+
+        # A year of hourly throughput, idle a third of the time
+        rng = np.random.default_rng(0)
+        self.q = np.where(rng.random(8760) < 1 / 3, 0, rng.uniform(500, 2500, 8760))
+        self.t = np.arange(8760) * 3600.0
+        self.csv = os.path.join(self.tmp, 'hourly.csv')
+        np.savetxt(self.csv, np.column_stack((self.t, self.q)), delimiter=',', header='t,q', comments='')
+        self.npy = os.path.join(self.tmp, 'hourly.npy')
+        np.save(self.npy, self.q)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_hourly_csv(self):
+        p_a = solver.solve_batch(self.c, q=self.q).p_a
+        rollup = energy.series_energy([self.c], [self.csv], chunk_size=1000)[0]
+        self.assertEqual(rollup.samples, 8760)
+        self.assertAlmostEqual(rollup.hours, 8760, 6)
+        self.assertAlmostEqual(rollup.running_hours, 8760, 6)
+        self.assertAlmostEqual(rollup.loaded_hours, np.count_nonzero(self.q), 6)
+        self.assertAlmostEqual(rollup.tonnes, self.q.sum(), 4)
+        self.assertAlmostEqual(rollup.kwh, p_a.sum() / 1000, 4)
+        self.assertAlmostEqual(rollup.kwh_per_t, rollup.kwh / rollup.tonnes, 12)
+        self.assertAlmostEqual(rollup.peak_kw, p_a.max() / 1000, 6)
+
+    def test_chunking(self):
+        """Results do not depend on how the series is split into chunks"""
+        whole = energy.series_energy([self.c], [self.csv])[0]
+        chunked = energy.series_energy([self.c], [self.csv], chunk_size=7)[0]
+        np.testing.assert_allclose(chunked, whole, rtol=1e-12)
+
+    def test_fixed_interval(self):
+        """A q-only binary series with a fixed interval matches the timed CSV series"""
+        timed = energy.series_energy([self.c], [self.csv])[0]
+        fixed = energy.series_energy([self.c], [self.npy], dt=3600, chunk_size=999)[0]
+        np.testing.assert_allclose(fixed, timed, rtol=1e-12)
+        with self.assertRaises(ValueError):
+            energy.series_energy([self.c], [self.npy])
+
+    def test_idle_stop(self):
+        run = energy.series_energy([self.c], [self.csv])[0]
+        stop = energy.series_energy([self.c], [self.csv], idle='stop')[0]
+        self.assertAlmostEqual(stop.running_hours, stop.loaded_hours, 6)
+        self.assertEqual(stop.tonnes, run.tonnes)
+        idle_kwh = self.c.surrogate().p_a(0) / 1000 * (run.hours - run.loaded_hours)
+        self.assertAlmostEqual(run.kwh - stop.kwh, idle_kwh, 4)
+
+    def test_irregular_series(self):
+        acc = energy.EnergyAccumulator(self.c)
+        acc.update([[0, 1000], [60, np.nan], [90, 2000]])
+        acc.update([[150, 0]])
+        rollup = acc.result()
+        p_a = self.c.surrogate().p_a
+        self.assertEqual(rollup.samples, 3)
+        self.assertAlmostEqual(rollup.hours, 180 / 3600, 12)
+        self.assertAlmostEqual(rollup.tonnes, (1000 * 60 + 2000 * 60) / 3600, 9)
+        self.assertAlmostEqual(rollup.kwh, (p_a(1000) * 60 + p_a(2000) * 60 + p_a(0) * 60) / 3.6e6, 9)
+
+    def test_fleet_workers(self):
+        other = conveyance.Conveyance(file_path=self.file_path)
+        other.v = 5
+        designs = [self.c, other, self.c]
+        paths = [self.csv, self.csv, self.npy]
+        serial = energy.series_energy(designs, paths, H=[0, 10, 0], dt=3600, workers=1)
+        parallel = energy.series_energy(designs, paths, H=[0, 10, 0], dt=3600, workers=2)
+        self.assertEqual(serial, parallel)
+        self.assertNotEqual(serial[0].kwh, serial[1].kwh)
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from conveyance import conveyance, executor, solver
+from conveyance.executor import SharedMemoryExecutor
+from conveyance.fleet import ConveyorFleet
+
+
+class TestSharedMemoryExecutor(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        c = conveyance.Conveyance(file_path=self.file_path)
+        n = 10000
+        self.fleet = ConveyorFleet(np.repeat(ConveyorFleet.from_conveyances([c]).data, n, axis=1))
+        self.fleet.v = np.linspace(2.0, 6.0, n)
+        self.q = np.linspace(500.0, 3000.0, n)
+
+    def test_solve(self):
+        """Results match the batch solver exactly, whatever the number of workers"""
+        expected = solver.solve_batch(self.fleet, q=self.q, H=5)
+        for workers in (1, 2, 3):
+            with SharedMemoryExecutor(workers=workers, chunk_size=1024) as executor:
+                result = executor.solve(self.fleet, q=self.q, H=5)
+            for field, x, y in zip(solver.DesignResult._fields, result, expected):
+                np.testing.assert_array_equal(x, y, err_msg='{} with {} workers'.format(field, workers))
+
+    @unittest.skipIf(sys.version_info < (3, 8), 'multiprocessing.shared_memory needs Python 3.8')
+    def test_fields(self):
+        with SharedMemoryExecutor(workers=2, chunk_size=1024) as executor:
+            result = executor.solve(self.fleet, q=2300)
+            self.assertEqual(result.t_2.shape, (10000,))
+
+            # Smaller jobs reuse the blocks
+            names = [block.name for block in executor._blocks]
+            result = executor.solve(self.fleet[np.arange(5000)], q=2300, fields=('p_a', 't_1'))
+            self.assertEqual([block.name for block in executor._blocks], names)
+            self.assertIsNone(result.f_u)
+            np.testing.assert_array_equal(result.p_a, solver.solve_batch(self.fleet[np.arange(5000)], q=2300).p_a)
+
+    def test_in_process_before_python_3_8(self):
+        with mock.patch.object(executor.sys, 'version_info', (3, 7, 0)):
+            with SharedMemoryExecutor(workers=2, chunk_size=1024) as e:
+                self.assertEqual(e.workers, 1)
+                result = e.solve(self.fleet, q=2300)
+                self.assertEqual(e._blocks, [])
+        np.testing.assert_array_equal(result.t_1, solver.solve_batch(self.fleet, q=2300).t_1)
+
+    @unittest.skipIf(sys.version_info < (3, 8), 'multiprocessing.shared_memory needs Python 3.8')
+    def test_close(self):
+        from multiprocessing import shared_memory
+
+        executor = SharedMemoryExecutor(workers=2, chunk_size=1024)
+        executor.solve(self.fleet, q=2300)
+        names = [block.name for block in executor._blocks]
+        self.assertEqual(len(names), 2)
+        executor.close()
+        self.assertTrue(executor.closed)
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+        with self.assertRaises(ValueError):
+            executor.solve(self.fleet, q=2300)
+        executor.close()
@@ -0,0 +1,97 @@
+import os
+import glob
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, fleet
+
+
+class TestConveyorFleet(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.fleet = fleet.ConveyorFleet.from_conveyances([self.c] * 10)
+        self.fleet.v = np.linspace(2, 6.5, 10)
+
+    def test_columns_are_views(self):
+        """Columns share memory with the parameter block"""
+        self.assertEqual(len(self.fleet), 10)
+        self.assertTrue(np.shares_memory(self.fleet.v, self.fleet.data))
+        self.assertTrue(self.fleet.v.flags['C_CONTIGUOUS'])
+        self.assertEqual(self.fleet.nbytes / len(self.fleet), 8 * len(fleet.FIELDS))
+        self.assertEqual(self.fleet.B[3], self.c.B)
+
+    def test_slicing_and_filtering(self):
+        sub = self.fleet[2:5]
+        self.assertEqual(len(sub), 3)
+        self.assertTrue(np.shares_memory(sub.v, self.fleet.data))
+        fast = self.fleet[self.fleet.v > 4]
+        self.assertEqual(len(fast), 5)
+        self.assertTrue((fast.v > 4).all())
+
+    def test_row_round_trip(self):
+        c = self.fleet[0]
+        self.assertIsInstance(c, conveyance.Conveyance)
+        self.assertEqual(c.v, 2)
+        self.assertEqual(c.c_l, self.c.c_l)
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(AttributeError):
+            self.fleet.speed = 4.8
+        with self.assertRaises(AttributeError):
+            self.fleet.speed
+
+    def test_pickle(self):
+        copy = pickle.loads(pickle.dumps(self.fleet))
+        np.testing.assert_array_equal(copy.data, self.fleet.data)
+
+    def test_solve(self):
+        """Solving the fleet matches solving each design"""
+        r = self.fleet.solve(q=2300)
+        self.assertEqual(r.p_a.shape, (10,))
+        for i, c in enumerate(self.fleet):
+            self.assertAlmostEqual(r.p_a[i], c.solve(q=2300).p_a, 6)
+
+
+class TestLoading(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        with open(os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')) as stream:
+            text = stream.read()
+        self.paths = []
+        for i, v in enumerate([3.0, 4.0, 4.8, 5.5, 6.0]):
+            path = os.path.join(self.tmp.name, 'site_{}.yaml'.format(i))
+            with open(path, 'w') as stream:
+                stream.write(text.replace('v: 4.8', 'v: {}'.format(v)))
+            self.paths.append(path)
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+
+    def cache_entries(self):
+        return glob.glob(os.path.join(self.cache_dir, '**', '*.json'), recursive=True)
+
+    def test_load_many(self):
+        designs = conveyance.Conveyance.load_many(self.paths, workers=2)
+        self.assertEqual([c.v for c in designs], [3.0, 4.0, 4.8, 5.5, 6.0])
+        expected = conveyance.Conveyance(self.paths[2])
+        self.assertEqual(vars(designs[2]), vars(expected))
+
+    def test_parsed_cache(self):
+        """Only new or changed files are added to the cache"""
+        conveyance.Conveyance.load_many(self.paths, workers=1, cache_dir=self.cache_dir)
+        self.assertEqual(len(self.cache_entries()), 5)
+
+        with open(self.paths[0], 'a') as stream:
+            stream.write('# changed\n')
+        designs = conveyance.Conveyance.load_many(self.paths, workers=1, cache_dir=self.cache_dir)
+        self.assertEqual(len(self.cache_entries()), 6)
+        self.assertEqual(designs[0].v, 3.0)
+
+    def test_from_yaml_dir(self):
+        f = fleet.ConveyorFleet.from_yaml_dir(self.tmp.name, cache_dir=self.cache_dir)
+        np.testing.assert_array_equal(f.v, [3.0, 4.0, 4.8, 5.5, 6.0])
+        cached = fleet.ConveyorFleet.from_yaml_dir(self.tmp.name, cache_dir=self.cache_dir)
+        np.testing.assert_array_equal(cached.data, f.data)
@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, fleetfile, solver
+from conveyance.fleet import FIELDS, ConveyorFleet
+
+
+class TestFleetFile(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.fleet = ConveyorFleet.from_conveyances([self.c] * 5)
+        self.fleet.v = np.linspace(4.0, 6.0, 5)
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'fleet.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_round_trip(self):
+        results = self.fleet.solve(q=2300, H=5)
+        fleetfile.save(self.path, self.fleet, results=results, fields=('p_a', 't_1', 't_2'))
+
+        f = fleetfile.open_fleet(self.path)
+        self.assertEqual(f.header['n'], 5)
+        self.assertEqual([field['name'] for field in f.header['fields']], list(FIELDS))
+        self.assertEqual(f.header['fields'][FIELDS.index('v')]['units'], 'm/s')
+        np.testing.assert_array_equal(f.fleet.data, self.fleet.data)
+        np.testing.assert_array_equal(f.results.t_1, results.t_1)
+        self.assertIsNone(f.results.f_u)
+
+        # Columns are read-only views of the mapped file, fed directly to the calculations
+        self.assertIsInstance(f.fleet.data.base, np.memmap)
+        self.assertFalse(f.fleet.data.flags.writeable)
+        np.testing.assert_array_equal(f.fleet.solve(q=2300, H=5).p_a, results.p_a)
+
+    def test_iso_results(self):
+        results = solver.solve_iso(self.fleet, q=2300, H=5)
+        fleetfile.save(self.path, self.fleet, results=results)
+        f = fleetfile.open_fleet(self.path)
+        self.assertEqual(f.header['results'], list(solver.DesignResult._fields))
+        for name in solver.DesignResult._fields:
+            np.testing.assert_array_equal(getattr(f.results, name), getattr(results, name), err_msg=name)
+
+    def test_create(self):
+        f = fleetfile.create(self.path, 5, results=('p_a',))
+        f.fleet.data[:] = self.fleet.data
+        f.results.p_a[:] = self.fleet.solve(q=2300).p_a
+        del f
+
+        f = fleetfile.open_fleet(self.path)
+        np.testing.assert_array_equal(f.fleet.v, self.fleet.v)
+        self.assertAlmostEqual(f.fleet[0].solve(q=2300).p_a, f.results.p_a[0], 6)
+        with self.assertRaises(ValueError):
+            fleetfile.create(self.path, 5, results=('power',))
+
+    def test_other_fields(self):
+        """Files with parameters in another order are read by name"""
+        fleetfile.save(self.path, self.fleet)
+        with open(self.path, 'rb') as stream:
+            raw = stream.read()
+        _, _, length = fleetfile._PREAMBLE.unpack(raw[:fleetfile._PREAMBLE.size])
+        header = json.loads(raw[fleetfile._PREAMBLE.size:fleetfile._PREAMBLE.size + length].decode())
+        header['fields'].reverse()
+        values = self.fleet.data[::-1].astype('<f8').tobytes()
+        text = json.dumps(header).encode()
+        with open(self.path, 'wb') as stream:
+            stream.write(fleetfile._PREAMBLE.pack(fleetfile.MAGIC, fleetfile.FORMAT_VERSION, len(text)))
+            stream.write(text.ljust(fleetfile._offset(len(text)) - fleetfile._PREAMBLE.size))
+            stream.write(values)
+        np.testing.assert_array_equal(fleetfile.open_fleet(self.path).fleet.data, self.fleet.data)
+
+        with open(self.path, 'wb') as stream:
+            stream.write(b'not a fleet file')
+        with self.assertRaises(ValueError):
+            fleetfile.open_fleet(self.path)
+
+    def test_yaml(self):
+        fleetfile.from_yaml([self.file_path] * 3, self.path, workers=1)
+        f = fleetfile.open_fleet(self.path)
+        self.assertEqual(len(f.fleet), 3)
+        self.assertIsNone(f.results)
+
+        paths = fleetfile.to_yaml(self.path, self.tmp, indices=[1])
+        self.assertEqual(paths, [os.path.join(self.tmp, 'design_0000001.yaml')])
+        copy = conveyance.Conveyance(file_path=paths[0])
+        self.assertEqual(vars(copy), vars(self.c))
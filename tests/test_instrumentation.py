@@ -0,0 +1,59 @@
+import json
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import belt_capacity, conveyance, instrumentation, solver
+from conveyance.fleet import ConveyorFleet
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.registry = instrumentation.Registry()
+
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_disabled(self):
+        """While disabled the original functions are in place"""
+        original = solver._capacity
+        instrumentation.enable(self.registry)
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertIsNot(solver._capacity, original)
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertIs(solver._capacity, original)
+        solver.solve(conveyance.Conveyance(file_path=self.file_path), q=2300)
+        self.assertEqual(self.registry.snapshot(), {})
+
+    def test_stages(self):
+        with instrumentation.instrumented(self.registry):
+            fleet = ConveyorFleet.from_yaml([self.file_path] * 3, workers=1)
+            result = fleet.solve(q=np.full(3, 2300.0))
+            solver.solve(fleet[0], q=2300)
+            belt_capacity.belt_cs_area(l3=fleet[0].l3, b=fleet[0].b, ia=fleet[0].ia, sa=fleet[0].sa)
+        self.assertAlmostEqual(result.p_a[0] / 1000, 68.93, 2)
+
+        stages = self.registry.snapshot()
+        self.assertEqual(stages['load'], dict(stages['load'], calls=1, elements=3))
+        self.assertEqual(stages['parse']['calls'], 3)
+        self.assertEqual(stages['capacity']['calls'], 3)
+        self.assertEqual(stages['capacity']['elements'], 5)
+        for name in ('main', 'secondary', 'concentrated', 'gravity', 'wrap', 'power'):
+            self.assertEqual((stages[name]['calls'], stages[name]['elements']), (2, 4))
+        self.assertEqual(stages['tensions']['calls'], 4)
+        self.assertGreater(stages['load']['seconds'], stages['parse']['seconds'] / 2)
+
+    def test_export(self):
+        self.registry.record('capacity', 0.5, elements=100)
+        self.registry.record('capacity', 0.25, elements=100)
+        self.assertEqual(json.loads(self.registry.to_json()),
+                         {'stages': {'capacity': {'calls': 2, 'seconds': 0.75, 'elements': 200}}})
+        text = self.registry.to_prometheus()
+        self.assertIn('# TYPE conveyance_stage_seconds_total counter', text)
+        self.assertIn('conveyance_stage_calls_total{stage="capacity"} 2\n', text)
+        self.assertIn('conveyance_stage_elements_total{stage="capacity"} 200\n', text)
+        self.registry.reset()
+        self.assertEqual(self.registry.snapshot(), {})
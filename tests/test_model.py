@@ -0,0 +1,46 @@
+import os
+import unittest
+
+from conveyance import conveyance, model
+
+
+class TestDesignModel(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.m = model.DesignModel(self.c, q=2300)
+
+    def test_matches_solve(self):
+        expected = self.c.solve(q=2300)
+        for name, value in expected._asdict().items():
+            self.assertAlmostEqual(getattr(self.m, name), value, 8, msg=name)
+        self.assertAlmostEqual(self.m.p_a / 1000, 68.93, 2)
+
+    def test_invalidates_downstream_only(self):
+        self.m.result()
+        self.m.mu_b = 0.35
+        self.assertTrue(self.m.is_stale('t_1'))
+        self.assertTrue(self.m.is_stale('t_2'))
+        self.assertFalse(self.m.is_stale('f_u'))
+        self.assertFalse(self.m.is_stale('p_a'))
+
+        self.m.a_o = 1.5
+        self.assertTrue(self.m.is_stale('q_ro'))
+        self.assertTrue(self.m.is_stale('f_bs_min_o'))
+        self.assertFalse(self.m.is_stale('q_m'))
+        self.assertFalse(self.m.is_stale('f_s'))
+
+    def test_recomputes_on_read(self):
+        self.m.p_a
+        self.m.v = 5.5
+        self.c.v = 5.5
+        self.assertAlmostEqual(self.m.p_a, self.c.solve(q=2300).p_a, 8)
+        self.m.q = 0
+        self.assertEqual(self.m.q_m, 0)
+        self.assertAlmostEqual(self.m.f_u, self.c.solve(q=0).f_u, 8)
+
+    def test_unknown_input(self):
+        with self.assertRaises(AttributeError):
+            self.m.f_u = 1000
+        with self.assertRaises(AttributeError):
+            self.m.unknown
@@ -0,0 +1,63 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, montecarlo
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.distributions = {
+            'ff': ('normal', 0.02, 0.002),
+            'mu_b': ('triangular', 0.25, 0.3, 0.35),
+            'd_eta_2': ('uniform', 0.95, 0.98),
+        }
+
+    def test_streaming_quantiles(self):
+        rng = np.random.default_rng(1)
+        x = rng.lognormal(0, 0.5, 200000)
+        estimator = montecarlo.StreamingQuantiles.from_sample(x[:1000])
+        for chunk in np.array_split(x, 7):
+            estimator.update(chunk)
+        resolution = (estimator.hi - estimator.lo) / 8192
+        levels = [0.01, 0.5, 0.9, 0.99]
+        np.testing.assert_allclose(estimator.quantile(levels), np.quantile(x, levels), atol=2 * resolution)
+        self.assertEqual(estimator.n, x.size)
+        self.assertEqual(estimator.max, x.max())
+
+    def test_matches_exact_quantiles(self):
+        """With one chunk the estimates agree with the exact sample quantiles"""
+        n = 20000
+        summary = montecarlo.monte_carlo(self.c, q=2300, distributions=self.distributions, n_samples=n,
+                                         chunk_size=n, seed=7, fields=['p_a'])
+        params = dict(vars(self.c))
+        seed = np.random.SeedSequence(7).spawn(1)[0]
+        p_a, = montecarlo._evaluate_chunk(params, self.distributions, 2300, 0, False, ['p_a'], seed, n)
+        self.assertEqual(summary['p_a'].n, n)
+        self.assertAlmostEqual(summary['p_a'].mean, p_a.mean(), 6)
+        for level, value in summary['p_a'].quantiles.items():
+            self.assertAlmostEqual(value / 1000, np.quantile(p_a, level) / 1000, 1)
+        self.assertAlmostEqual(summary['p_a'].quantiles[0.5] / 1000, 68.93, 0)
+
+    def test_reproducible_across_workers(self):
+        kwargs = dict(q=2300, distributions=self.distributions, n_samples=50000, chunk_size=8192, seed=42)
+        serial = montecarlo.monte_carlo(self.c, workers=1, **kwargs)
+        parallel = montecarlo.monte_carlo(self.c, workers=2, **kwargs)
+        self.assertEqual(serial, parallel)
+        self.assertLess(serial['t_1'].quantiles[0.5], serial['t_1'].quantiles[0.99])
+
+    def test_iso(self):
+        summary = montecarlo.monte_carlo(self.c, q=2300, distributions={'ff': ('normal', 0.02, 0.002)},
+                                         n_samples=1000, seed=3, iso=True, fields=['f_u'])
+        self.assertAlmostEqual(summary['f_u'].quantiles[0.5], 12805, -2)
+
+    def test_no_samples(self):
+        with self.assertRaises(ValueError):
+            montecarlo.monte_carlo(self.c, q=2300, distributions=self.distributions, n_samples=0)
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            montecarlo.monte_carlo(self.c, 2300, {'speed': ('normal', 4.0, 0.1)}, 1000)
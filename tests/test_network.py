@@ -0,0 +1,67 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, network, solver
+
+
+class TestNetwork(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_network.yaml')
+        self.net = network.ConveyorNetwork.from_yaml(self.file_path, workers=1)
+        self.c = conveyance.Conveyance(file_path=os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml'))
+
+    def throughput(self):
+        return dict(zip(self.net.ids, self.net.throughput()))
+
+    def test_throughput(self):
+        q = self.throughput()
+        self.assertEqual(self.net.ids, ('CV01', 'CV02', 'CV03', 'CV04', 'CV05', 'CV06'))
+        self.assertAlmostEqual(q['CV03'], 2000)
+        self.assertAlmostEqual(q['CV04'], 1200)
+        self.assertAlmostEqual(q['CV05'], 800)
+        self.assertAlmostEqual(q['CV06'], 800)
+
+    def test_solve(self):
+        result = self.net.solve()
+        cv03 = self.net.ids.index('CV03')
+        expected = self.c.solve(q=2000, H=8)
+        for name in ('f_u', 'p_a', 't_1', 't_2'):
+            self.assertAlmostEqual(getattr(result, name)[cv03], getattr(expected, name), 6)
+
+    def test_dirty_subgraph(self):
+        """Changing a feed recalculates only the conveyors downstream of it"""
+        before = self.net.solve()
+        self.assertEqual(self.net.downstream('CV05'), ('CV05', 'CV06'))
+        self.net.set_feed('CV05', 100)
+        self.assertEqual([self.net.is_stale(i) for i in self.net.ids], [False] * 4 + [True] * 2)
+        after = self.net.solve()
+        self.assertFalse(self.net.is_stale('CV06'))
+        np.testing.assert_array_equal(after.p_a[:4], before.p_a[:4])
+        self.assertGreater(after.p_a[5], before.p_a[5])
+
+        # The updated results match solving the whole network afresh
+        self.net.set_feed('CV01', 1000)
+        fresh = network.ConveyorNetwork.from_yaml(self.file_path, workers=1)
+        fresh.set_feed('CV05', 100)
+        fresh.set_feed('CV01', 1000)
+        np.testing.assert_allclose(self.net.solve().t_1, fresh.solve().t_1, rtol=1e-12)
+
+    def test_scenarios(self):
+        feeds = {'CV01': np.linspace(0, 2000, 5), 'CV02': 500}
+        result = self.net.solve_scenarios(feeds)
+        self.assertEqual(result.p_a.shape, (6, 5))
+        for k in range(5):
+            self.net.set_feed('CV01', feeds['CV01'][k])
+            np.testing.assert_allclose(result.p_a[:, k], self.net.solve().p_a, rtol=1e-12)
+
+    def test_invalid(self):
+        designs = {'A': self.c, 'B': self.c}
+        with self.assertRaises(ValueError):
+            network.ConveyorNetwork(designs, transfers=[('A', 'B', 1), ('B', 'A', 1)])
+        with self.assertRaises(ValueError):
+            network.ConveyorNetwork(designs, transfers=[('A', 'B', 0.7), ('A', 'B', 0.7)])
+        with self.assertRaises(KeyError):
+            network.ConveyorNetwork(designs, transfers=[('A', 'C', 1)])
+        self.assertIsInstance(network.ConveyorNetwork(designs).solve(), solver.DesignResult)
@@ -0,0 +1,86 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, sizing, solver, vec
+from conveyance.optimise import optimise, optimise_many
+from conveyance.sweep import sweep
+
+
+class TestOptimise(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.widths = [0.8, 1.0, 1.2, 1.4, 1.6]
+
+    def capacity(self, design):
+        belt_ca = vec.belt_cs_area(l3=design.l3, b=design.b, ia=design.ia, sa=design.sa)
+        return 3600 * design.p * vec.volumetric_flow(belt_ca=belt_ca, v=design.v)
+
+    def test_least_power(self):
+        """The optimum matches the best feasible design of a fine grid"""
+        o = optimise(self.c, 2300, {'v': (2.0, 6.0), 'B': self.widths}, seed=0)
+        self.assertTrue(o.feasible)
+        self.assertEqual(sorted(o.params), ['B', 'b', 'v'])
+        self.assertAlmostEqual(o.params['b'], float(sizing.usable_width(o.params['B'])))
+        self.assertAlmostEqual(o.cost, solver.solve(o.design, q=2300).p_a, 6)
+        self.assertGreaterEqual(self.capacity(o.design), 2300 * (1 - 1e-9))
+        self.assertEqual(len(o.history), o.generations)
+
+        best = np.inf
+        for B in self.widths:
+            c = conveyance.Conveyance.from_parameters(dict(vars(self.c), B=B, b=float(sizing.usable_width(B))))
+            v = np.linspace(2.0, 6.0, 4001)
+            p_a = sweep(c, {'v': v}, q=2300, workers=1, fields=('p_a',)).values['p_a']
+            c.v = v
+            feasible = self.capacity(c) >= 2300
+            if feasible.any():
+                best = min(best, p_a[feasible].min())
+        self.assertLessEqual(o.cost, best * (1 + 1e-3))
+
+    def test_constraints(self):
+        pulleys = [{'D_d': 0.5, 'd_0_d': 0.12, 'm_p_d': 300}, {'D_d': 0.8, 'd_0_d': 0.2, 'm_p_d': 600}]
+        variables = {'v': (2.0, 6.0), 'B': self.widths, 'a_o': (0.6, 3.0), 'drive': pulleys}
+        o = optimise(self.c, 2300, variables, t_2=15000, t_max=40000, seed=1)
+        self.assertTrue(o.feasible)
+        self.assertIn(o.params['D_d'], (0.5, 0.8))
+        self.assertEqual(o.result.t_2, 15000)
+        self.assertLessEqual(o.result.t_1, 40000)
+        self.assertGreaterEqual(o.result.t_2, o.result.f_bs_min_o)
+        _, _, (ratio, limit, _) = vec.tension_transmit_min(f_u=o.result.f_u, wrap_a=self.c.wrap_a, mu_b=self.c.mu_b,
+                                                           t_2_min=o.result.t_2)
+        self.assertLessEqual(ratio, limit)
+
+        # No belt is strong enough
+        o = optimise(self.c, 2300, variables, t_max=1000, seed=1, generations=20)
+        self.assertFalse(o.feasible)
+        self.assertGreater(o.violation, 0)
+        self.assertTrue(np.isnan(o.history).all())
+
+    def test_cost(self):
+        """A user cost trades belt width against power"""
+        def cost(c, result):
+            return result.p_a + 1e6 * c.B
+
+        o = optimise(self.c, 2300, {'v': (2.0, 6.0), 'B': self.widths}, cost=cost, seed=2)
+        self.assertTrue(o.feasible)
+        narrowest = min(B for B in self.widths if self.capacity(conveyance.Conveyance.from_parameters(
+            dict(vars(self.c), B=B, b=float(sizing.usable_width(B)), v=6.0))) >= 2300)
+        self.assertEqual(o.params['B'], narrowest)
+        self.assertAlmostEqual(o.cost, o.result.p_a + narrowest * 1e6, 3)
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            optimise(self.c, 2300, {'speed': (2.0, 6.0)})
+        with self.assertRaises(ValueError):
+            optimise(self.c, 2300, {'drive': [{'D_d': 0.5, 'diameter': 0.12}, {'D_d': 0.8, 'diameter': 0.2}]})
+
+    def test_optimise_many(self):
+        variables = {'v': (2.0, 6.0), 'B': self.widths}
+        many = optimise_many([self.c, self.c], q=[1500, 2300], variables=variables, workers=1, seed=3)
+        self.assertEqual(len(many), 2)
+        self.assertTrue(all(o.feasible for o in many))
+        self.assertLess(many[0].cost, many[1].cost)
+        again = optimise_many([self.c, self.c], q=[1500, 2300], variables=variables, workers=2, seed=3)
+        self.assertEqual([o.params for o in again], [o.params for o in many])
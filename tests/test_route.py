@@ -0,0 +1,53 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, route
+
+
+class TestRoute(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+
+    def test_segments_sum_to_whole_conveyor(self):
+        """Splitting a straight conveyor into segments does not change its resistances"""
+        self.c.install_a = 4
+        r = route.Route(self.c, length=np.full(13, self.c.c_l / 13), install_a=4).solve(q=2300)
+        expected = self.c.solve(q=2300, H=self.c.c_l * np.sin(np.radians(4)))
+        self.assertAlmostEqual(r.f_h.sum(), expected.f_h, 6)
+        self.assertAlmostEqual(r.f_st.sum(), expected.f_st, 6)
+        self.assertAlmostEqual(r.f_n, expected.f_n, 6)
+        self.assertAlmostEqual(r.f_s, expected.f_s, 6)
+        self.assertAlmostEqual(r.f_u, expected.f_u, 6)
+        self.assertAlmostEqual(r.p_a, expected.p_a, 6)
+        self.assertAlmostEqual(r.f_carry.sum() + r.f_return.sum(), r.f_h.sum() + r.f_st.sum(), 6)
+
+    def test_tension_profile(self):
+        """The profile runs from T2 at the head, round the tail, to T1 at the head"""
+        x = np.linspace(0, 2000, 41)
+        z = np.concatenate((np.linspace(0, 60, 21), np.linspace(60, 20, 21)[1:]))
+        rt = route.Route.from_profile(self.c, x, z, a_u=np.where(x[1:] > 1000, 4.5, 3.0))
+        self.assertEqual(len(rt), 40)
+        self.assertAlmostEqual(rt.lift.sum(), 20, 8)
+
+        r = rt.solve(q=2300)
+        self.assertEqual(r.t_carry.shape, (41,))
+        self.assertAlmostEqual(r.t_return[-1], r.t_2, 8)
+        self.assertAlmostEqual(r.t_carry[-1], r.t_1, 8)
+        self.assertAlmostEqual(r.t_1 - r.t_2, r.f_u, 8)
+        self.assertAlmostEqual(r.t_carry[0], r.t_return[0] + r.f_n + r.f_s, 8)
+        self.assertTrue(r.sag_ok_o.all())
+        self.assertTrue(r.sag_ok_u.all())
+        # The slack-side tension is the least that satisfies every constraint
+        binding = np.concatenate((r.f_bs_min_o - np.minimum(r.t_carry[:-1], r.t_carry[1:]),
+                                  r.f_bs_min_u - np.minimum(r.t_return[:-1], r.t_return[1:])))
+        self.assertLessEqual(binding.max(), 1e-6)
+
+    def test_take_up_tension(self):
+        """A low take-up tension is flagged in the segments where the belt would sag"""
+        r = route.Route(self.c, length=np.full(10, 50.0), a_o=np.linspace(0.5, 3.0, 10)).solve(q=2300, t_2=5000)
+        self.assertEqual(r.t_2, 5000)
+        self.assertFalse(r.sag_ok_o.all())
+        self.assertTrue(r.sag_ok_o[0])
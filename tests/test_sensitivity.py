@@ -0,0 +1,77 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, sensitivity, solver
+from conveyance.fleet import FIELDS, ConveyorFleet
+
+
+class TestSensitivity(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+
+    def solve(self, name, x, q=2300, H=5):
+        params = dict(vars(self.c))
+        if name == 'q':
+            q = x
+        elif name == 'H':
+            H = x
+        else:
+            params[name] = x
+        r = solver.solve(conveyance.Conveyance.from_parameters(params), q=q, H=H)
+        return np.array([getattr(r, field) for field in sensitivity.OUTPUTS])
+
+    def test_finite_differences(self):
+        """Derivatives agree with central differences for every parameter"""
+        s = sensitivity.jacobian(self.c, q=2300, H=5)
+        self.assertEqual(s.wrt, FIELDS + ('q', 'H'))
+        self.assertEqual(s.jacobian.shape, (1, 4, len(FIELDS) + 2))
+        for j, name in enumerate(s.wrt):
+            x = s.inputs[0, j]
+            h = 1e-6 * max(abs(x), 1)
+            fd = (self.solve(name, x + h) - self.solve(name, x - h)) / (2 * h)
+            np.testing.assert_allclose(s.jacobian[0, :, j], fd, rtol=1e-5, atol=1e-4, err_msg=name)
+
+    def test_batch(self):
+        fleet = ConveyorFleet.from_conveyances([self.c] * 3)
+        fleet.v = [4.0, 5.0, 6.0]
+        q = np.array([1000.0, 2000.0, 3000.0])
+        s = sensitivity.jacobian(fleet, q=q, wrt=('v', 'q', 'a_o'), outputs=('p_a', 't_2'))
+        expected = solver.solve_batch(fleet, q=q)
+        np.testing.assert_allclose(s.values[:, 0], expected.p_a)
+        np.testing.assert_allclose(s.values[:, 1], expected.t_2)
+
+        dp_dq = (solver.solve_batch(fleet, q=q + 0.01).p_a - solver.solve_batch(fleet, q=q - 0.01).p_a) / 0.02
+        np.testing.assert_allclose(s.jacobian[:, 0, 1], dp_dq, rtol=1e-6)
+
+        # T2 follows the carry sag limit, linear in a_o, where that governs
+        sag = expected.t_2 == expected.f_bs_min_o
+        self.assertTrue(sag.any())
+        np.testing.assert_allclose(s.jacobian[sag, 1, 2], (expected.t_2 / fleet.a_o)[sag])
+
+        with self.assertRaises(ValueError):
+            sensitivity.jacobian(fleet, q=q, wrt=('speed',))
+
+    def test_ranking(self):
+        s = sensitivity.jacobian([self.c, self.c], q=[2000, 2300], H=5)
+        ranks = dict(sensitivity.ranking(s, 'p_a'))
+        self.assertAlmostEqual(ranks['d_eta_1'], 1.0)
+        self.assertGreater(ranks['bc_n'], 0)
+        self.assertEqual(ranks['m_p_t'], 0.0)
+        elasticity = sensitivity.elasticities(s)
+        np.testing.assert_allclose(elasticity[:, 1, s.wrt.index('d_eta_2')], -1.0)
+
+    def test_tornado(self):
+        bars = sensitivity.tornado(self.c, q=2300, H=5, wrt=('v', 'c_l', 'q', 'install_a'), delta=0.1)
+        self.assertEqual([bar.parameter for bar in bars][-1], 'install_a')
+        self.assertEqual(bars[-1].swing, 0)
+        swings = [bar.swing for bar in bars]
+        self.assertEqual(swings, sorted(swings, reverse=True))
+        q_bar = [bar for bar in bars if bar.parameter == 'q'][0]
+        self.assertAlmostEqual(q_bar.high, self.solve('q', 2530)[1], delta=0.01 * q_bar.swing)
+
+        chart = sensitivity.format_tornado(bars, width=10)
+        self.assertEqual(len(chart.splitlines()), 4)
+        self.assertTrue(chart.splitlines()[0].endswith('#' * 10 + '|' + '#' * 10))
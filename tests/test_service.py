@@ -0,0 +1,101 @@
+import asyncio
+import json
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, solver
+from conveyance.service import CalculationService
+
+
+async def request(reader, writer, method, path, payload=None):
+    """Send one HTTP/1.1 request on an open connection and read the JSON answer"""
+    body = b'' if payload is None else json.dumps(payload).encode()
+    writer.write('{} {} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {}\r\n\r\n'.format(
+        method, path, len(body)).encode() + body)
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode().partition(':')
+        headers[name.lower()] = value.strip()
+    return status, json.loads((await reader.readexactly(int(headers['content-length']))).decode())
+
+
+class TestCalculationService(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        fast = conveyance.Conveyance(file_path=self.file_path)
+        fast.v = 5.5
+        self.designs = {'cv01': self.c, 'cv02': fast}
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_micro_batching(self):
+        service = CalculationService(self.designs, H={'cv02': 5}, window=0.01)
+        q = np.linspace(1000, 2300, 20)
+
+        async def run():
+            return await asyncio.gather(*[service.solve('cv01' if i % 2 else 'cv02', q[i]) for i in range(20)])
+
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(service.metrics.batches, 1)
+        self.assertEqual(service.metrics.snapshot()['batch_size']['max'], 20)
+        expected = solver.solve_batch([self.designs['cv01' if i % 2 else 'cv02'] for i in range(20)], q=q,
+                                      H=[0 if i % 2 else 5 for i in range(20)])
+        np.testing.assert_allclose([r['p_a'] for r in results], expected.p_a)
+        np.testing.assert_allclose([r['t_2'] for r in results], expected.t_2)
+
+    def test_max_batch(self):
+        service = CalculationService(self.designs, window=10, max_batch=5)
+
+        async def run():
+            tasks = [asyncio.ensure_future(service.solve('cv01', 2300)) for _ in range(12)]
+            await asyncio.sleep(0)
+            await service.close()  # Answers the last partial batch without waiting for the window
+            return await asyncio.gather(*tasks)
+
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(len(results), 12)
+        self.assertEqual(list(service.metrics._batch_sizes), [5, 5, 2])
+
+    def test_http(self):
+        service = CalculationService(self.designs)
+
+        async def run():
+            port = await service.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            answers = [
+                await request(reader, writer, 'POST', '/solve', {'design': 'cv01', 'q': 2300}),
+                await request(reader, writer, 'POST', '/solve', [{'design': 'cv01', 'q': 2300}, {'design': 'cv02', 'q': 0, 'H': 1}]),
+                await request(reader, writer, 'GET', '/designs'),
+                await request(reader, writer, 'POST', '/solve', {'design': 'cv03', 'q': 2300}),
+                await request(reader, writer, 'POST', '/solve', {'q': 2300}),
+                await request(reader, writer, 'GET', '/solve'),
+                await request(reader, writer, 'GET', '/metrics'),
+            ]
+            writer.close()
+            await service.close()
+            return answers
+
+        single, many, designs, unknown, invalid, method, metrics = self.loop.run_until_complete(run())
+        self.assertEqual(single[0], 200)
+        self.assertAlmostEqual(single[1]['p_a'] / 1000, 68.93, 2)
+        self.assertAlmostEqual(single[1]['t_1'], 35237.40, 2)
+        self.assertEqual(many[0], 200)
+        self.assertEqual(many[1][0], single[1])
+        self.assertEqual(many[1][1]['q_m'], 0)
+        self.assertEqual(designs, (200, ['cv01', 'cv02']))
+        self.assertEqual([unknown[0], invalid[0], method[0]], [404, 400, 405])
+
+        status, snapshot = metrics
+        self.assertEqual(snapshot['requests'], 6)
+        self.assertEqual(snapshot['items'], 3)
+        self.assertGreater(snapshot['latency_ms']['p99'], 0)
+        self.assertLessEqual(snapshot['latency_ms']['p50'], snapshot['latency_ms']['p99'])
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+
+from conveyance import belt_capacity, sizing
+
+
+class TestSizing(unittest.TestCase):
+    def test_material_width_inverts_cs_area(self):
+        b = np.linspace(0.5, 2.8, 50)
+        ia = np.array([[20], [35], [45]])
+        s = belt_capacity.belt_cs_area(l3=0.436, b=1.03, ia=45, sa=20)
+        np.testing.assert_allclose(sizing.material_width(s, l3=0.436, ia=45, sa=20), 1.03, rtol=1e-12)
+
+        areas = np.vectorize(belt_capacity.belt_cs_area)(l3=0.436, b=b, ia=ia, sa=20)
+        np.testing.assert_allclose(sizing.material_width(areas, l3=0.436, ia=ia, sa=20), np.broadcast_to(b, (3, 50)),
+                                   rtol=1e-12)
+
+    def test_belt_width(self):
+        np.testing.assert_allclose(sizing.belt_width([1.03, 1.75, 2.25]), [1.2, 2.0, 2.5])
+        np.testing.assert_allclose(sizing.usable_width([1.2, 2.0, 2.5]), [1.03, 1.75, 2.25])
+
+    def test_min_belt_width(self):
+        """The flat conveyor belt is the smallest one carrying its theoretical capacity"""
+        q = 0.180 * 4.8 * 0.85 * 3600  # t/h
+        b, B = sizing.min_belt_width(q=q, v=4.8, p=0.85, l3=0.436, ia=45, sa=20)
+        self.assertAlmostEqual(float(b), 1.03, 2)
+        self.assertAlmostEqual(float(B), 1.2, 2)
+
+    def test_min_belt_width_snapped(self):
+        q = np.array([500, 1500, 2300, 4000, 1e6])
+        b, B = sizing.min_belt_width(q=q, v=4.8, p=0.85, l3=0.436, ia=45, sa=20, widths=sizing.STANDARD_WIDTHS)
+        np.testing.assert_array_equal(B[:4], [0.8, 1.0, 1.2, 1.6])
+        self.assertTrue(np.isnan(B[4]))
+        s = np.vectorize(belt_capacity.belt_cs_area)(l3=0.436, b=b[:4], ia=45, sa=20)
+        self.assertTrue((s * 4.8 * 0.85 * 3600 >= q[:4]).all())
+
+    def test_min_belt_speed(self):
+        v = sizing.min_belt_speed(q=[1000, 2300], b=1.03, p=0.85, l3=0.436, ia=45, sa=20)
+        s = belt_capacity.belt_cs_area(l3=0.436, b=1.03, ia=45, sa=20)
+        np.testing.assert_allclose(s * v * 0.85 * 3600, [1000, 2300], rtol=1e-12)
@@ -0,0 +1,79 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, solver, vec
+
+
+class TestSolver(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+
+    def test_solve_flat_conveyor(self):
+        """The single pass chain reproduces the hand-chained flat conveyor design"""
+        r = self.c.solve(q=2300)
+        self.assertAlmostEqual(r.q_m, 133.1, 1)
+        self.assertAlmostEqual(r.q_ro, 12.92, 2)
+        self.assertAlmostEqual(r.q_ru, 4.40, 2)
+        self.assertAlmostEqual(r.f_h, 5142.73, 2)
+        self.assertAlmostEqual(r.f_n, 6177.05, 2)
+        self.assertAlmostEqual(r.f_s, 1912.54, 2)
+        self.assertAlmostEqual(r.f_st, 0, 0)
+        self.assertAlmostEqual(r.f_u, 13232.32, 2)
+        self.assertAlmostEqual(r.p_a / 1000, 68.93, 2)
+        self.assertAlmostEqual(r.f_bs_min_o, 22005, 0)
+        self.assertAlmostEqual(r.f_bs_min_u, 3024, 0)
+        # Slack side is governed by belt sag on the carry side
+        self.assertAlmostEqual(r.t_1, 35237.40, 2)
+        self.assertAlmostEqual(r.t_2, 22005.08, 2)
+
+    def test_solve_batch_matches_solve(self):
+        """Batches of designs and throughputs match the single design solve"""
+        q = np.array([0, 800, 2300, 3100])
+        H = np.array([0, 5, -2, 12])
+        designs = [self.c] * 4
+        batch = solver.solve_batch(designs, q=q, H=H)
+        for i in range(4):
+            single = self.c.solve(q=q[i], H=H[i])
+            for name, value in single._asdict().items():
+                self.assertAlmostEqual(getattr(batch, name)[i], value, 8, msg=name)
+
+    def test_solve_batch_columns(self):
+        """Parameter columns broadcast against the throughput"""
+        columns = dict(vars(self.c))
+        columns['v'] = [3.0, 4.8, 6.0]
+        batch = solver.solve_batch(columns, q=np.array([[1000], [2300]]))
+        self.assertEqual(batch.p_a.shape, (2, 3))
+        self.assertAlmostEqual(batch.p_a[1, 1] / 1000, 68.93, 2)
+
+    def test_solve_iso_first_iteration(self):
+        """A single iteration reproduces the hand-chained ISO 5048 recalculation"""
+        r = solver.solve_iso(self.c, q=2300, max_iter=1)
+        self.assertEqual(r.iterations, 1)
+        self.assertFalse(r.converged)
+        self.assertAlmostEqual(r.f_1t_d, 153, 0)
+        self.assertAlmostEqual(r.f_1t_t, 141, 0)
+        self.assertAlmostEqual(r.f_n, 5751, 0)
+        self.assertAlmostEqual(r.f_u, 12806, 0)
+
+    def test_solve_iso_converged(self):
+        """Converged wrap resistances are consistent with the tensions they produce"""
+        q = np.array([500, 1500, 2300, 3500])
+        r = solver.solve_iso([self.c] * 4, q=q, tol=1e-9)
+        self.assertTrue(r.converged.all())
+        self.assertTrue((r.residual <= 1e-9).all())
+        for i in range(4):
+            f_1t_d = vec.resistance_belt_wrap_iso(B=self.c.B, d=self.c.d, D=self.c.D_d, d_0=self.c.d_0_d,
+                                                  m_p=self.c.m_p_d, t_1=r.t_1[i], t_2=r.t_2[i])
+            self.assertAlmostEqual(r.f_1t_d[i], f_1t_d, 6)
+            self.assertAlmostEqual(r.t_1[i] - r.t_2[i], r.f_u[i], 6)
+        self.assertAlmostEqual(r.p_a[2] / 1000, 66.71, 1)
+
+    def test_solve_iso_max_iter(self):
+        """Designs that do not converge report their residual"""
+        r = solver.solve_iso(self.c, q=[1000, 2300], tol=0, max_iter=3)
+        self.assertTrue((r.iterations == 3).all())
+        self.assertFalse(r.converged.any())
+        self.assertTrue((r.residual < 1).all())
@@ -0,0 +1,32 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, solver
+
+
+class TestSurrogate(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+
+    def test_exact_quadratic(self):
+        """Without the ISO wrap resistances F_U and P_A are quadratics in q"""
+        s = self.c.surrogate(H=12)
+        self.assertEqual(s.coef_f_u.size, 3)
+        self.assertLess(s.tolerance, 1e-12)
+        q = np.linspace(0, 1.5 * s.q_max, 101)
+        expected = solver.solve_batch(self.c, q=q, H=12)
+        np.testing.assert_allclose(s.f_u(q), expected.f_u, rtol=1e-12)
+        np.testing.assert_allclose(s.p_a(q), expected.p_a, rtol=1e-12)
+        self.assertAlmostEqual(self.c.surrogate().p_a(2300) / 1000, 68.93, 2)
+
+    def test_iso(self):
+        s = self.c.surrogate(iso=True, q_max=3000)
+        self.assertEqual(s.q_max, 3000)
+        self.assertLess(s.tolerance, 1e-5)
+        q = np.array([150.0, 1234.5, 2300.0, 2999.0])
+        expected = solver.solve_iso(self.c, q=q)
+        np.testing.assert_allclose(s.f_u(q), expected.f_u, rtol=2 * s.tolerance)
+        np.testing.assert_allclose(s.p_a(q), expected.p_a, rtol=2 * s.tolerance)
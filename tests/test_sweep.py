@@ -0,0 +1,36 @@
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, solver, sweep
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        self.grid = {'v': [3.0, 4.8, 6.0], 'B': [1.0, 1.2], 'q': [1000, 2300, 3000, 4000]}
+
+    def assertMatchesBatch(self, result):
+        self.assertEqual(list(result.axes), ['v', 'B', 'q'])
+        v, B, q = np.meshgrid(*result.axes.values(), indexing='ij')
+        columns = dict(vars(self.c), v=v, B=B)
+        expected = solver.solve_batch(columns, q=q)
+        for name, values in result.values.items():
+            self.assertEqual(values.shape, (3, 2, 4))
+            np.testing.assert_allclose(values, getattr(expected, name), rtol=1e-12, err_msg=name)
+
+    def test_sweep_in_process(self):
+        result = sweep.sweep(self.c, self.grid, workers=1, chunk_size=5)
+        self.assertMatchesBatch(result)
+        self.assertAlmostEqual(result.values['p_a'][1, 1, 1] / 1000, 68.93, 2)
+
+    def test_sweep_process_pool(self):
+        result = sweep.sweep(self.c, self.grid, workers=2, chunk_size=7, fields=['p_a', 't_1'])
+        self.assertEqual(set(result.values), {'p_a', 't_1'})
+        self.assertMatchesBatch(result)
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            sweep.sweep(self.c, {'speed': [1, 2, 3]}, q=2300, workers=1)
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import unittest
+
+import numpy as np
+
+from conveyance import conveyance, solver, telemetry
+
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(__file__), 'flat_conveyor.yaml')
+        self.c = conveyance.Conveyance(file_path=self.file_path)
+        inclined = conveyance.Conveyance(file_path=self.file_path)
+        inclined.install_a = 3
+        inclined.a_o = 1.5
+        self.designs = {'CV01': self.c, 'CV02': inclined}
+        self.model = telemetry.TelemetryModel(self.designs, H={'CV02': 25})
+
+        rng = np.random.default_rng(0)
+        n = 1000
+        self.ids = rng.choice(['CV01', 'CV02'], n).tolist()
+        self.v = rng.uniform(3, 5, n)
+        self.q = rng.uniform(0, 2500, n)
+        self.readings = list(zip(self.ids, range(n), self.v.tolist(), self.q.tolist()))
+
+    def test_matches_solve_batch(self):
+        q_m, f_u, p_a, t_1, t_2 = self.model.evaluate(self.ids, self.v, self.q)
+        designs = [self.designs[i] for i in self.ids]
+        columns = solver._as_columns(designs)
+        columns.v = self.v
+        H = np.where(np.array(self.ids) == 'CV02', 25.0, 0.0)
+        expected = solver.solve_batch(columns, q=self.q, H=H)
+        np.testing.assert_allclose(q_m, expected.q_m, rtol=1e-12)
+        np.testing.assert_allclose(f_u, expected.f_u, rtol=1e-12)
+        np.testing.assert_allclose(p_a, expected.p_a, rtol=1e-12)
+        np.testing.assert_allclose(t_1, expected.t_1, rtol=1e-12)
+        np.testing.assert_allclose(t_2, expected.t_2, rtol=1e-12)
+
+    def test_flat_conveyor(self):
+        q_m, f_u, p_a, t_1, t_2 = self.model.evaluate(['CV01'], [self.c.v], [2300])
+        self.assertAlmostEqual(p_a[0] / 1000, 68.93, 2)
+        self.assertAlmostEqual(t_1[0], 35237.40, 2)
+        self.assertAlmostEqual(t_2[0], 22005.08, 2)
+
+    def test_stopped_belt(self):
+        _, f_u, p_a, _, _ = self.model.evaluate(['CV01', 'CV01'], [0, self.c.v], [0, 2300])
+        self.assertTrue(np.isnan(p_a[0]))
+        self.assertTrue(np.isfinite(p_a[1]))
+
+    def test_stream(self):
+        estimates = list(self.model.stream(iter(self.readings), batch_size=64))
+        self.assertEqual([e.timestamp for e in estimates], list(range(len(self.readings))))
+        self.assertEqual([e.conveyor_id for e in estimates], self.ids)
+        _, _, p_a, _, _ = self.model.evaluate(self.ids, self.v, self.q)
+        np.testing.assert_array_equal([e.p_a for e in estimates], p_a)
+
+    def test_astream(self):
+        async def feed():
+            for reading in self.readings:
+                yield reading
+
+        async def collect():
+            return [e async for e in self.model.astream(feed(), batch_size=100)]
+
+        loop = asyncio.new_event_loop()
+        try:
+            estimates = loop.run_until_complete(collect())
+        finally:
+            loop.close()
+        self.assertEqual([e.timestamp for e in estimates], list(range(len(self.readings))))
+
+    def test_astream_flushes_slow_feed(self):
+        """A partial batch is evaluated once its first reading has waited max_delay"""
+        received = None
+
+        async def feed():
+            yield self.readings[0]
+            yield self.readings[1]
+            # The feed stalls until the first readings have been evaluated
+            await received.wait()
+            yield self.readings[2]
+
+        async def collect():
+            # Created on the running loop, as before Python 3.10 an Event binds to the current loop
+            nonlocal received
+            received = asyncio.Event()
+            estimates = []
+            async for estimate in self.model.astream(feed(), batch_size=100, max_delay=0.01):
+                estimates.append(estimate)
+                received.set()
+            return estimates
+
+        loop = asyncio.new_event_loop()
+        try:
+            estimates = loop.run_until_complete(asyncio.wait_for(collect(), 5))
+        finally:
+            loop.close()
+        self.assertEqual([e.timestamp for e in estimates], [0, 1, 2])
@@ -0,0 +1,141 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from conveyance import belt_capacity, conveyor_resistances, vec
+
+
+class TestVecBeltCapacity(unittest.TestCase):
+    def setUp(self):
+        self.v = np.array([1.5, 3.2, 4.8, 6.0])
+        self.q = np.array([0, 500, 2300, 4100.5])
+        self.p = np.array([0.85, 1.6, 2.1, 0.9])
+
+    def test_mass_density_material_throughput(self):
+        """Each element matches the scalar function using throughput"""
+        q_m = vec.mass_density_material(v=self.v[:, None], q=self.q[None, :])
+        self.assertEqual(q_m.shape, (4, 4))
+        for (i, v), (j, q) in itertools.product(enumerate(self.v), enumerate(self.q[1:], 1)):
+            self.assertEqual(q_m[i, j], belt_capacity.mass_density_material(v=v, q=q))
+
+    def test_mass_density_material_per_element_branch(self):
+        """Zero throughput elements fall back to the flow rate branch"""
+        q_v = np.full(4, 0.864)
+        q_m = vec.mass_density_material(v=self.v, q=self.q, q_v=q_v, p=self.p)
+        for i in range(4):
+            expected = belt_capacity.mass_density_material(v=self.v[i], q=self.q[i], q_v=q_v[i], p=self.p[i])
+            self.assertEqual(q_m[i], expected)
+
+    def test_mass_density_idler(self):
+        a = np.array([1.2, 1.5, 3.0])
+        m = np.array([[15.5], [13.2]])
+        q_r = vec.mass_density_idler(a=a, m=m)
+        self.assertEqual(q_r.shape, (2, 3))
+        self.assertEqual(q_r[1, 2], belt_capacity.mass_density_idler(a=3.0, m=13.2))
+
+    def test_volume_carried_material(self):
+        q_v = vec.volume_carried_material(q=self.q, p=self.p)
+        for i in range(4):
+            self.assertEqual(q_v[i], belt_capacity.volume_carried_material(q=self.q[i], p=self.p[i]))
+
+    def test_volumetric_flow(self):
+        q_vt = vec.volumetric_flow(belt_ca=0.180, v=self.v)
+        for i in range(4):
+            self.assertEqual(q_vt[i], belt_capacity.volumetric_flow(belt_ca=0.180, v=self.v[i]))
+
+    def test_belt_cs_area(self):
+        """Broadcast over idler and surcharge angles"""
+        ia = np.array([20, 30, 35, 45])
+        sa = np.array([5, 10, 20, 25, 30])
+        s = vec.belt_cs_area(l3=0.436, b=1.03, ia=ia[:, None], sa=sa[None, :])
+        self.assertEqual(s.shape, (4, 5))
+        for (i, a), (j, b) in itertools.product(enumerate(ia), enumerate(sa)):
+            self.assertAlmostEqual(s[i, j], belt_capacity.belt_cs_area(l3=0.436, b=1.03, ia=a, sa=b), 12)
+        self.assertAlmostEqual(s[3, 2], 0.180, 3)  # s: 0.180 m^2
+
+
+class TestVecConveyorResistances(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5048)
+        n = 64
+        self.n = n
+        self.q_v = rng.uniform(0.1, 1.2, n)
+        self.p = rng.uniform(0.8, 2.2, n)
+        self.v = rng.uniform(1.5, 6.5, n)
+        self.v_0 = rng.uniform(0, 1, n)
+        self.B = rng.choice([0.8, 1.0, 1.2, 1.4], n)
+        self.b1 = self.B * 0.6
+        self.mu1 = rng.uniform(0.4, 0.7, n)
+        self.mu2 = rng.uniform(0.5, 0.8, n)
+        self.wrap_a = rng.choice([150, 180, 200, 210], n)
+        self.f_u = rng.uniform(5e3, 5e4, n)
+        self.mu_b = rng.uniform(0.25, 0.4, n)
+
+    def assertElementwise(self, actual, scalar_fn, places=7, **kwargs):
+        """Compare an array result to the scalar function applied to each element"""
+        self.assertEqual(np.shape(actual), (self.n,))
+        for i in range(self.n):
+            args = {k: (x[i] if np.ndim(x) else x) for k, x in kwargs.items()}
+            self.assertAlmostEqual(actual[i], scalar_fn(**args), places)
+
+    def test_resistance_main(self):
+        kwargs = dict(q_m=self.q_v * 150, q_b=16.44, q_ro=12.92, q_ru=4.40, c_l=143,
+                      install_a=np.linspace(-10, 15, self.n), ff=0.02)
+        self.assertElementwise(vec.resistance_main(**kwargs), conveyor_resistances.resistance_main, **kwargs)
+
+    def test_resistance_secondary(self):
+        kwargs = dict(q_v=self.q_v, p=self.p, v=self.v, v_0=self.v_0, B=self.B, b1=self.b1,
+                      mu1=self.mu1, mu2=self.mu2, wrap_a_h=self.wrap_a, wrap_a_t=180)
+        self.assertElementwise(vec.resistance_secondary(**kwargs), conveyor_resistances.resistance_secondary, **kwargs)
+
+    def test_resistance_secondary_partial_wrap(self):
+        """Unset wrap resistances are defaulted per element"""
+        f_1t_d = np.where(np.arange(self.n) % 2, 150.0, np.nan)
+        f_n = vec.resistance_secondary(q_v=self.q_v, p=self.p, v=self.v, v_0=self.v_0, B=self.B, b1=self.b1,
+                                       mu1=self.mu1, mu2=self.mu2, wrap_a_h=self.wrap_a, wrap_a_t=180,
+                                       f_1t_d=f_1t_d, f_1t_t=141)
+        for i in range(self.n):
+            expected = conveyor_resistances.resistance_secondary(
+                q_v=self.q_v[i], p=self.p[i], v=self.v[i], v_0=self.v_0[i], B=self.B[i], b1=self.b1[i],
+                mu1=self.mu1[i], mu2=self.mu2[i], wrap_a_h=self.wrap_a[i], wrap_a_t=180,
+                f_1t_d=None if np.isnan(f_1t_d[i]) else f_1t_d[i], f_1t_t=141)
+            self.assertAlmostEqual(f_n[i], expected, 7)
+
+    def test_resistance_concentrated(self):
+        kwargs = dict(q_v=self.q_v, p=self.p, v=self.v, l_s=4.8, b1=self.b1, bc_w=self.B, bc_t=0.008,
+                      bc_p=30000, bc_n=4, mu2=self.mu2, mu3=0.6)
+        self.assertElementwise(vec.resistance_concentrated(**kwargs), conveyor_resistances.resistance_concentrated,
+                               **kwargs)
+
+    def test_resistance_belt_wrap(self):
+        kwargs = dict(B=self.B, wrap_a=np.linspace(45, 270, self.n))
+        self.assertElementwise(vec.resistance_belt_wrap(**kwargs), conveyor_resistances.resistance_belt_wrap,
+                               **kwargs)
+
+    def test_resistance_belt_sag_tension(self):
+        kwargs = dict(q_m=self.q_v * 150, q_b=16.44, a_o=1.2, a_u=3.0, h_a_o=0.01, h_a_u=self.v_0 + 0.01)
+        f_bs_min_o, f_bs_min_u = vec.resistance_belt_sag_tension(**kwargs)
+        self.assertElementwise(f_bs_min_o, lambda **kw: conveyor_resistances.resistance_belt_sag_tension(**kw)[0],
+                               **kwargs)
+        self.assertElementwise(f_bs_min_u, lambda **kw: conveyor_resistances.resistance_belt_sag_tension(**kw)[1],
+                               **kwargs)
+
+    def test_resistance_belt_wrap_iso(self):
+        kwargs = dict(B=self.B, d=0.0125, D=0.6, d_0=0.14, m_p=1050, t_1=self.f_u * 2.5, t_2=self.f_u * 1.5)
+        self.assertElementwise(vec.resistance_belt_wrap_iso(**kwargs), conveyor_resistances.resistance_belt_wrap_iso,
+                               **kwargs)
+
+    def test_tension_transmit_min(self):
+        t_2_min = np.where(np.arange(self.n) % 3, np.nan, self.f_u)
+        t_1, t_2, (t_rat, t_rat_min, t_ok) = vec.tension_transmit_min(
+            f_u=self.f_u, wrap_a=self.wrap_a, mu_b=self.mu_b, t_2_min=t_2_min)
+        for i in range(self.n):
+            e_1, e_2, (e_rat, e_rat_min, e_ok) = conveyor_resistances.tension_transmit_min(
+                f_u=self.f_u[i], wrap_a=self.wrap_a[i], mu_b=self.mu_b[i],
+                t_2_min=None if np.isnan(t_2_min[i]) else t_2_min[i])
+            self.assertAlmostEqual(t_1[i], e_1, 7)
+            self.assertAlmostEqual(t_2[i], e_2, 7)
+            self.assertAlmostEqual(t_rat[i], e_rat, 12)
+            self.assertAlmostEqual(t_rat_min[i], e_rat_min, 12)
+            self.assertEqual(t_ok[i], e_ok)